@@ -0,0 +1,156 @@
+################################
+# UPS Package Routing Program  #
+# Benchmark suite              #
+################################
+
+import argparse
+import json
+import math
+import tempfile
+import time as wall_clock
+from datetime import time
+from os import path
+
+from entities.Package import Package
+from entities.Truck import Truck
+from structures.HashSet import HashSet
+from structures.RuntimeState import RuntimeState
+from utilities.DataGenerator import DataGenerator
+from utilities.Logger import Logger
+
+
+def main():
+    arguments = parse_arguments()
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in arguments.sizes:
+            results.append(run_benchmark(arguments, size, directory))
+
+    with open(arguments.output, mode='w') as output_file:
+        json.dump(results, output_file, indent=2)
+
+    Logger.log(Logger.LogLevel.INFORMATION, f"Results written to {arguments.output}")
+
+
+def run_benchmark(arguments, packages: int, directory: str):
+    """Times loading, routing, assignment and a simulated day for a number of packages."""
+    locations = min(max(int(math.sqrt(packages) * 3), 27), arguments.max_locations)
+    trucks = max(math.ceil(packages / arguments.packages_per_truck), 3)
+    generator = DataGenerator(seed=arguments.seed, locations=locations, packages=packages,
+                              trucks=trucks)
+
+    locations_file = path.join(directory, f"locations-{packages}.csv")
+    packages_file = path.join(directory, f"packages-{packages}.csv")
+    generator.write_locations(locations_file)
+    generator.write_packages(packages_file)
+
+    result = {
+        "packages": packages,
+        "locations": locations,
+        "trucks": trucks,
+        "seed": arguments.seed,
+        "fleet": arguments.fleet,
+    }
+    level = Logger.instance().level
+    Logger.instance().level = Logger.LogLevel.NONE
+
+    try:
+        # Load
+        start = wall_clock.perf_counter()
+        state = create_state(locations_file, packages_file, trucks)
+        result["load_seconds"] = wall_clock.perf_counter() - start
+
+        # Routing, a single route through every location
+        destinations = [state.destinations.vertices[v] for v in range(1, locations)]
+        start = wall_clock.perf_counter()
+        (_, distance) = state.destinations.find_shortest_path(Truck.HUB_LOCATION, destinations)
+        result["routing_seconds"] = wall_clock.perf_counter() - start
+        result["routing_distance"] = distance
+
+        # Assignment, loading every truck in turn until every package at the facility is assigned
+        # Once no truck takes another package, the trucks are emptied as if they left on a trip,
+        # so packages that can only be on a full truck are assigned to its next trip
+        for (driver, truck) in zip(state.drivers, state.trucks):
+            driver.assign_truck(truck)
+        available = len([p for p in state.packages if p.status == Package.Status.AT_FACILITY])
+        assigned = 0
+        trips = 0
+        start = wall_clock.perf_counter()
+        while assigned < available:
+            loaded = 0
+            for truck in state.trucks:
+                count = len(truck.packages)
+                state.assign_packages(truck)
+                loaded += len(truck.packages) - count
+            if loaded > 0:
+                assigned += loaded
+                continue
+
+            loaded = sum(len(t.packages) for t in state.trucks)
+            if loaded == 0:
+                break  # The remaining packages can't go on any truck
+            trips += 1
+            for truck in state.trucks:
+                for p in truck.packages:
+                    p.status = Package.Status.DELIVERED
+                truck.packages = HashSet(Truck.MAXIMUM_NUMBER_OF_PACKAGES)
+        result["assignment_seconds"] = wall_clock.perf_counter() - start
+        result["assigned"] = assigned
+        result["available"] = available
+        result["assignment_trips"] = trips + 1
+
+        # A full simulated day, from a fresh state
+        if packages <= arguments.simulate_limit:
+            state = create_state(locations_file, packages_file, trucks)
+            if arguments.fleet:
+                state.enable_fleet()
+            start = wall_clock.perf_counter()
+            state.simulate()
+            result["simulate_seconds"] = wall_clock.perf_counter() - start
+            result["delivered"] = state.packages_delivered
+            result["total_distance"] = state.total_distance
+            result["finish_time"] = state.current_time.time().isoformat()
+            result["late"] = len([
+                p for p in state.packages
+                if p.delivered_seconds is not None and p.delivered_seconds > p.deadline_seconds
+            ])
+        else:
+            result["simulate_seconds"] = None
+    finally:
+        Logger.instance().level = level
+
+    Logger.log(Logger.LogLevel.INFORMATION, json.dumps(result))
+    return result
+
+
+def create_state(locations_file: str, packages_file: str, trucks: int):
+    state = RuntimeState(simulation_speed_seconds=30, frame_delay_seconds=0)
+    state.load_destinations(locations_file)
+    state.load_packages(packages_file)
+    state.add_drivers([f"Driver {i + 1}" for i in range(trucks)])
+    state.add_trucks(trucks, time(hour=8, minute=0))
+    return state
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="UPS Package Routing Benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000],
+                        metavar="PACKAGES", help="number of packages to benchmark, from 10^2 to 10^6")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed for the generated data, the same seed generates the same data")
+    parser.add_argument("--packages-per-truck", type=int, default=14, metavar="COUNT",
+                        help="packages per truck, each truck has its own driver")
+    parser.add_argument("--max-locations", type=int, default=1000, metavar="COUNT",
+                        help="maximum number of locations in the distance table")
+    parser.add_argument("--simulate-limit", type=int, default=1000, metavar="PACKAGES",
+                        help="skip the simulated day for sizes above PACKAGES")
+    parser.add_argument("--fleet", action="store_true",
+                        help="move all trucks in a single pass each tick")
+    parser.add_argument("--output", default="benchmark-results.json", metavar="FILE",
+                        help="file the JSON results are written to")
+    return parser.parse_args()
+
+
+# Start benchmarks
+main()
@@ -0,0 +1,49 @@
+################################
+# UPS Package Routing Program  #
+# Delivery journal replay      #
+################################
+
+import argparse
+import json
+
+from utilities.DeliveryJournal import DeliveryJournal
+from utilities.Logger import Logger
+
+
+def main():
+    arguments = parse_arguments()
+
+    # Rebuild the last known state of every package, the journal is the only input
+    packages = DeliveryJournal.replay(arguments.journal)
+
+    if arguments.json:
+        print(json.dumps(packages, indent=2, sort_keys=True))
+        return
+
+    delivered = 0
+    Logger.log(Logger.LogLevel.INFORMATION,
+               f"{'Package':>7} {'Status':<11} {'Truck':>5} {'Delivered':<9} Last update")
+    for package_id in sorted(packages):
+        state = packages[package_id]
+        if state["status"] == "DELIVERED":
+            delivered += 1
+        Logger.log(
+            Logger.LogLevel.INFORMATION,
+            f"{package_id:>7} {str(state['status']):<11} {str(state['truck'] or '-'):>5} "
+            f"{(state['delivered'] or '--:--:--')[11:19]:<9} {state['time']}"
+            f"{' (corrected to ' + state['address'] + ')' if state['address'] else ''}")
+
+    Logger.log(Logger.LogLevel.INFORMATION,
+               f"\n{delivered} of {len(packages)} packages were delivered")
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="UPS Package Routing delivery journal replay")
+    parser.add_argument("journal", help="journal file written with --journal")
+    parser.add_argument("--json", action="store_true",
+                        help="print the state of every package as JSON")
+    return parser.parse_args()
+
+
+# Start replay
+main()
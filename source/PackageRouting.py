@@ -3,37 +3,124 @@
 # Daniel                       #
 ################################
 
-from datetime import time
+import argparse
+import json
+from datetime import time, timedelta
 from os import path
 
 from entities.Location import Location
+from entities.Truck import Truck
 from structures.RuntimeState import RuntimeState
+from utilities.DeliveryJournal import DeliveryJournal
+from utilities.HubPartitioner import HubPartitioner
 from utilities.Logger import Logger
+from utilities.ResultExporter import ResultExporter
+from utilities.MemoryProfiler import MemoryProfiler
+from utilities.StatusServer import StatusServer
 
 
 def main():
+    arguments = parse_arguments()
     drivers = ["Alice", "Fred"]
     trucks = 3
     truck_start_time = time(hour=8, minute=0)
-
-    runtime_state = RuntimeState(simulation_speed_seconds=30)
-
-    # Load the data (time complexity of O(N^2), space of O(N^2)
-    runtime_state.load_destinations(get_file("locations.csv"))
-    runtime_state.load_packages(get_file("packages.csv"))
-
-    # Add two drivers
-    runtime_state.add_drivers(drivers)
-
-    # Add three trucks
-    runtime_state.add_trucks(trucks, truck_start_time)
+    corrected_location = Location('410 S State St', 84111)
+    profiler = None
+
+    if arguments.hub is not None:
+        # Split the day between the hubs, each hub is simulated in its own process
+        solve_hubs(arguments.hub, drivers, trucks, truck_start_time, corrected_location)
+        return
+
+    if arguments.memory_report is not None:
+        # Trace allocations from the start, so loading is accounted for
+        profiler = MemoryProfiler()
+        profiler.start()
+
+    if arguments.resume is not None:
+        # Restore a previously saved state, and continue the day from there
+        runtime_state = RuntimeState.load_checkpoint(arguments.resume)
+        if profiler is not None:
+            profiler.snapshot("load_checkpoint")
+    else:
+        runtime_state = RuntimeState(simulation_speed_seconds=30)
+
+        # Load the data (time complexity of O(N^2), space of O(N^2)
+        if arguments.road_network is None:
+            runtime_state.load_destinations(get_file("locations.csv"))
+            if profiler is not None:
+                profiler.snapshot("load_destinations")
+        runtime_state.load_packages(get_file("packages.csv"))
+        if profiler is not None:
+            profiler.snapshot("load_packages")
+        if arguments.road_network is not None:
+            # Only the distances between the delivery locations are computed from the network
+            (nodes, edges) = arguments.road_network
+            runtime_state.load_road_network(get_file(nodes), get_file(edges),
+                                            stops=[corrected_location])
+            if profiler is not None:
+                profiler.snapshot("load_destinations")
+
+        # Add two drivers
+        runtime_state.add_drivers(drivers)
+
+        # Add three trucks
+        runtime_state.add_trucks(trucks, truck_start_time)
+
+        # Add a correction for package 9 at 10:20am
+        runtime_state.add_package_correction(9, time(hour=10, minute=20), corrected_location)
+
+    if arguments.time_windows:
+        runtime_state.set_routing(Truck.Routing.TIME_WINDOWS)
+
+    if arguments.plan_fleet:
+        # Plan the trips of the whole fleet up front, instead of loading trucks one at a time
+        runtime_state.plan_fleet()
+
+    if arguments.fleet:
+        # Move all trucks together, which scales to thousands of trucks
+        runtime_state.enable_fleet()
+
+    if arguments.route_workers is not None:
+        # Solve the routes of trucks leaving together in worker processes
+        runtime_state.set_route_workers(arguments.route_workers)
+
+    if arguments.checkpoint_minutes is not None:
+        runtime_state.set_checkpoint_interval(
+            timedelta(minutes=arguments.checkpoint_minutes))
+
+    if arguments.realtime_ratio is not None:
+        runtime_state.realtime_ratio = arguments.realtime_ratio
+
+    journal = None
+    if arguments.journal is not None:
+        # Record every package status change, resumed runs append to the same journal
+        journal = DeliveryJournal(arguments.journal)
+        runtime_state.set_journal(journal)
+
+    exporter = None
+    if arguments.export is not None:
+        # Write the results of every trip as trucks return
+        exporter = ResultExporter(arguments.export)
+        runtime_state.set_exporter(exporter)
+
+    if arguments.status_port is not None:
+        # Serve status queries from snapshots published every tick
+        status_server = StatusServer(port=arguments.status_port)
+        status_server.publish(runtime_state)
+        runtime_state.add_tick_listener(status_server.publish)
+        status_server.start()
+
+    if profiler is not None:
+        # Take a snapshot in the middle of the day, once half the packages were delivered
+        def snapshot_midway(state):
+            if not profiler.has_phase("mid-simulation") and \
+                    state.packages_delivered >= len(state.packages) / 2:
+                profiler.snapshot("mid-simulation")
+        runtime_state.add_tick_listener(snapshot_midway)
 
     # Initialize the terminal interface (disables Logger class)
-    runtime_state.init_ui()
-
-    # Add a correction for package 9 at 10:20am
-    runtime_state.add_package_correction(9, time(hour=10, minute=20),
-                                         Location('410 S State St', 84111))
+    runtime_state.init_ui(arguments.fps)
 
     # Run simulation. This doesn't return until end of day.
     # Worst case time complexity is O(N^3)
@@ -46,6 +133,78 @@ def main():
         f"\n{runtime_state.packages_delivered} packages were delivered in a combined time of {runtime_state.total_time} for a total distance of {runtime_state.total_distance}"
     )
 
+    if arguments.route_workers is not None:
+        runtime_state.set_route_workers(0)
+
+    if journal is not None:
+        journal.close()
+
+    if exporter is not None:
+        exporter.close()
+
+    if profiler is not None:
+        profiler.snapshot("end")
+        profiler.stop()
+        Logger.log(Logger.LogLevel.INFORMATION, "\nMemory usage (KB):\n" + profiler.format_report())
+        with open(arguments.memory_report, mode='w') as report_file:
+            json.dump(profiler.report(), report_file, indent=2)
+
+def solve_hubs(hubs: list, drivers: list, trucks: int, truck_start_time: time,
+               corrected_location: Location):
+    """Delivers the packages from the main hub and the extra hubs, each package from one hub."""
+    partitioner = HubPartitioner(get_file("locations.csv"), get_file("packages.csv"),
+                                 simulation_speed_seconds=30)
+    partitioner.add_hub(Truck.HUB_LOCATION, drivers, trucks, truck_start_time)
+    for (address, zip_code, count) in hubs:
+        hub = Location(address, int(zip_code))
+        # Every driver of an extra hub has a truck of their own
+        partitioner.add_hub(hub, [f"{address} driver {i + 1}" for i in range(int(count))],
+                            int(count), truck_start_time)
+    partitioner.add_package_correction(9, time(hour=10, minute=20), corrected_location)
+
+    for summary in partitioner.solve():
+        Logger.log(Logger.LogLevel.INFORMATION, str(summary))
+    Logger.log(
+        Logger.LogLevel.INFORMATION,
+        f"\n{partitioner.packages_delivered} packages were delivered in a combined time of {partitioner.total_time} for a total distance of {partitioner.total_distance}"
+    )
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="UPS Package Routing Program")
+    parser.add_argument("--resume", metavar="CHECKPOINT",
+                        help="resume the simulation from a saved checkpoint file")
+    parser.add_argument("--road-network", nargs=2, metavar=("NODES", "EDGES"),
+                        help="compute the distances from a road network, instead of locations.csv")
+    parser.add_argument("--hub", nargs=3, action="append", metavar=("ADDRESS", "ZIP", "DRIVERS"),
+                        help="also deliver from the hub at ADDRESS, with DRIVERS drivers and trucks; "
+                             "every hub is simulated in its own process, without the interface, "
+                             "and the other options don't apply")
+    parser.add_argument("--plan-fleet", action="store_true",
+                        help="plan the trips of all trucks for the day before simulating")
+    parser.add_argument("--time-windows", action="store_true",
+                        help="route each trip to meet its deadlines, reporting any that can't be met "
+                             "when the trip is routed; trips are routed one at a time, so this can "
+                             "still miss deadlines that the default routing meets")
+    parser.add_argument("--fleet", action="store_true",
+                        help="move all trucks in a single pass each tick, for large fleets")
+    parser.add_argument("--route-workers", type=int, metavar="PROCESSES",
+                        help="solve the routes of trucks leaving together in PROCESSES worker processes")
+    parser.add_argument("--checkpoint-minutes", type=int, metavar="MINUTES",
+                        help="save a checkpoint every MINUTES of simulated time")
+    parser.add_argument("--fps", type=int,
+                        help="draw the interface on its own thread at up to FPS frames per second")
+    parser.add_argument("--realtime-ratio", type=float, metavar="RATIO",
+                        help="simulate RATIO seconds per real second, instead of a fixed delay per tick")
+    parser.add_argument("--journal", metavar="FILE",
+                        help="append every package status change to FILE, as JSON lines")
+    parser.add_argument("--export", metavar="PREFIX",
+                        help="write package and trip results to PREFIX-*.csv and PREFIX-*.col files")
+    parser.add_argument("--memory-report", metavar="FILE",
+                        help="trace memory use per subsystem, and write the report as JSON to FILE")
+    parser.add_argument("--status-port", type=int, metavar="PORT",
+                        help="serve HTTP/JSON package status queries on PORT")
+    return parser.parse_args()
+
 def get_file(filename):
     if path.exists(filename):
         return filename
@@ -64,4 +223,6 @@ def get_file(filename):
     return filename
 
 # Start main program
-main()
+# Worker processes import this module without being the main program, they must not run it
+if __name__ == '__main__':
+    main()
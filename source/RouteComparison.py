@@ -0,0 +1,266 @@
+################################
+# UPS Package Routing Program  #
+# Route quality comparison     #
+################################
+
+import argparse
+import json
+import random
+import tempfile
+import time as wall_clock
+from datetime import time
+from os import path
+
+from entities.Truck import Truck
+from structures.Graph import Graph
+from utilities.Clock import to_seconds
+from utilities.DataGenerator import DataGenerator
+from utilities.Logger import Logger
+from utilities.PackageLoader import PackageLoader
+from utilities.RouteLoader import RouteLoader
+
+DEPARTURE = to_seconds(time(hour=8, minute=0))
+
+
+# Every routing strategy takes (graph, hub, stops, deadlines) and returns a path of vertex indexes
+# Every path is scored the same way, see evaluate: the fewest late stops, then the shortest tour
+def nearest_neighbor(graph: Graph, hub: int, stops: list, deadlines: dict):
+    (route, _) = graph.find_shortest_path(hub, stops)
+    return route
+
+
+def nearest_neighbor_2opt(graph: Graph, hub: int, stops: list, deadlines: dict):
+    (route, _) = graph.find_shortest_path(hub, stops)
+    # The tour returns to the hub, so the last leg is improved too
+    graph.improve_path(hub, route, len(route), end=hub)
+    return route
+
+
+def deadline_insertion(graph: Graph, hub: int, stops: list, deadlines: dict):
+    (route, _, _) = graph.find_deadline_path(
+        hub, stops, [deadlines[s] for s in stops], DEPARTURE, Truck.AVERAGE_SPEED_PER_SEC)
+    return route
+
+
+def exact(graph: Graph, hub: int, stops: list, deadlines: dict):
+    """Held-Karp dynamic programming, the tour back to the hub with the fewest late stops,
+    then the shortest. O(2^N * N^2) states, each with a few labels."""
+    # A partial tour is dropped only if another one through the same stops, ending at the same
+    # stop, is no longer and has no more late stops, since arriving earlier can't make the
+    # rest of the tour any later
+    count = len(stops)
+    if count == 0:
+        return []
+
+    # labels[(visited, last)] = list of (late stops, weight, last, previous label)
+    labels = {}
+    for i in range(count):
+        length = weight(graph, hub, stops[i])
+        labels[(1 << i, i)] = [(is_late(length, stops[i], deadlines), length, i, None)]
+
+    for visited in range(1, 1 << count):
+        for last in range(count):
+            for label in labels.get((visited, last), ()):
+                for following in range(count):
+                    if visited & (1 << following):
+                        continue
+                    length = label[1] + weight(graph, stops[last], stops[following])
+                    late = label[0] + is_late(length, stops[following], deadlines)
+                    add_label(labels.setdefault((visited | (1 << following), following), []),
+                              (late, length, following, label))
+
+    everything = (1 << count) - 1
+    (_, label) = min(((label[0], label[1] + weight(graph, stops[label[2]], hub)), label)
+                     for last in range(count) for label in labels[(everything, last)])
+
+    route = []
+    while label is not None:
+        route.append(stops[label[2]])
+        label = label[3]
+    return route[::-1]
+
+
+def add_label(labels: list, label: tuple):
+    """Adds a partial tour to the labels of its state, unless one of them is at least as good."""
+    for other in labels:
+        if other[0] <= label[0] and other[1] <= label[1]:
+            return
+    labels[:] = [other for other in labels if not (label[0] <= other[0] and label[1] <= other[1])]
+    labels.append(label)
+
+
+ALGORITHMS = {
+    "nearest_neighbor": nearest_neighbor,
+    "nearest_neighbor_2opt": nearest_neighbor_2opt,
+    "deadline_insertion": deadline_insertion,
+    "exact": exact,
+}
+
+
+def weight(graph: Graph, u: int, v: int):
+    return graph.get_weight(u, v) if u != v else 0
+
+
+def is_late(length: float, v: int, deadlines: dict):
+    """1 if arriving at v after driving length from the hub misses its deadline, otherwise 0."""
+    return 1 if DEPARTURE + length / Truck.AVERAGE_SPEED_PER_SEC > deadlines[v] else 0
+
+
+def evaluate(graph: Graph, hub: int, route: list, deadlines: dict):
+    """Returns the length of the tour back to the hub, and the number of late stops."""
+    length = 0
+    late = 0
+    previous = hub
+    for v in route:
+        length += weight(graph, previous, v)
+        late += is_late(length, v, deadlines)
+        previous = v
+    return (length + weight(graph, previous, hub), late)
+
+
+def percentile(values: list, p: float):
+    """Nearest-rank percentile of the values."""
+    ordered = sorted(values)
+    return ordered[max(int(round(p / 100 * len(ordered))) - 1, 0)]
+
+
+def load_instance(locations_file: str, packages_file: str):
+    """Loads a graph, and the deadline of every location with packages."""
+    route_loader = RouteLoader(locations_file)
+    route_loader.load()
+    graph = route_loader.graph
+    package_loader = PackageLoader(packages_file)
+    package_loader.load()
+
+    deadlines = {}
+    for p in package_loader.packages:
+        v = graph.index_of(p.location)
+        if v >= 0:
+            deadline = p.deadline_seconds
+            deadlines[v] = min(deadline, deadlines.get(v, deadline))
+    return (graph, graph.index_of(Truck.HUB_LOCATION), deadlines)
+
+
+def compare(name: str, instance, arguments, rng: random.Random):
+    """Runs every algorithm over random sets of stops from the instance."""
+    (graph, hub, deadlines) = instance
+    candidates = sorted(v for v in deadlines if v != hub)
+    stops_count = min(arguments.stops, len(candidates))
+    samples = {a: {"lengths": [], "gaps": [], "late": 0, "times": []} for a in ALGORITHMS}
+
+    for _ in range(arguments.instances):
+        stops = rng.sample(candidates, stops_count)
+        scores = {}
+
+        for (algorithm, solve) in ALGORITHMS.items():
+            if algorithm == "exact" and stops_count > arguments.exact_limit:
+                continue
+            start = wall_clock.perf_counter()
+            route = solve(graph, hub, list(stops), deadlines)
+            elapsed = wall_clock.perf_counter() - start
+
+            (length, late) = evaluate(graph, hub, route, deadlines)
+            scores[algorithm] = (late, length)
+            samples[algorithm]["lengths"].append(length)
+            samples[algorithm]["late"] += late
+            samples[algorithm]["times"].append(elapsed * 1000)
+
+        # The gap is to the best route by the same objective, the exact one when there is one
+        # A route with more late stops than the best can be shorter, so its gap is negative
+        (_, best) = scores.get("exact", min(scores.values()))
+        for (algorithm, (_, length)) in scores.items():
+            samples[algorithm]["gaps"].append((length - best) / best * 100 if best > 0 else 0)
+
+    results = []
+    for (algorithm, sample) in samples.items():
+        if len(sample["lengths"]) == 0:
+            continue
+        results.append({
+            "instance": name,
+            "algorithm": algorithm,
+            "stops": stops_count,
+            "runs": len(sample["lengths"]),
+            "mean_length": sum(sample["lengths"]) / len(sample["lengths"]),
+            "mean_gap_percent": sum(sample["gaps"]) / len(sample["gaps"]),
+            "max_gap_percent": max(sample["gaps"]),
+            "late_stops": sample["late"],
+            "p50_ms": percentile(sample["times"], 50),
+            "p90_ms": percentile(sample["times"], 90),
+            "p99_ms": percentile(sample["times"], 99),
+        })
+    return results
+
+
+def print_table(results: list):
+    Logger.log(Logger.LogLevel.INFORMATION,
+               f"{'Instance':<14} {'Algorithm':<22} {'Stops':>5} {'Length':>8} {'Gap %':>7} "
+               f"{'Max %':>7} {'Late':>5} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8}")
+    for r in results:
+        Logger.log(Logger.LogLevel.INFORMATION,
+                   f"{r['instance']:<14} {r['algorithm']:<22} {r['stops']:>5} "
+                   f"{r['mean_length']:>8.2f} {r['mean_gap_percent']:>7.2f} "
+                   f"{r['max_gap_percent']:>7.2f} {r['late_stops']:>5} {r['p50_ms']:>8.3f} "
+                   f"{r['p90_ms']:>8.3f} {r['p99_ms']:>8.3f}")
+
+
+def main():
+    arguments = parse_arguments()
+    rng = random.Random(arguments.seed)
+    results = []
+
+    # The sample data, and generated instances of increasing size
+    results.extend(compare("sample", load_instance(get_file("locations.csv"),
+                                                   get_file("packages.csv")), arguments, rng))
+
+    with tempfile.TemporaryDirectory() as directory:
+        for locations in arguments.generated:
+            generator = DataGenerator(seed=arguments.seed, locations=locations,
+                                      packages=locations * 2)
+            locations_file = path.join(directory, f"locations-{locations}.csv")
+            packages_file = path.join(directory, f"packages-{locations}.csv")
+            generator.write_locations(locations_file)
+            generator.write_packages(packages_file)
+            instance = load_instance(locations_file, packages_file)
+            results.extend(compare(f"generated-{locations}", instance, arguments, rng))
+
+    print_table(results)
+
+    if arguments.output is not None:
+        with open(arguments.output, mode='w') as output_file:
+            json.dump(results, output_file, indent=2)
+        Logger.log(Logger.LogLevel.INFORMATION, f"Results written to {arguments.output}")
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="UPS Package Routing route quality comparison")
+    parser.add_argument("--stops", type=int, default=Truck.MAXIMUM_NUMBER_OF_PACKAGES // 2,
+                        help="number of stops in each route")
+    parser.add_argument("--instances", type=int, default=20,
+                        help="number of random routes per data set")
+    parser.add_argument("--generated", type=int, nargs="*", default=[50, 200], metavar="LOCATIONS",
+                        help="sizes of the generated data sets")
+    parser.add_argument("--exact-limit", type=int, default=12, metavar="STOPS",
+                        help="only compute the exact solution for routes up to STOPS stops")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed for the generated data and routes")
+    parser.add_argument("--output", metavar="FILE",
+                        help="also write the results as JSON to FILE")
+    return parser.parse_args()
+
+
+def get_file(filename):
+    if path.exists(filename):
+        return filename
+
+    for newpath in (path.join("..", filename), path.join("..", "data", filename)):
+        if path.exists(newpath):
+            return newpath
+
+    Logger.log(Logger.LogLevel.ERROR, f"Could not find filename: {filename}")
+    return filename
+
+
+# Start comparison
+# The tests import the algorithms from this module, they must not run it
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,8 @@ sys.path.append("..")
 
 class Driver:
     """Truck driver"""
+    __slots__ = ('name', 'truck', '__hash')
+
     def __init__(self, name):
         """Creates a new driver with the specified name"""
         self.name = name
@@ -9,6 +9,8 @@ class Location:
     _INITIAL_VALUE = 5432
     _MULTIPLIER = 11
 
+    __slots__ = ('address', 'zip', '__hash')
+
     def __init__(self, address: str, zip_code: int = None):
         """Creates a new location
 
@@ -16,18 +18,19 @@ class Location:
         address - street address with optional zip code in format "Address (zip)"
         zip - optional, separate zip code"""
 
+        # Many packages share an address, interning stores each only once
         if zip_code is not None:
-            self.address = address
+            self.address = sys.intern(address)
             self.zip = zip_code
         else:
             split = address.rpartition('(')
             if split[0] is '':
                 # No zip code, could be HUB
                 # Just set the address to the entire string, and set ZIP to 0
-                self.address = split[2]
+                self.address = sys.intern(split[2])
                 self.zip = int(0)
             else:
-                self.address = split[0].strip()
+                self.address = sys.intern(split[0].strip())
                 self.zip = split[2][0:-1]
         self.__hash = None
 
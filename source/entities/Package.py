@@ -1,10 +1,12 @@
 import sys
 from enum import Enum
-from datetime import datetime, time
+from datetime import date, datetime, time
 
 from exceptions.DeliveryException import DeliveryException
 from entities.Location import Location
+from structures.ChangeTracker import ChangeTracker
 from utilities.Logger import Logger
+from utilities.Clock import SECONDS_PER_DAY, to_seconds, to_time, to_datetime
 sys.path.append("..")
 
 
@@ -25,6 +27,22 @@ class Package:
         def __repr__(self):
             return self.name
 
+    # Statuses are stored as their small int value, this maps a value back to its member
+    STATUSES = tuple(Status)
+
+    # Slots keep packages small, there can be millions of them
+    # Times are stored as integer seconds since midnight, and statuses as small ints
+    __slots__ = ('id', '_location', 'city', 'state', 'weight', '_status', 'deadline_seconds',
+                 'arrival_seconds', 'delivered_seconds', '_delivery_day', '_truck', 'notes',
+                 'requires_truck', 'requires_packages', 'hub', 'journal', 'tracker', 'corrected')
+
+    END_OF_DAY = to_seconds(time.max)  # Deadline of packages without one, "EOD"
+
+    # Time strings repeat across packages, so each is only parsed once
+    __seconds = {}  # Time string -> seconds since midnight
+    __times = {}  # Seconds since midnight -> time, shared by the packages returning it
+    __days = {}  # Delivery days, shared by the packages delivered on the same day
+
     def __init__(self,
                  package_id: int,
                  address: str,
@@ -39,20 +57,26 @@ class Package:
         super().__init__()
 
         # Initialize data members, process arguments
+        self.journal = None  # If not None, the DeliveryJournal status changes are recorded to
+        self.tracker = None  # If not None, the ChangeTracker changes are published through
         self.id = int(package_id)
         self._location = Location(address, int(zip_code))
-        self.city = city
-        self.state = state
+        # Cities, states and notes repeat across packages, interning stores each only once
+        self.city = sys.intern(city)
+        self.state = sys.intern(state)
         self.weight = int(weight)
-        self._status = Package.Status(status)
-        self.time_deadline = self.__process_time(time_deadline)
-        self.time_arrival = self.__process_time(time_arrival)
-        self.time_delivered = None
+        self._status = Package.Status(status).value
+        self.deadline_seconds = self.__process_time(time_deadline)
+        self.arrival_seconds = self.__process_time(time_arrival)  # None if not delayed
+        self.delivered_seconds = None  # Seconds since midnight of the delivery day
+        self._delivery_day = None
         self._truck = None
+        self.corrected = False  # If True, the location was corrected after loading
 
-        self.notes = notes
+        self.notes = sys.intern(notes) if notes is not None else None
         self.requires_truck = None  # If not None, then package must be on a specific truck ID
         self.requires_packages = None  # Indicates package must be on same truck as other packages
+        self.hub = None  # If not None, then package must be delivered from a specific hub
 
         # Parsing notes is last, it can change above values
         self.__process_notes(
@@ -66,6 +90,8 @@ class Package:
 
     @truck.setter
     def truck(self, value):
+        if self.tracker is not None:
+            self.tracker.record(ChangeTracker.Kind.PACKAGE_TRUCK, self, self._truck, value)
         self._truck = value
         if value is not None:
             self.status = Package.Status.ON_TRUCK
@@ -77,30 +103,82 @@ class Package:
 
     @location.setter
     def location(self, value):
+        old_location = self._location
         self._location = value
+        if self.tracker is not None:
+            self.tracker.record(ChangeTracker.Kind.PACKAGE_LOCATION, self, old_location, value)
+        self.corrected = True
+        if self.journal is not None:
+            self.journal.record_correction(self)
         if self.truck is not None:
-            # If the location changes, change the package status and recalculate the route
+            # If the location changes, change the package status and repair the route
             self.status = Package.Status.ON_TRUCK
-            self.truck.calculate_route()
+            self.truck.reroute_package(self, old_location)
         self.notes = None
 
     @property
     def status(self):
         """The current status of the package."""
-        return self._status
+        return Package.STATUSES[self._status]
 
     @status.setter
     def status(self, value):
-        self._status = value
+        if self.tracker is not None:
+            self.tracker.record(ChangeTracker.Kind.PACKAGE_STATUS, self, self.status, value)
+        self._status = value.value
         # If the package is marked as on the truck, clear any delivered time, if set
         # This can happen if the package was marked REJECTED
         if value == Package.Status.ON_TRUCK:
             self.time_delivered = None
+        if self.journal is not None:
+            self.journal.record_status(self)
+
+    @property
+    def time_deadline(self):
+        """The time of day the package must be delivered by, time.max if there is no deadline."""
+        if self.deadline_seconds == Package.END_OF_DAY:
+            return time.max
+        return self.__time_of(self.deadline_seconds)
+
+    @property
+    def time_arrival(self):
+        """The time of day a delayed package arrives at the hub, None if it isn't delayed."""
+        if self.arrival_seconds is None:
+            return None
+        return self.__time_of(self.arrival_seconds)
 
-    def deliver(self, delivery_time: time):
-        """Delivers the package."""
+    @property
+    def time_delivered(self):
+        """The date and time the package was delivered, None if it wasn't delivered."""
+        if self.delivered_seconds is None:
+            return None
+        return to_datetime(self.delivered_seconds, self._delivery_day)
+
+    @time_delivered.setter
+    def time_delivered(self, value: datetime):
+        if value is None:
+            self.delivered_seconds = None
+            self._delivery_day = None
+        else:
+            self.__set_delivered(value, to_seconds(value))
+
+    def __set_delivered(self, delivery_time: datetime, delivery_seconds: int):
+        # The day is the one delivery_seconds counts from, it's earlier after midnight
+        day = delivery_time.date()
+        if delivery_seconds >= SECONDS_PER_DAY:
+            day = date.fromordinal(day.toordinal() - delivery_seconds // SECONDS_PER_DAY)
+        self.delivered_seconds = int(delivery_seconds)
+        self._delivery_day = Package.__days.setdefault(day, day)
+
+    def deliver(self, delivery_time: datetime, delivery_seconds: float = None):
+        """Delivers the package.
+
+        delivery_seconds - the delivery time in seconds since midnight of the simulated day,
+                           the time of day of delivery_time if not specified"""
         # Mark the delivery time
-        self.time_delivered = delivery_time
+        if delivery_seconds is None:
+            delivery_seconds = to_seconds(delivery_time)
+        self.__set_delivered(delivery_time, delivery_seconds)
 
         if self.notes is not None and self.notes.startswith("Wrong address"):
             # If the package was sent to the wrong address
@@ -115,26 +193,36 @@ class Package:
             f"Package {self.id} was delivered by truck {self.truck.id} at {delivery_time.time()}!"
         )
 
-        # Log an error if the package was late
-        if delivery_time.time() > self.time_deadline:
+        # Log an error if the package was late, a delivery after midnight is always late
+        if delivery_seconds > self.deadline_seconds:
             Logger.log(Logger.LogLevel.ERROR,
                        f"Package {self.id} was delivered late!")
 
     @classmethod
     def __process_time(cls, time_):
-        """Converts a string into a time object."""
+        """Converts a string into seconds since midnight."""
 
         # Substitute EOD for the max time, 11:59 pm
         if time_ == "EOD":
-            return time.max
+            return Package.END_OF_DAY
         if time_ is not None:
-            # The time string could be in two formats: '10:00 am' or '10:00:00 am'
-            try:
-                return datetime.strptime(time_, "%H:%M:%S %p").time()
-            except ValueError:
-                return datetime.strptime(time_, "%H:%M %p").time()
+            if time_ not in cls.__seconds:
+                # The time string could be in two formats: '10:00 am' or '10:00:00 am'
+                try:
+                    parsed = datetime.strptime(time_, "%H:%M:%S %p").time()
+                except ValueError:
+                    parsed = datetime.strptime(time_, "%H:%M %p").time()
+                cls.__seconds[time_] = to_seconds(parsed)
+            return cls.__seconds[time_]
         return None
 
+    @classmethod
+    def __time_of(cls, seconds: int):
+        """Converts seconds since midnight into a time object."""
+        if seconds not in cls.__times:
+            cls.__times[seconds] = to_time(seconds)
+        return cls.__times[seconds]
+
     def __process_notes(self, notes: str):
         # This reads the "Notes" column in the packages list,
         # and sets the correct information based on it
@@ -147,7 +235,7 @@ class Package:
         elif notes.startswith("Delayed on flight"):
             # Package was delayed, grab the arrival time from the note and save it
             words = notes.split(" ")
-            self.time_arrival = self.__process_time(f"{words[-2]} {words[-1]}")
+            self.arrival_seconds = self.__process_time(f"{words[-2]} {words[-1]}")
             self.status = Package.Status.DELAYED
             Logger.log(
                 Logger.LogLevel.DEBUG,
@@ -184,8 +272,7 @@ class Package:
             '%H:%M:%S') if self.time_delivered is not None else '--:--:--'
 
         # If a package was late, mark it with a '*'
-        if self.time_delivered is not None and self.time_delivered.time(
-        ) > self.time_deadline:
+        if self.delivered_seconds is not None and self.delivered_seconds > self.deadline_seconds:
             delivered_time += '*'
         else:
             delivered_time += ' '
@@ -1,6 +1,13 @@
 class PackageCorrection:
     """A correction required for a particular package."""
+    __slots__ = ('id', 'time', 'correction')
+
     def __init__(self, package_id, time, correction):
         self.id = package_id
         self.time = time
         self.correction = correction
+
+    def __hash__(self):
+        # Use the package ID as the "hash", like Package does
+        # An identity hash would change when a checkpoint is loaded, losing the HashSet bucket
+        return self.id
@@ -1,6 +1,6 @@
 import sys
 from enum import Enum
-from datetime import timedelta, datetime, time
+from datetime import timedelta, date
 
 from exceptions.NoDriverError import NoDriverError
 from exceptions.NoPackagesError import NoPackagesError
@@ -10,9 +10,12 @@ from exceptions.DeliveryException import DeliveryException
 from exceptions.TooEarlyError import TooEarlyError
 from structures.HashSet import HashSet
 from structures.Graph import Graph
+from structures.RouteTimeline import RouteTimeline
+from structures.ChangeTracker import ChangeTracker
 from utilities.Logger import Logger
 from entities.Package import Package
 from entities.Location import Location
+from utilities.Clock import to_datetime
 sys.path.append("..")
 
 
@@ -31,48 +34,217 @@ class Truck:
         def __repr__(self):
             return self.name
 
+    class Routing(Enum):
+        """How the truck orders its deliveries."""
+        NEAREST_NEIGHBOR = 0  # Deadline packages first, then the rest, by nearest neighbor
+        # Cheapest insertion that keeps every deadline, when possible
+        # Deadlines are only met trip by trip: a trip can end farther from the hub and delay
+        # the next one, so some deadlines can still be missed, package 6 on the sample data
+        TIME_WINDOWS = 1
+
+        def __str__(self):
+            return self.name
+
+        def __repr__(self):
+            return self.name
+
     AVERAGE_SPEED = 18  # Trucks move 18 MPH
     AVERAGE_SPEED_PER_SEC = AVERAGE_SPEED / 3600
     MAXIMUM_NUMBER_OF_PACKAGES = 16
     HUB_LOCATION = Location('HUB')
+    STATUSES = tuple(Status)  # Statuses are stored as their small int value
+
+    __slots__ = ('id', 'hub', 'fleet', 'slot', 'day', '_clock', 'status_clock', 'start_clock',
+                 'route_start_clock', 'driver', 'packages', '_status', 'speed', 'destinations',
+                 'target', 'source', 'route', '_distance_to_target', '_distance_traveled',
+                 'delivered_packages', '_distance_last_update', '_elapsed_last_update',
+                 'route_count', 'force_wait_for_packages', 'planned_route', 'routing',
+                 'late_locations', 'route_weight', 'route_is_priority', 'repair_passes',
+                 '_timeline', 'trip_packages', 'route_version', 'tracker')
+
+    def __init__(self, truck_id, clock: float, start_clock: float,
+                 destinations: Graph, hub: Location = None, day: date = None):
+        """Creates a new truck, bound to the specified hub (default is HUB_LOCATION).
 
-    def __init__(self, truck_id, current_time: datetime, start_time: time,
-                 destinations: Graph):
-        """Creates a new truck."""
+        Times are in seconds since midnight of the simulated day, today if not specified."""
         super().__init__()
 
         # Initialize data members
         self.id = truck_id
-        self.last_update = current_time
-        self.last_status_update = current_time
-        self.start_time = start_time
-        self.route_start_time = None
+        self.hub = hub if hub is not None else self.HUB_LOCATION
+        self.fleet = None  # If not None, the fleet holding the movement state of the truck
+        self.slot = None  # Index of the truck in the fleet
+        self.day = day if day is not None else date.today()
+        self._clock = clock
+        self.status_clock = clock  # Time of the last status change
+        self.start_clock = start_clock
+        self.route_start_clock = None  # Time the current trip started
         self.driver = None
         self.packages = HashSet(self.MAXIMUM_NUMBER_OF_PACKAGES)
-        self._status = self.Status.AT_FACILITY
+        self._status = self.Status.AT_FACILITY.value  # Stored as a small int, like in the fleet
         self.speed = self.AVERAGE_SPEED
         self.destinations = destinations
         self.target = None
         self.source = None
         self.route = None
-        self.route_start_time = None
-        self.distance_to_target = float('Inf')
-        self.distance_traveled = 0
+        self._distance_to_target = float('Inf')
+        self._distance_traveled = 0
         self.delivered_packages = 0
-        self.distance_last_update = 0
-        self.elapsed_last_update = timedelta()
+        self.trip_packages = []  # Packages delivered on the current trip, in delivery order
+        self._distance_last_update = 0
+        self._elapsed_last_update = 0
         self.route_count = 0
         self.force_wait_for_packages = False
+        self.planned_route = None  # Optional list of locations to deliver to, in order
+        self.routing = Truck.Routing.NEAREST_NEIGHBOR
+        self.late_locations = []  # Locations the current route can't reach before their deadline
+        self.route_weight = 0  # Weight of the remaining route, from the target to the last stop
+        self.route_is_priority = False  # Route only contains locations with a deadline
+        self.repair_passes = 2  # Local search passes after repairing a route, 0 disables them
+        self._timeline = None  # Built when first needed, and cleared whenever the route changes
+        self.route_version = 0  # Incremented whenever the route or the current leg changes
+        self.tracker = None  # If not None, the ChangeTracker status changes are published through
 
     @property
     def status(self):
         """The current status of the truck."""
-        return self._status
+        return Truck.STATUSES[self._status]
 
     @status.setter
     def status(self, status: Status):
-        self._status = status
-        self.last_status_update = self.last_update
+        if self.tracker is not None:
+            self.tracker.record(ChangeTracker.Kind.TRUCK_STATUS, self, self.status, status)
+        self._status = status.value
+        self.status_clock = self.clock
+        if self.fleet is not None:
+            self.fleet.status[self.slot] = status.value
+
+    @property
+    def timeline(self):
+        """The arrival times for the rest of the current route, None if not on route."""
+        if self.status == Truck.Status.AT_FACILITY or self.target is None:
+            return None
+
+        if self._timeline is None:
+            # Time complexity is O(N^2), but only once per route change
+            stops = [self.source, self.target]
+            if self.status != Truck.Status.EMPTY and self.route is not None:
+                stops.extend(self.destinations.vertices[v] for v in self.route)
+            if stops[-1] != self.hub:
+                stops.append(self.hub)
+
+            # Work back from the current position to when the truck left the source
+            leg = self.destinations.get_weight(self.source, self.target)
+            departure = self.last_update - timedelta(
+                seconds=(leg - self.distance_to_target) / self.AVERAGE_SPEED_PER_SEC)
+            self._timeline = RouteTimeline(self.destinations, stops, departure,
+                                           self.AVERAGE_SPEED_PER_SEC)
+        return self._timeline
+
+    def eta(self, package: Package):
+        """The time the package will be delivered, None if not known yet.
+
+        Packages without a deadline have no ETA while a deadline route is being delivered."""
+        timeline = self.timeline
+        if timeline is None or package.truck is not self or \
+                package.status == Package.Status.DELIVERED:
+            return None
+        return timeline.eta(package.location)
+
+    # The movement state is stored in the fleet when the truck is part of one,
+    # so the whole fleet can be moved at once. See Fleet.step.
+
+    @property
+    def clock(self):
+        """The time the truck was last simulated, in seconds since midnight of the simulated day."""
+        if self.fleet is not None:
+            return self.fleet.clock
+        return self._clock
+
+    @clock.setter
+    def clock(self, value: float):
+        if self.fleet is not None:
+            self.fleet.clock = value
+        else:
+            self._clock = value
+
+    @property
+    def last_update(self):
+        """The time the truck was last simulated."""
+        return to_datetime(self.clock, self.day)
+
+    @property
+    def last_status_update(self):
+        """The time of the last status change."""
+        return to_datetime(self.status_clock, self.day)
+
+    @property
+    def route_start_time(self):
+        """The time the current trip started, None before the first trip."""
+        if self.route_start_clock is None:
+            return None
+        return to_datetime(self.route_start_clock, self.day)
+
+    @property
+    def start_time(self):
+        """The time the truck can leave the facility for the first time."""
+        return to_datetime(self.start_clock, self.day)
+
+    @property
+    def distance_to_target(self):
+        """Distance left to travel to the current target."""
+        if self.fleet is not None:
+            return self.fleet.distance_to_target[self.slot]
+        return self._distance_to_target
+
+    @distance_to_target.setter
+    def distance_to_target(self, value: float):
+        if self.fleet is not None:
+            self.fleet.distance_to_target[self.slot] = value
+        else:
+            self._distance_to_target = value
+
+    @property
+    def distance_traveled(self):
+        """Distance traveled since the truck left the hub."""
+        if self.fleet is not None:
+            return self.fleet.distance_traveled[self.slot]
+        return self._distance_traveled
+
+    @distance_traveled.setter
+    def distance_traveled(self, value: float):
+        if self.fleet is not None:
+            self.fleet.distance_traveled[self.slot] = value
+        else:
+            self._distance_traveled = value
+
+    @property
+    def distance_last_update(self):
+        """Distance traveled during the last simulation step."""
+        if self.fleet is not None:
+            return self.fleet.distance_last_update[self.slot]
+        return self._distance_last_update
+
+    @distance_last_update.setter
+    def distance_last_update(self, value: float):
+        if self.fleet is not None:
+            self.fleet.distance_last_update[self.slot] = value
+        else:
+            self._distance_last_update = value
+
+    @property
+    def elapsed_last_update(self):
+        """Seconds spent on route during the last simulation step."""
+        if self.fleet is not None:
+            return self.fleet.elapsed if self.fleet.moved[self.slot] else 0
+        return self._elapsed_last_update
+
+    @elapsed_last_update.setter
+    def elapsed_last_update(self, value: float):
+        if self.fleet is not None:
+            self.fleet.moved[self.slot] = 1 if value else 0
+        else:
+            self._elapsed_last_update = value
 
     def add_package(self, package: Package):
         """Adds a package to the truck."""
@@ -91,55 +263,243 @@ class Truck:
 
     def calculate_route(self):
         """Calculates the optimal path for delivering the packages on board."""
+        # The runtime complexity of this method is O(N^2), O(N^3) when routing with time windows
+        self._timeline = None  # The route is about to change
+        self.route_version += 1
+        if self.__follows_plan():
+            # Follow the planned delivery order, skipping locations without packages
+            # The plan is only used once, any later changes are routed as usual
+            # Time complexity is O(N^2), due to looking up the vertex index
+            (locations, _) = self.__route_locations()
+            self.route = [
+                self.destinations.index_of(l) for l in self.planned_route
+                if locations.contains(l)
+            ]
+            self.planned_route = None
+            self.route_is_priority = False
+            self.route_weight = self.destinations.route_length(
+                self.route, self.destinations.index_of(self.hub))
+            Logger.log(Logger.LogLevel.VERBOSE, f"Following planned path {self.route}")
+            return
+
+        request = self.route_request()
+        if request is not None:
+            self.apply_route(request, Truck.solve_route(self.destinations, request))
+
+    def route_request(self):
+        """Describes the route calculate_route would solve, so it can be solved elsewhere.
+
+        returns: (routing, start, locations, deadlines, departure, priority), or None if there is
+                 nothing to solve, because the truck is empty or follows a planned route"""
+        # Time complexity is O(N)
+        if self.status == Truck.Status.EMPTY or self.__follows_plan():
+            return None
+
+        if self.route is None or len(self.route) == 0:
+            start = self.hub
+            departure = self.clock
+        else:
+            # If the route was already defined, some change happened, and we need to fix it
+            # This will build a new route which will take affect after the next delivery
+            Logger.log(Logger.LogLevel.WARNING,
+                       f"Recalculating route of truck {self.id} due to a change on route.")
+            start = self.target
+            departure = self.clock + \
+                self.distance_to_target / self.AVERAGE_SPEED_PER_SEC
+
+        if self.routing == Truck.Routing.TIME_WINDOWS:
+            # The deadline of a location is the earliest deadline of its packages
+            deadlines = {}
+            for p in self.packages:
+                if p.status == Package.Status.ON_TRUCK or p.status == Package.Status.IN_ROUTE:
+                    deadline = p.deadline_seconds
+                    deadlines[p.location] = min(deadline, deadlines.get(p.location, deadline))
+            return (self.routing, start, list(deadlines.keys()), list(deadlines.values()),
+                    departure, False)
+
+        # if we have packages that have a deadline, prioritize those
+        (locations, priority_locations) = self.__route_locations()
+        priority = len(priority_locations) > 0
+        if priority:
+            locations = priority_locations
+        return (self.routing, start, list(locations), None, departure, priority)
+
+    @staticmethod
+    def solve_route(destinations: Graph, request: tuple):
+        """Solves a route_request against the graph, without touching any truck.
+
+        returns: (path of vertex indexes, its weight, vertex indexes that will be late)"""
+        (routing, start, locations, deadlines, departure, _) = request
+
+        # Only the stops of this route are needed, a local copy of their weights is
+        # faster to search than the full graph, the path is translated back afterwards
+        # Time complexity is O(N^2), plus looking up the N stops
+        (local, indexes) = destinations.submatrix([start] + locations)
+
+        if routing == Truck.Routing.TIME_WINDOWS:
+            # Time complexity is O(N^3), from find_deadline_path
+            (route, distance, late) = local.find_deadline_path(
+                start, locations, deadlines, departure, Truck.AVERAGE_SPEED_PER_SEC)
+            return ([indexes[v] for v in route], distance, [indexes[v] for v in late])
+
+        # Worst case time complexity of find_shortest_path is O(N^2)
+        (route, distance) = local.find_shortest_path(start, locations)
+        return ([indexes[v] for v in route], distance, [])
+
+    def apply_route(self, request: tuple, result: tuple):
+        """Follows the result of solve_route for the request."""
+        (routing, _, _, _, _, priority) = request
+        (self.route, distance, late) = result
+        self._timeline = None
+        self.route_version += 1
+
+        if routing == Truck.Routing.TIME_WINDOWS:
+            # Report any deadline that can't be met now, rather than when the package is delivered
+            self.late_locations = [self.destinations.vertices[v] for v in late]
+            if len(self.late_locations) > 0:
+                Logger.log(Logger.LogLevel.ERROR,
+                           f"Truck {self.id} can't reach {self.late_locations} before their deadline!")
+        else:
+            self.route_is_priority = priority
+            self.route_weight = distance
+
+        if distance > 0 or routing == Truck.Routing.TIME_WINDOWS:
+            Logger.log(
+                Logger.LogLevel.VERBOSE,
+                f"Calculated path as {self.route} with a distance of {distance} miles"
+            )
+
+    def __follows_plan(self):
+        return self.planned_route is not None and self.status != Truck.Status.EMPTY and \
+            (self.route is None or len(self.route) == 0)
+
+    def __route_locations(self):
+        """Returns a HashSet of the locations of the packages on board, and one of those with a deadline."""
         # Get a list of all the "unique" addresses
         # HashSet is useful for that, since any duplicates are ignored
-        # The runtime complexity of this method is O(N^2)
-
-        # A HashSet is built containing all the locations for the packages
         # If there are multiple packages going to the same location,
         # They are counted as one total, for optimized path calculation
-        # Worst case space complexity is O(N^2)
-        locations = HashSet(len(self.packages))         # We have at most the number of packages
-        priority_locations = HashSet(len(self.packages))
-
-        # Build a list of all the locations,
-        # if there are packages with a delivery deadline,
-        # We build a path to those first, and come back to the rest after
         # If non-priority packages share a location with priority packages,
         # They will be included in the delivery.
         # Worst case time complexity for this is O(N)
+        locations = HashSet(len(self.packages))         # We have at most the number of packages
+        priority_locations = HashSet(len(self.packages))
         for p in self.packages:
             if p.status == Package.Status.ON_TRUCK or p.status == Package.Status.IN_ROUTE:
                 locations.add(p.location)
-                if p.time_deadline < time.max:
+                if p.deadline_seconds < Package.END_OF_DAY:
                     priority_locations.add(p.location)
+        return (locations, priority_locations)
 
-        # if we have packages that have a deadline, prioritize those
-        if len(priority_locations) > 0:
-            locations = priority_locations
+    def reroute_package(self, package: Package, old_location: Location):
+        """Repairs the route after a package on board changed location.
 
-        if self.status != Truck.Status.EMPTY:
-            # Worst case time complexity of find_shortest_path is O(N^2)
-            if self.route is None or len(self.route) == 0:
-                # Now that we know how many locations we have, pass that to the graph for the result
-                (self.route, distance) = self.destinations.find_shortest_path(
-                    self.HUB_LOCATION, locations)
-            else:
-                # If the route was already defined, some change happened, and we need to fix it
-                # This will build a new route which will take affect after the next delivery
-                Logger.log(Logger.LogLevel.WARNING,
-                           f"Recalculating route due to package correction.")
-                (self.route, distance) = self.destinations.find_shortest_path(
-                    self.target, locations)
-
-            if distance > 0:
-                Logger.log(
-                    Logger.LogLevel.VERBOSE,
-                    f"Calculated path as {self.route} with a distance of {distance} miles"
-                )
+        The old stop is removed if nothing else goes there, and the new stop is inserted
+        at its cheapest position, followed by a bounded local search.
+        Time complexity is O(N) for the repair, and O(N^2) per local search pass."""
+        if self.status != Truck.Status.ON_ROUTE or self.route is None:
+            # The route is built when the truck leaves, or was never started
+            return
+
+        if self.routing == Truck.Routing.TIME_WINDOWS:
+            # Deadlines of the whole route have to be checked again
+            self.calculate_route()
+            return
+
+        # The route continues from the current target, which can't be changed anymore
+        still_needed = False
+        for p in self.packages:
+            if p is not package and p.location == old_location and \
+                    (p.status == Package.Status.ON_TRUCK or p.status == Package.Status.IN_ROUTE):
+                still_needed = True
+                break
+
+        if not still_needed:
+            self.route_weight += self.destinations.remove_from_path(
+                self.target, self.route, old_location)
+
+        # Packages without a deadline wait for the priority route to finish, as usual
+        vertex = self.destinations.index_of(package.location)
+        if package.location != self.target and vertex not in self.route and \
+                (package.deadline_seconds < Package.END_OF_DAY or not self.route_is_priority):
+            self.route_weight += self.destinations.insert_cheapest(
+                self.target, self.route, vertex)
+
+        if self.repair_passes > 0:
+            self.__improve_route()
+        self._timeline = None
+        self.route_version += 1
+
+        Logger.log(
+            Logger.LogLevel.VERBOSE,
+            f"Repaired path as {self.route} with a distance of {self.route_weight} miles"
+        )
+
+    def update_edge_weight(self, u: int, v: int, previous_weight: float):
+        """Repairs the route after the weight of the edge from vertex u to v changed.
+
+        The truck keeps driving to its current target, only the distance left on that leg changes.
+        The rest of the route is improved by a bounded local search, or recalculated when
+        routing with time windows, since every deadline has to be checked again."""
+        # Time complexity is O(N) for the repair, and O(N^2) per local search pass
+        weight = self.destinations.get_weight(u, v)
+        target = self.destinations.index_of(self.target) if self.target is not None else -1
+        if self.source is not None and previous_weight > 0 and \
+                self.destinations.index_of(self.source) == u and target == v:
+            # Part of the leg was already driven, what's left changes in proportion
+            self.distance_to_target *= weight / previous_weight
+
+        if self.status == Truck.Status.ON_ROUTE and self.route is not None and len(self.route) > 0:
+            if self.routing == Truck.Routing.TIME_WINDOWS:
+                self.calculate_route()
+                return
+
+            previous = target
+            for w in self.route:
+                if previous == u and w == v:
+                    self.route_weight += weight - previous_weight
+                previous = w
+            if self.repair_passes > 0:
+                self.__improve_route()
+
+        self._timeline = None
+        self.route_version += 1
+
+    def __improve_route(self):
+        """Improves the rest of a repaired route with a bounded local search.
+
+        The local search can get stuck on a longer route than building the route again,
+        so the nearest neighbor route is kept instead when it's shorter."""
+        # Time complexity is O(N^2) per local search pass, and O(N^2) to build the route again
+        self.route_weight += self.destinations.improve_path(
+            self.target, self.route, self.repair_passes)
+        try:
+            (path, weight) = self.destinations.find_shortest_path(self.target, self.route)
+        except IndexError:
+            # Not every stop can be reached greedily, the repaired route is kept
+            return
+        if weight < self.route_weight - 1e-9:
+            self.route = path
+            self.route_weight = weight
+
+    def route_legs(self):
+        """The legs left to drive, as (u, v) vertex indexes, including the current leg
+        and the return to the hub."""
+        # Time complexity is O(N)
+        if self.status == Truck.Status.AT_FACILITY or self.target is None:
+            return []
+
+        stops = [self.destinations.index_of(self.source), self.destinations.index_of(self.target)]
+        if self.status != Truck.Status.EMPTY and self.route is not None:
+            stops.extend(self.route)
+        hub = self.destinations.index_of(self.hub)
+        if stops[-1] != hub:
+            stops.append(hub)
+        return list(zip(stops, stops[1:]))
 
     def __calculate_next_target(self):
         # Worst case time complexity is O(N^2)
+        self.route_version += 1
         try:
             # First run, source will be set, and target will not
             if self.target is not None:
@@ -148,9 +508,12 @@ class Truck:
             self.target = self.destinations.vertices[self.route.pop(0)]
             # O(N) time complexity
             self.__update_target_packages(Package.Status.IN_ROUTE)
+            # The leg to the new target isn't part of the remaining route anymore
+            self.route_weight = max(self.route_weight - self.destinations.get_weight(
+                self.source, self.target), 0)
         except IndexError:
             # No more packages
-            if self.target is not None and self.target == self.HUB_LOCATION:
+            if self.target is not None and self.target == self.hub:
                 # We are home
                 self.status = Truck.Status.AT_FACILITY
                 self.source = None
@@ -167,16 +530,36 @@ class Truck:
 
             # No more deliverable packages, return to HUB
             self.status = Truck.Status.EMPTY
-            self.target = self.HUB_LOCATION
+            self.target = self.hub
         # Because we look up weights based on Location class (string), not an index
         # This is an O(N) operation
         self.distance_to_target = self.destinations.get_weight(
             self.source, self.target)
 
-    def start_route(self):
-        """Tells the truck to start delivering packages."""
+    def start_route(self, request: tuple = None, result: tuple = None):
+        """Tells the truck to start delivering packages.
+
+        request, result - optional, the route_request of this truck already solved by solve_route"""
+        self.check_start()
+
+        # Build the route and set the starting conditions
+        if result is None:
+            self.calculate_route()
+        else:
+            self.apply_route(request, result)
+        self.distance_traveled = 0
+        self.delivered_packages = 0
+        self.trip_packages = []
+        self.route_start_clock = self.clock
+        self.status = Truck.Status.ON_ROUTE  # Signal the truck has started
+        self.source = self.hub
+        self.__calculate_next_target()
+        self.route_count += 1  # Counter for how many times the truck left the HUB
+
+    def check_start(self):
+        """Raises the error that keeps the truck from starting its route, if there is one."""
         # If the day hasn't started yet, it can't leave
-        if self.start_time > self.last_update:
+        if self.start_clock > self.clock:
             raise TooEarlyError("Truck can't leave before {self.start_time}")
         # Truck can't begin a route if it's already on one
         if self.status == Truck.Status.ON_ROUTE or self.status == Truck.Status.EMPTY:
@@ -199,26 +582,11 @@ class Truck:
                     "Truck {self.id} cannot leave without deliverable packages!"
                 )
 
-        # Build the route and set the starting conditions
-        self.calculate_route()
-        self.distance_traveled = 0
-        self.delivered_packages = 0
-        self.route_start_time = self.last_update
-        self.status = Truck.Status.ON_ROUTE  # Signal the truck has started
-        self.source = self.HUB_LOCATION
-        self.__calculate_next_target()
-        self.route_count += 1  # Counter for how many times the truck left the HUB
-
-    def simulate(self, current_datetime: datetime):
-        """Simulate truck movement since the last update."""
+    def simulate(self, clock: float):
+        """Simulate truck movement since the last update, until the clock in seconds."""
         # Worst case time complexity O(N^2)
         # This simulates the truck's activity
-        # Calculate the changes that have happened since the last update
-        previous_datetime = self.last_update
-        timestep = current_datetime - previous_datetime
-        self.last_update = current_datetime
-        self.elapsed_last_update = timedelta()
-        self.distance_last_update = 0
+        timestep = self.begin_tick(clock)
 
         if self.status == Truck.Status.AT_FACILITY:
             # If the truck is sitting at the facility, see if it can leave
@@ -232,29 +600,48 @@ class Truck:
         elif self.status == Truck.Status.EMPTY and len(self.packages) > 0:
             self.force_wait_for_packages = True
 
+        self.advance(timestep)
+
+    def begin_tick(self, clock: float):
+        """Moves the truck to the clock in seconds, returns the seconds since the last update."""
+        # Calculate the changes that have happened since the last update
+        previous_clock = self.clock
+        self.clock = clock
+        self.elapsed_last_update = 0
+        self.distance_last_update = 0
+        return clock - previous_clock
+
+    def advance(self, timestep: float):
+        """Moves the truck along its route for the timestep, in seconds."""
+        # Worst case time complexity O(N^2), when a target is reached
         # Calculate the distance we traveled since the last update
-        delta_distance = self.AVERAGE_SPEED_PER_SEC * timestep.total_seconds()
+        delta_distance = self.AVERAGE_SPEED_PER_SEC * timestep
         self.distance_to_target -= delta_distance
         self.distance_traveled += delta_distance
         self.distance_last_update = delta_distance
         self.elapsed_last_update = timestep
-        overflow = self.distance_to_target
 
         if self.distance_to_target <= 0:
-            # Worst case time complexity O(N^2)
-            if self.status == Truck.Status.ON_ROUTE:
-                # We reached the destination, deliver the package!
-                self.__deliver_packages(self.target)
-                self.__calculate_next_target()
+            self.reach_target()
+
+    def reach_target(self):
+        """Handles reaching the target, once the distance to the target is no longer positive."""
+        # Worst case time complexity O(N^2)
+        overflow = self.distance_to_target
+
+        if self.status == Truck.Status.ON_ROUTE:
+            # We reached the destination, deliver the package!
+            self.__deliver_packages(self.target)
+            self.__calculate_next_target()
 
-                # Any overflow we want to apply towards the next destination
-                self.distance_to_target += overflow
-            elif self.status == Truck.Status.EMPTY:
-                self.__calculate_next_target()
+            # Any overflow we want to apply towards the next destination
+            self.distance_to_target += overflow
+        elif self.status == Truck.Status.EMPTY:
+            self.__calculate_next_target()
 
-                # We have returned to the HUB
-                # Any overflow we cancel out, we didn't actually travel that distance
-                self.distance_traveled -= overflow
+            # We have returned to the HUB
+            # Any overflow we cancel out, we didn't actually travel that distance
+            self.distance_traveled -= overflow
 
     def __update_target_packages(self, status: Package.Status):
         # This is O(N) time complexity
@@ -271,9 +658,10 @@ class Truck:
             if p.location == location and p.status == Package.Status.IN_ROUTE:
                 try:
                     # Delivery successful remove package
-                    p.deliver(self.last_update)
+                    p.deliver(self.last_update, self.clock)
                     self.packages.remove(p)
                     self.delivered_packages += 1
+                    self.trip_packages.append(p)
                 except DeliveryException:
                     # There was an exception during deliver (wrong address?), log it and keep going
                     Logger.log(Logger.LogLevel.ERROR,
@@ -0,0 +1,5 @@
+from .Error import Error
+
+
+class ConstraintError(Error):
+    """Package delivery constraints can't be satisfied."""
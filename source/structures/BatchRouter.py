@@ -0,0 +1,84 @@
+import sys
+from multiprocessing import Pool
+sys.path.append("..")
+
+from entities.Truck import Truck
+from utilities.Logger import Logger
+
+# Graph of a worker process, copied once when the worker starts, then only sent weight changes
+_destinations = None
+
+
+class BatchRouter:
+    """Solves the routes of many trucks at once, in a pool of worker processes.
+
+    Every worker holds its own copy of the destinations graph, sent once when the pool starts,
+    so a batch only sends the route requests, with the weight changes made since the pool
+    started, and receives the paths.
+    Results are returned in the order of the requests, regardless of which worker solved them."""
+
+    def __init__(self, processes: int = None, minimum_batch: int = 2):
+        """processes - number of worker processes, None for one per CPU, 1 to solve in this process
+        minimum_batch - smaller batches are solved in this process, it's faster than a round trip"""
+        super().__init__()
+        self.processes = processes
+        self.minimum_batch = minimum_batch
+        self.batches = 0
+        self.routes_solved = 0
+        self.__pool = None
+        self.__destinations = None
+        self.__version = 0  # Graph version the workers were started with
+
+    def solve(self, destinations, requests: list):
+        """Solves a list of Truck.route_request against the graph.
+
+        returns: a list of Truck.solve_route results, in the same order as the requests"""
+        self.batches += 1
+        self.routes_solved += len(requests)
+        if self.processes == 1 or len(requests) < self.minimum_batch:
+            return [Truck.solve_route(destinations, r) for r in requests]
+
+        if self.__pool is None or self.__destinations is not destinations:
+            # Workers keep the graph they were started with, a different graph needs new workers
+            self.close()
+            Logger.log(Logger.LogLevel.VERBOSE, f"Starting route workers")
+            self.__pool = Pool(self.processes, initializer=_init_worker,
+                               initargs=(destinations, Logger.instance().level))
+            self.__destinations = destinations
+            self.__version = destinations.version
+
+        # Workers skip the changes they already applied, so only the first batch after an update
+        # does any work, without restarting the workers for each change
+        changes = destinations.changes_since(self.__version)
+        return self.__pool.map(_solve_route, [(changes, r) for r in requests])
+
+    def close(self):
+        """Stops the worker processes, they are started again by the next batch."""
+        if self.__pool is not None:
+            self.__pool.close()
+            self.__pool.join()
+            self.__pool = None
+            self.__destinations = None
+
+    def __getstate__(self):
+        # Worker processes can't be saved, they are started again when needed
+        state = self.__dict__.copy()
+        state['_BatchRouter__pool'] = None
+        state['_BatchRouter__destinations'] = None
+        return state
+
+
+def _init_worker(destinations, log_level):
+    """Worker process initializer, keeps the graph for every route solved by this worker."""
+    global _destinations
+    _destinations = destinations
+    Logger.instance().level = log_level
+
+
+def _solve_route(task):
+    """Worker process entry point, applies any new weight changes and solves a single route request."""
+    (changes, request) = task
+    for (version, u, v, weight) in changes:
+        if version > _destinations.version:
+            _destinations.update_weight(u, v, weight, directed=True)
+    return Truck.solve_route(_destinations, request)
@@ -0,0 +1,97 @@
+import sys
+from enum import Enum
+sys.path.append("..")
+
+
+class ChangeTracker:
+    """Collects the changes made to packages and trucks, and publishes them in batches.
+
+    Packages and trucks holding a tracker record every change of their status, truck or location,
+    so consumers only process what changed, instead of scanning every entity each tick.
+    Recording a change is O(1), publishing a batch is O(C) per subscriber, for C changes."""
+    class Kind(Enum):
+        """Type of change, the entity and values of each kind are listed."""
+        PACKAGE_STATUS = 0  # Package, Package.Status
+        PACKAGE_TRUCK = 1  # Package, Truck or None
+        PACKAGE_LOCATION = 2  # Package, Location
+        TRUCK_STATUS = 3  # Truck, Truck.Status
+
+        def __str__(self):
+            return self.name
+
+        def __repr__(self):
+            return self.name
+
+    class Change:
+        """A property of an entity that changed, with its value before and after."""
+        __slots__ = ('kind', 'entity', 'previous', 'value')
+
+        def __init__(self, kind, entity, previous, value):
+            self.kind = kind
+            self.entity = entity
+            self.previous = previous
+            self.value = value
+
+        def __repr__(self):
+            return f"{self.kind} {self.entity.id}: {self.previous} -> {self.value}"
+
+    def __init__(self):
+        super().__init__()
+        self.changes = []  # Changes since the last flush, in the order they were made
+        self.dirty_packages = {}  # Package ID -> package changed since the last flush
+        self.dirty_trucks = {}  # Truck ID -> truck changed since the last flush
+        self.batches = 0
+        self.__subscribers = []  # (callback, set of kinds, or None for every kind)
+
+    def subscribe(self, callback, kinds=None):
+        """Calls callback with the list of changes of every batch, optionally only of some kinds.
+
+        Batches without any change of those kinds are not published to the callback.
+        Subscribers are not saved in checkpoints."""
+        self.__subscribers.append((callback, set(kinds) if kinds is not None else None))
+
+    def unsubscribe(self, callback):
+        """Stops publishing changes to the callback."""
+        self.__subscribers = [s for s in self.__subscribers if s[0] != callback]
+
+    def record(self, kind: Kind, entity, previous, value):
+        """Records a change of an entity, setting a property to the value it already had is ignored."""
+        if previous == value:
+            return
+
+        self.changes.append(ChangeTracker.Change(kind, entity, previous, value))
+        if kind == ChangeTracker.Kind.TRUCK_STATUS:
+            self.dirty_trucks[entity.id] = entity
+        else:
+            self.dirty_packages[entity.id] = entity
+
+    def flush(self):
+        """Publishes the changes since the last flush to the subscribers, and starts a new batch.
+
+        returns: the list of changes published"""
+        changes = self.changes
+        self.changes = []
+        self.dirty_packages = {}
+        self.dirty_trucks = {}
+        if len(changes) == 0:
+            return changes
+
+        self.batches += 1
+        for (callback, kinds) in self.__subscribers:
+            if kinds is None:
+                callback(changes)
+                continue
+            selected = [c for c in changes if c.kind in kinds]
+            if len(selected) > 0:
+                callback(selected)
+        return changes
+
+    def __len__(self):
+        """Number of changes since the last flush."""
+        return len(self.changes)
+
+    def __getstate__(self):
+        # Subscribers are tied to this process, they are added again after loading a checkpoint
+        state = self.__dict__.copy()
+        state['_ChangeTracker__subscribers'] = []
+        return state
@@ -0,0 +1,59 @@
+import sys
+sys.path.append("..")
+
+
+class DisjointSet:
+    """Union-find structure over hashable items, with path compression and union by size.
+       Operations are effectively O(1) amortized."""
+    def __init__(self):
+        super().__init__()
+        self.parent = {}
+        self.size = {}
+
+    def add(self, item):
+        """Adds an item in its own set, if it isn't already present."""
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = 1
+
+    def find(self, item):
+        """Returns the representative item of the set containing the item."""
+        self.add(item)
+
+        # Find the root of the tree
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+
+        # Path compression, point every item along the way directly at the root
+        while self.parent[item] != root:
+            (self.parent[item], item) = (root, self.parent[item])
+
+        return root
+
+    def union(self, a, b):
+        """Merges the sets containing a and b, returns the representative of the merged set."""
+        root_a = self.find(a)
+        root_b = self.find(b)
+
+        if root_a == root_b:
+            return root_a
+
+        # Attach the smaller tree under the larger, to keep the trees shallow
+        if self.size[root_a] < self.size[root_b]:
+            (root_a, root_b) = (root_b, root_a)
+
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        return root_a
+
+    def groups(self):
+        """Returns a dictionary of representative -> list of items in that set."""
+        # Time complexity is O(N)
+        result = {}
+        for item in self.parent:
+            result.setdefault(self.find(item), []).append(item)
+        return result
+
+    def __len__(self):
+        return len(self.parent)
@@ -0,0 +1,54 @@
+import sys
+import heapq
+from enum import Enum
+sys.path.append("..")
+
+
+class EventScheduler:
+    """Min-heap of timed events, ordered by due time, then by the order they were scheduled.
+       Scheduling and popping an event are O(log N)."""
+    class Kind(Enum):
+        """Type of scheduled event."""
+        CORRECTION = 0  # Payload is a PackageCorrection
+        ARRIVAL = 1  # Payload is a delayed Package
+        TRUCK_START = 2  # Payload is a Truck
+        WEIGHT_CHANGE = 3  # Payload is (u, v, weight, directed, road)
+
+        def __str__(self):
+            return self.name
+
+        def __repr__(self):
+            return self.name
+
+    def __init__(self):
+        super().__init__()
+        self.heap = []
+        self.__sequence = 0  # Keeps events due at the same time in scheduling order
+
+    def schedule(self, due: float, kind: Kind, payload):
+        """Schedules an event, due is in seconds since midnight."""
+        heapq.heappush(self.heap, (due, self.__sequence, kind, payload))
+        self.__sequence += 1
+
+    def pop_due(self, now: float):
+        """Removes and returns every event due at or before now, as a list of (kind, payload)."""
+        # Time complexity is O(K log N), for K due events
+        due = []
+        while len(self.heap) > 0 and self.heap[0][0] <= now:
+            (_, _, kind, payload) = heapq.heappop(self.heap)
+            due.append((kind, payload))
+        return due
+
+    def next_due_time(self):
+        """The due time of the next event in seconds since midnight, None if nothing is scheduled."""
+        return self.heap[0][0] if len(self.heap) > 0 else None
+
+    def pending(self, kind: Kind):
+        """Iterates over the payloads of the scheduled events of a kind, in no particular order."""
+        # Time complexity is O(N)
+        for (_, _, event_kind, payload) in self.heap:
+            if event_kind == kind:
+                yield payload
+
+    def __len__(self):
+        return len(self.heap)
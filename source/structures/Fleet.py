@@ -0,0 +1,116 @@
+import sys
+from array import array
+
+from entities.Truck import Truck
+from exceptions.NoDriverError import NoDriverError
+from exceptions.NoPackagesError import NoPackagesError
+from exceptions.AlreadyInProgressException import AlreadyInProgressException
+from exceptions.TooEarlyError import TooEarlyError
+sys.path.append("..")
+
+
+class Fleet:
+    """Moves a whole fleet of trucks at once.
+
+    The movement state of every truck is stored in parallel arrays, one slot per truck,
+    and advanced in a single pass. Only trucks that reach their target, or are waiting
+    at the facility, run per-truck logic."""
+
+    _ON_ROUTE = Truck.Status.ON_ROUTE.value
+    _EMPTY = Truck.Status.EMPTY.value
+    _AT_FACILITY = Truck.Status.AT_FACILITY.value
+
+    def __init__(self, clock: float):
+        super().__init__()
+        self.trucks = []
+        self.clock = clock  # Seconds since midnight of the simulated day, shared by every truck
+        self.elapsed = 0  # Seconds since the previous step
+
+        # Parallel arrays, indexed by the slot of the truck
+        self.distance_to_target = array('d')
+        self.distance_traveled = array('d')
+        self.distance_last_update = array('d')
+        self.status = array('b')
+        self.moved = array('b')
+        self.arrived = []  # Trucks that returned to the facility during the last step
+
+    def add(self, truck: Truck):
+        """Adds a truck to the fleet, its movement state is moved into the fleet."""
+        distance_to_target = truck.distance_to_target
+        distance_traveled = truck.distance_traveled
+        distance_last_update = truck.distance_last_update
+        moved = 1 if truck.elapsed_last_update else 0
+
+        self.distance_to_target.append(distance_to_target)
+        self.distance_traveled.append(distance_traveled)
+        self.distance_last_update.append(distance_last_update)
+        self.status.append(truck.status.value)
+        self.moved.append(moved)
+
+        truck.slot = len(self.trucks)
+        truck.fleet = self
+        self.trucks.append(truck)
+
+    def step(self, clock: float, start_trucks=None):
+        """Moves every truck to the clock, in seconds since midnight of the simulated day.
+
+        start_trucks - optional function called with the list of trucks waiting at the facility,
+                       once the clock moved, to start those that can leave instead of the fleet
+        Returns the total distance traveled, and the total seconds spent on route by all trucks."""
+        timestep = clock - self.clock
+        self.clock = clock
+        self.elapsed = timestep
+        delta_distance = Truck.AVERAGE_SPEED_PER_SEC * timestep
+
+        # Trucks waiting at the facility try to leave first, as in Truck.simulate
+        # This is the only per-truck work for trucks that aren't moving
+        status = self.status
+        waiting = [self.trucks[slot] for slot in range(len(status))
+                   if status[slot] == self._AT_FACILITY]
+        if start_trucks is not None:
+            start_trucks(waiting)
+        else:
+            for truck in waiting:
+                try:
+                    truck.start_route()
+                except (NoDriverError, NoPackagesError, AlreadyInProgressException,
+                        TooEarlyError):
+                    pass
+
+        # Advance every moving truck, in a single pass over the arrays
+        # Time complexity is O(T), with no per-truck attribute lookups
+        distance_to_target = self.distance_to_target
+        distance_traveled = self.distance_traveled
+        distance_last_update = self.distance_last_update
+        moved = self.moved
+        reached = []
+
+        for slot in range(len(status)):
+            code = status[slot]
+            if code == self._ON_ROUTE or code == self._EMPTY:
+                remaining = distance_to_target[slot] - delta_distance
+                distance_to_target[slot] = remaining
+                distance_traveled[slot] += delta_distance
+                distance_last_update[slot] = delta_distance
+                moved[slot] = 1
+                if remaining <= 0:
+                    reached.append(slot)
+            else:
+                distance_last_update[slot] = 0
+                moved[slot] = 0
+
+        # Only trucks that reached their target need per-truck logic
+        self.arrived = []
+        for slot in reached:
+            truck = self.trucks[slot]
+            if status[slot] == self._EMPTY and len(truck.packages) > 0:
+                # Returning with undeliverable packages, wait at the facility for new ones
+                truck.force_wait_for_packages = True
+            truck.reach_target()
+            if status[slot] == self._AT_FACILITY:
+                self.arrived.append(truck)
+
+        return (sum(distance_last_update), timestep * sum(moved))
+
+    def __len__(self):
+        return len(self.trucks)
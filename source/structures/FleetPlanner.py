@@ -0,0 +1,304 @@
+import sys
+
+from entities.Truck import Truck
+from structures.Graph import Graph
+from utilities.Logger import Logger
+from utilities.Clock import to_seconds, to_time
+sys.path.append("..")
+
+
+class FleetPlanner:
+    """Plans the loads and trips of the whole fleet for the day.
+
+    Trips are built with the Clarke-Wright savings heuristic, respecting truck capacity,
+    deadlines, arrival times, required trucks and co-delivery groups.
+    Trips are then given to the truck that can complete them with the least lateness."""
+
+    class Stop:
+        """A location on a trip, and the packages delivered there."""
+        def __init__(self, vertex: int, packages: list):
+            self.vertex = vertex
+            self.packages = packages
+            self.route = None  # The route this stop currently belongs to
+
+    class Route:
+        """A trip being built: a sequence of stops, starting and ending at the hub."""
+        def __init__(self, stops: list, ready: float, requires_truck, parts: list = None):
+            self.stops = stops
+            self.ready = ready  # Seconds since midnight, when all packages are at the hub
+            self.requires_truck = requires_truck
+            self.count = sum(len(s.packages) for s in stops)
+            self.parts = parts if parts is not None else [self]  # Initial routes merged into this
+            for s in stops:
+                s.route = self
+
+    class Trip:
+        """A planned trip for a truck."""
+        def __init__(self, truck_id, packages: list, locations: list, departure: float,
+                     finish: float, distance: float, late_packages: list):
+            self.truck_id = truck_id
+            self.packages = packages  # Packages in delivery order
+            self.locations = locations  # Locations in delivery order, excluding the hub
+            self.departure = departure  # Seconds since midnight
+            self.finish = finish  # Seconds since midnight, back at the hub
+            self.distance = distance
+            self.late_packages = late_packages
+
+        @property
+        def ready_time(self):
+            """The time of day the trip can leave the hub."""
+            return to_time(self.departure)
+
+        def __repr__(self):
+            return f"Trip truck {self.truck_id} at {self.ready_time}: {[p.id for p in self.packages]}"
+
+    def __init__(self, destinations: Graph, hub=Truck.HUB_LOCATION):
+        super().__init__()
+        self.destinations = destinations
+        self.hub = hub
+        self.capacity = Truck.MAXIMUM_NUMBER_OF_PACKAGES
+        self.speed = Truck.AVERAGE_SPEED_PER_SEC
+        self.__hub_vertex = destinations.index_of(hub)
+        self.__vertices = {}
+
+    def plan(self, units: list, trucks: list, ready_times: dict = None):
+        """Plans trips for the packages, returns a dictionary of truck ID -> list of trips.
+
+        units - list of tuples of packages, each tuple must be delivered together
+        trucks - list of trucks that can be used, trucks without a driver should be excluded
+        ready_times - optional, package ID -> time the package can leave the hub at the earliest"""
+        routes = self.__build_initial_routes(units, ready_times or {})
+        start = min((t.start_clock for t in trucks), default=0)
+        routes = self.__merge_routes(routes, start)
+        return self.__assign_trucks(routes, trucks)
+
+    def __vertex(self, location):
+        # Looking up a vertex by name is O(N), so cache the result per location
+        key = hash(location)
+        if key not in self.__vertices:
+            self.__vertices[key] = self.destinations.index_of(location)
+        return self.__vertices[key]
+
+    def __weight(self, u: int, v: int):
+        return self.destinations.get_weight(u, v) if u != v else 0
+
+    def __build_initial_routes(self, units: list, ready_times: dict):
+        # Every co-delivery group is a route of its own, all its stops stay together
+        # Every other location starts as a route with a single stop
+        # Time complexity is O(N)
+        routes = []
+        single = {}
+
+        for unit in units:
+            ready = 0
+            for p in unit:
+                if p.arrival_seconds is not None:
+                    ready = max(ready, p.arrival_seconds)
+                ready = max(ready, to_seconds(ready_times.get(p.id)))
+
+            requires_truck = None
+            for p in unit:
+                if p.requires_truck is not None:
+                    requires_truck = p.requires_truck
+
+            if len(unit) > 1:
+                stops = {}
+                for p in unit:
+                    stops.setdefault(self.__vertex(p.location), []).append(p)
+                routes.append(FleetPlanner.Route(
+                    [FleetPlanner.Stop(v, ps) for (v, ps) in stops.items()],
+                    ready, requires_truck))
+            else:
+                # Packages with the same location, readiness and truck can share a stop
+                key = (self.__vertex(unit[0].location), ready, requires_truck)
+                single.setdefault(key, []).extend(unit)
+
+        for ((vertex, ready, requires_truck), packages) in single.items():
+            for i in range(0, len(packages), self.capacity):
+                routes.append(FleetPlanner.Route(
+                    [FleetPlanner.Stop(vertex, packages[i:i + self.capacity])],
+                    ready, requires_truck))
+
+        return routes
+
+    def __is_feasible(self, stops: list, departure: float):
+        """Checks that every deadline on the route is met, leaving at the departure time."""
+        # Time complexity is O(S), for S stops
+        current = departure
+        previous = self.__hub_vertex
+        for stop in stops:
+            current += self.__weight(previous, stop.vertex) / self.speed
+            previous = stop.vertex
+            for p in stop.packages:
+                if current > p.deadline_seconds:
+                    return False
+        return True
+
+    def __merge_routes(self, routes: list, start: float):
+        # Clarke-Wright savings: joining two routes at their ends saves the trip back to the hub
+        # Time complexity is O(S^2 log S) for sorting the savings of S stops
+        hub = self.__hub_vertex
+        stops = [s for r in routes for s in r.stops]
+        savings = []
+
+        for i in range(len(stops)):
+            a = stops[i]
+            hub_a = self.__weight(hub, a.vertex)
+            for j in range(i + 1, len(stops)):
+                b = stops[j]
+                if a.route is b.route:
+                    continue
+                saving = hub_a + self.__weight(hub, b.vertex) - self.__weight(a.vertex, b.vertex)
+                # Index pairs keep the sort deterministic for equal savings
+                savings.append((-saving, i, j))
+
+        savings.sort()
+
+        for (_, i, j) in savings:
+            a = stops[i]
+            b = stops[j]
+            first = a.route
+            second = b.route
+
+            if first is second:
+                continue
+            if first.count + second.count > self.capacity:
+                continue
+            if first.requires_truck is not None and second.requires_truck is not None \
+                    and first.requires_truck != second.requires_truck:
+                continue
+
+            # Only stops at the ends of their routes can be joined: ... a -> b ...
+            if first.stops[-1] is a:
+                left = first.stops
+            elif first.stops[0] is a:
+                left = first.stops[::-1]
+            else:
+                continue
+            if second.stops[0] is b:
+                right = second.stops
+            elif second.stops[-1] is b:
+                right = second.stops[::-1]
+            else:
+                continue
+
+            merged = left + right
+            ready = max(first.ready, second.ready)
+            if not self.__is_feasible(merged, max(ready, start)):
+                continue
+
+            requires_truck = first.requires_truck if first.requires_truck is not None \
+                else second.requires_truck
+            FleetPlanner.Route(merged, ready, requires_truck, first.parts + second.parts)
+
+        # Collect the routes that survived merging, in a deterministic order
+        return [s.route for s in stops if s.route.stops[0] is s]
+
+    def __assign_trucks(self, routes: list, trucks: list):
+        # Routes with the earliest deadlines are given out first,
+        # each to the truck that finishes it with the least lateness, then the earliest
+        # A trip can be inserted in any idle gap of a truck, not just after its last trip
+        # Routes were merged assuming they leave when ready, but a truck may only be free later,
+        # so a route that would be late is split in two and both halves are given out again
+        # Time complexity is O(R^2 * T * S)
+        def order(route):
+            return (min(p.deadline_seconds for s in route.stops for p in s.packages), route.ready)
+
+        queue = sorted(routes, key=order)
+        start = {t.id: t.start_clock for t in trucks}
+        plan = {t.id: [] for t in trucks}
+
+        while len(queue) > 0:
+            route = queue.pop(0)
+            best = None
+            for truck in trucks:
+                if route.requires_truck is not None and route.requires_truck != truck.id:
+                    continue
+                trip = self.__insert_trip(route, truck.id, start[truck.id], plan[truck.id])
+                key = (len(trip.late_packages), trip.finish, truck.id)
+                if best is None or key < best[0]:
+                    best = (key, trip)
+
+            if best is None:
+                Logger.log(Logger.LogLevel.WARNING,
+                           f"No truck available for packages {[p.id for s in route.stops for p in s.packages]}")
+                continue
+
+            trip = best[1]
+            if len(trip.late_packages) > 0:
+                if len(route.parts) > 1:
+                    queue.extend(self.__split(route))
+                    queue.sort(key=order)
+                else:
+                    # Leaving the packages unplanned is no worse than a plan known to be late
+                    Logger.log(Logger.LogLevel.WARNING,
+                               f"No planned trip delivers {trip.late_packages} on time, "
+                               f"leaving {[p.id for p in trip.packages]} to assign_packages")
+                continue
+
+            trips = plan[trip.truck_id]
+            trips.append(trip)
+            trips.sort(key=lambda t: t.departure)
+
+        return plan
+
+    @staticmethod
+    def __split(route):
+        """Splits a merged route in two, each half made of whole initial routes."""
+        # Stops keep the order they had in the merged route
+        # Time complexity is O(S log S)
+        position = {id(s): i for (i, s) in enumerate(route.stops)}
+        parts = sorted(route.parts, key=lambda part: min(position[id(s)] for s in part.stops))
+        half = len(parts) // 2
+
+        halves = []
+        for members in (parts[:half], parts[half:]):
+            stops = sorted((s for part in members for s in part.stops), key=lambda s: position[id(s)])
+            ready = max(part.ready for part in members)
+            requires_truck = next((part.requires_truck for part in members
+                                   if part.requires_truck is not None), None)
+            halves.append(FleetPlanner.Route(stops, ready, requires_truck, members))
+        return halves
+
+    def __insert_trip(self, route, truck_id, start: float, trips: list):
+        """Builds the trip for the earliest idle gap of the truck it fits in."""
+        # The duration of the trip doesn't depend on when it leaves
+        trip = self.__build_trip(route, truck_id, 0)
+        duration = trip.finish
+
+        gap_start = start
+        for scheduled in trips:
+            departure = max(gap_start, route.ready)
+            if departure + duration <= scheduled.departure:
+                return self.__build_trip(route, truck_id, departure)
+            gap_start = scheduled.finish
+
+        # No gap is large enough, go after the last trip
+        return self.__build_trip(route, truck_id, max(gap_start, route.ready))
+
+    def __build_trip(self, route, truck_id, departure: float):
+        current = departure
+        distance = 0
+        previous = self.__hub_vertex
+        packages = []
+        locations = []
+        late_packages = []
+
+        for stop in route.stops:
+            leg = self.__weight(previous, stop.vertex)
+            distance += leg
+            current += leg / self.speed
+            previous = stop.vertex
+            locations.append(self.destinations.vertices[stop.vertex])
+            for p in stop.packages:
+                packages.append(p)
+                if current > p.deadline_seconds:
+                    late_packages.append(p.id)
+
+        # Return to the hub
+        leg = self.__weight(previous, self.__hub_vertex)
+        distance += leg
+        current += leg / self.speed
+
+        return FleetPlanner.Trip(truck_id, packages, locations, departure, current,
+                                 distance, late_packages)
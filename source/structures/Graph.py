@@ -22,6 +22,8 @@ class Graph:
         self.matrix = [[0 for i in range(size)] for j in range(size)]
         self.vertices = [None for i in range(size)]
         self.vertex_count = 0
+        self.version = 0  # Number of weight updates, see update_weight
+        self.changes = []  # (version, u, v, weight) of every update, in order
 
     def add_vertex(self, vertex: str):
         """Adds a named vertex for indexing into the matrix"""
@@ -43,6 +45,12 @@ class Graph:
                     return i
             return -1
 
+    def index_of(self, vertex):
+        """Gets the index of a vertex, given its name or index. Returns -1 if not found."""
+        # Callers that look up the same vertex many times should cache the index,
+        # since looking up by name is O(N)
+        return self.__lookup_vertex_index(vertex)
+
     def __lookup_vertex_name(self, vertex: int):
         """Gets the vertex name, given the index."""
         if vertex < 0:
@@ -75,6 +83,40 @@ class Graph:
                 v, u, weight, True
             )  # pass True for directed to avoid more than one recursive call
 
+    def update_weight(self, u, v, weight: float, directed: bool = False):
+        """Changes the weight of an edge in a live graph, for road closures or traffic.
+
+        Every update is recorded, so copies of the graph can catch up with changes_since.
+        returns: the previous weight of the edge from u to v"""
+        # This operation is O(1) with vertex indexes
+        if weight <= 0:
+            raise ValueError("An edge weight must be positive, 0 means not connected")
+
+        (u, v) = (self.__lookup_edge_vertex(u), self.__lookup_edge_vertex(v))
+        previous = float(self.matrix[u][v])
+        self.matrix[u][v] = float(weight)
+        self.version += 1
+        self.changes.append((self.version, u, v, float(weight)))
+
+        Logger.log(Logger.LogLevel.DEBUG, f"Updating edge: {u}->{v} = {weight}")
+
+        if not directed:
+            self.update_weight(v, u, weight, True)
+        return previous
+
+    def __lookup_edge_vertex(self, vertex):
+        """Gets the vertex index, raises KeyError if it's not in the graph."""
+        # Index -1 would silently change the row of the last vertex
+        i = self.__lookup_vertex_index(vertex)
+        if i < 0:
+            raise KeyError(f"{vertex} is not a vertex of the graph")
+        return i
+
+    def changes_since(self, version: int):
+        """The updates made after the specified version, as a list of (version, u, v, weight)."""
+        # Versions are numbered from 1 in the order of the updates, so this is a slice
+        return self.changes[version:]
+
     def is_connected(self, u, v):
         """Checks if the specified vertices are connected in the specified order (u -> v)."""
         return self.get_weight(u, v) > 0
@@ -90,6 +132,43 @@ class Graph:
         # Get the actual weight from the adjacency matrix, this is an O(1) operation
         return float(self.matrix[u][v])
 
+    def get_weights(self, u, vertices):
+        """Gets the weights of the edges from u to each of the vertices, in the same order.
+
+        returns: a list of weights, 0 for the vertices that are not connected."""
+        # Time complexity is O(K) with vertex indexes, the row of u is only looked up once
+        row = self.matrix[self.__lookup_edge_vertex(u)]
+        return [float(row[self.__lookup_edge_vertex(v)]) for v in vertices]
+
+    def route_length(self, path, start=None):
+        """Gets the total weight of a path through the vertices in order, from start if specified."""
+        # Time complexity is O(K) with vertex indexes
+        indexes = [self.__lookup_edge_vertex(v) for v in path]
+        if start is not None:
+            indexes.insert(0, self.__lookup_edge_vertex(start))
+
+        total_weight = 0
+        for i in range(1, len(indexes)):
+            total_weight += self.__weight(indexes[i - 1], indexes[i])
+        return total_weight
+
+    def submatrix(self, vertices):
+        """Copies the weights between just the specified vertices into a new, smaller graph.
+
+        The route algorithms can run on the local graph instead, without looking up rows
+        of the full matrix. Local vertices keep the order of their index in this graph,
+        so ties in the route algorithms are broken the same way.
+        returns: (local graph, list of the index in this graph of every local vertex)"""
+        # Time complexity is O(K^2), plus looking up the K vertices
+        indexes = sorted({self.__lookup_edge_vertex(vertex) for vertex in vertices})
+
+        local = Graph(0)
+        local.size = len(indexes)
+        local.matrix = [[float(row[j]) for j in indexes] for row in (self.matrix[i] for i in indexes)]
+        local.vertices = [self.vertices[i] for i in indexes]
+        local.vertex_count = len(indexes)
+        return (local, indexes)
+
     def find_shortest_path(self, start, vertices):
         """Returns the shortest path that pass through all the supplied vertices, \
         and the weight of that path.
@@ -112,6 +191,201 @@ class Graph:
         # The return value is a tuple of the full path in traversal order, and its total weight
         return (visited, total_weight)
 
+    def find_deadline_path(self, start, vertices, deadlines, departure: float, speed: float):
+        """Returns a path through all the supplied vertices that meets their deadlines, \
+        its weight, and the vertices that can't be reached in time.
+        Uses cheapest feasible insertion, with O(1) slack-based feasibility checks.
+        The nearest neighbor path through the urgent vertices first is used instead when it
+        has fewer late vertices, or as few and a lower weight.
+
+        deadlines - latest arrival at each vertex, in the same order as vertices
+        departure - time leaving the start vertex, in the same units as deadlines
+        speed - weight traveled per unit of time"""
+        # Time complexity is O(N^3), space complexity is O(N)
+        u = self.__lookup_vertex_index(start)
+        to_visit = {}
+        for (vertex, deadline) in zip(vertices, deadlines):
+            v = self.__lookup_vertex_index(vertex)
+            to_visit[v] = min(deadline, to_visit.get(v, deadline))
+
+        path = []
+        late = []
+
+        # Most urgent vertices are tried first, so ties go to the earliest deadline
+        candidates = sorted(to_visit, key=lambda v: (to_visit[v], v))
+
+        while len(candidates) > 0:
+            # arrival[i] is the arrival time at path[i]
+            # slack[i] is how much arrival at path[i] can be delayed without missing
+            # the deadline of path[i] or any vertex after it
+            (arrival, slack) = self.__path_timing(u, path, to_visit, departure, speed)
+
+            best = None
+            for v in candidates:
+                for i in range(len(path) + 1):
+                    # Insert v between previous and path[i]
+                    previous = u if i == 0 else path[i - 1]
+                    leave = departure if i == 0 else arrival[i - 1]
+                    to_v = self.__weight(previous, v)
+
+                    if leave + to_v / speed > to_visit[v]:
+                        continue  # v itself would be late
+
+                    if i < len(path):
+                        added = to_v + self.__weight(v, path[i]) - self.__weight(previous, path[i])
+                        if added / speed > slack[i]:
+                            continue  # Something after v would be late
+                    else:
+                        added = to_v
+
+                    if best is None or added < best[0]:
+                        best = (added, v, i)
+
+            if best is None:
+                # Nothing left can be delivered on time
+                late = candidates
+                break
+
+            (_, v, i) = best
+            path.insert(i, v)
+            candidates.remove(v)
+
+        # Anything that can't make its deadline goes to its cheapest position
+        # that doesn't make anything else late, the end of the path always qualifies
+        for v in late:
+            (_, slack) = self.__path_timing(u, path, to_visit, departure, speed)
+            best = None
+            for i in range(len(path) + 1):
+                previous = u if i == 0 else path[i - 1]
+                added = self.__weight(previous, v)
+                if i < len(path):
+                    added += self.__weight(v, path[i]) - self.__weight(previous, path[i])
+                    if added / speed > slack[i]:
+                        continue
+                if best is None or added < best[0]:
+                    best = (added, i)
+            path.insert(best[1], v)
+
+        # Insertion is greedy, the plain route can meet as many deadlines, in less time, and
+        # then returns early enough for the next trip: nearest neighbor through the urgent
+        # vertices, then the ones due last
+        last_deadline = max(to_visit.values(), default=0)
+        plain = []
+        self.__find_shortest_path(u, [v for v in to_visit if to_visit[v] < last_deadline], plain)
+        self.__find_shortest_path(plain[-1] if len(plain) > 0 else u,
+                                  [v for v in to_visit if to_visit[v] == last_deadline], plain)
+        (arrival, _) = self.__path_timing(u, plain, to_visit, departure, speed)
+        plain_late = [v for (i, v) in enumerate(plain) if arrival[i] > to_visit[v]]
+
+        total_weight = self.__path_weight(u, path)
+        plain_weight = self.__path_weight(u, plain)
+        if (len(plain_late), plain_weight) < (len(late), total_weight):
+            return (plain, plain_weight, plain_late)
+
+        return (path, total_weight, late)
+
+    def insert_cheapest(self, start, path: list, vertex):
+        """Inserts the vertex in the path where it adds the least weight, \
+        returns the weight added. The path is a list of vertex indexes after start."""
+        # Time complexity is O(N)
+        u = self.__lookup_vertex_index(start)
+        v = self.__lookup_vertex_index(vertex)
+        best = None
+
+        for i in range(len(path) + 1):
+            previous = u if i == 0 else path[i - 1]
+            added = self.__weight(previous, v)
+            if i < len(path):
+                added += self.__weight(v, path[i]) - self.__weight(previous, path[i])
+            if best is None or added < best[0]:
+                best = (added, i)
+
+        path.insert(best[1], v)
+        return best[0]
+
+    def remove_from_path(self, start, path: list, vertex):
+        """Removes the vertex from the path, returns the weight added (zero or negative). \
+        The path is a list of vertex indexes after start."""
+        # Time complexity is O(N)
+        u = self.__lookup_vertex_index(start)
+        v = self.__lookup_vertex_index(vertex)
+
+        if v not in path:
+            return 0
+
+        i = path.index(v)
+        previous = u if i == 0 else path[i - 1]
+        added = -self.__weight(previous, v)
+        if i + 1 < len(path):
+            added += self.__weight(previous, path[i + 1]) - self.__weight(v, path[i + 1])
+
+        path.pop(i)
+        return added
+
+    def improve_path(self, start, path: list, max_passes: int = 2, end=None):
+        """Improves the path in place with 2-opt moves, returns the weight added (zero or negative).
+        The path is a list of vertex indexes after start, the end of the path is open,
+        unless end is specified, then the path returns to end, which stays fixed like start."""
+        # Each pass is O(N^2), the number of passes is bounded to keep repairs local
+        u = self.__lookup_vertex_index(start)
+        end = self.__lookup_vertex_index(end) if end is not None else None
+        total = 0
+
+        for _ in range(max_passes):
+            improved = False
+            for i in range(len(path) - 1):
+                a = u if i == 0 else path[i - 1]
+                b = path[i]
+                for j in range(i + 1, len(path)):
+                    # Reverse path[i..j], replacing edges a-b and c-d with a-c and b-d
+                    c = path[j]
+                    d = path[j + 1] if j + 1 < len(path) else end
+                    added = self.__weight(a, c) - self.__weight(a, b)
+                    if d is not None:
+                        added += self.__weight(b, d) - self.__weight(c, d)
+                    if added < -1e-9:
+                        path[i:j + 1] = path[i:j + 1][::-1]
+                        total += added
+                        improved = True
+                        b = path[i]
+            if not improved:
+                break
+
+        return total
+
+    def __path_timing(self, start: int, path: list, deadlines: dict, departure: float,
+                      speed: float):
+        """Returns the arrival times and forward slack for each vertex of the path."""
+        # Time complexity is O(N)
+        arrival = []
+        current = departure
+        previous = start
+        for v in path:
+            current += self.__weight(previous, v) / speed
+            arrival.append(current)
+            previous = v
+
+        slack = [0] * len(path)
+        remaining = float('Inf')
+        for i in range(len(path) - 1, -1, -1):
+            remaining = min(remaining, deadlines[path[i]] - arrival[i])
+            slack[i] = remaining
+
+        return (arrival, slack)
+
+    def __path_weight(self, start: int, path: list):
+        # Time complexity is O(N)
+        total_weight = 0
+        previous = start
+        for v in path:
+            total_weight += self.__weight(previous, v)
+            previous = v
+        return total_weight
+
+    def __weight(self, u: int, v: int):
+        """Gets the weight between two vertex indexes, the same vertex has no weight."""
+        return float(self.matrix[u][v]) if u != v else 0
+
     def __find_shortest_path(self, start, to_visit: list, visited: list):
         # Time complexity is O(N^2)
         # It's difficult to measure, due to recursion,
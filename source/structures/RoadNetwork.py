@@ -0,0 +1,555 @@
+import sys
+import math
+import heapq
+from array import array
+sys.path.append("..")
+
+from entities.Location import Location
+from structures.Graph import Graph
+from utilities.Logger import Logger
+
+
+class RoadNetwork:
+    """Sparse directed graph of a road network, with Dijkstra, A* and contraction hierarchy queries.
+
+    Nodes are intersections or delivery locations, edges are road segments.
+    Once built, edges are stored as compressed adjacency arrays (CSR): the edges leaving node u
+    are targets[offsets[u]:offsets[u + 1]], with the same slice of weights.
+    The storage size is O(N + E), instead of the O(N^2) of a Graph."""
+
+    INFINITY = float('Inf')
+
+    def __init__(self):
+        super().__init__()
+        self.node_count = 0
+        self.names = []  # Node index -> name
+        self.x = array('d')  # Node coordinates, NaN if unknown, only used by the A* heuristic
+        self.y = array('d')
+        self.offsets = None  # Outgoing edges in CSR form, None until build
+        self.targets = None
+        self.weights = None
+        self.in_offsets = None  # Incoming edges in CSR form, for searches towards a node
+        self.sources = None
+        self.in_weights = None
+        self.heuristic_scale = 0  # Lower bound of weight per unit of straight line distance
+        self.rank = None  # Contraction order of every node, None until contract
+        self.shortcuts = 0
+        self.__index = {}  # Name -> node index
+        self.__locations = {}  # Location -> node index, for nodes that are delivery locations
+        self.__edges = []  # (u, v, weight) added since the last build
+        self.__up = None  # Contraction hierarchy, edges to higher ranked nodes in CSR form
+        self.__down = None  # Reversed edges from higher ranked nodes, in CSR form
+
+    @property
+    def edge_count(self):
+        return len(self.targets) if self.targets is not None else len(self.__edges)
+
+    def add_node(self, name, x: float = None, y: float = None, location: Location = None):
+        """Adds a node, returns its index.
+
+        x, y - optional coordinates, in units proportional to the edge weights
+        location - optional delivery location at this node"""
+        index = self.node_count
+        self.names.append(name)
+        self.__index[name] = index
+        self.x.append(x if x is not None else math.nan)
+        self.y.append(y if y is not None else math.nan)
+        if location is not None:
+            self.__locations[location] = index
+        self.node_count += 1
+        return index
+
+    def add_edge(self, u, v, weight: float, directed: bool = False):
+        """Adds an edge from u to v, and from v to u unless directed. Call build once all are added."""
+        u = self.index_of(u)
+        v = self.index_of(v)
+        self.__edges.append((u, v, float(weight)))
+        if not directed:
+            self.__edges.append((v, u, float(weight)))
+
+    def index_of(self, node):
+        """Gets the index of a node, given its index, name or Location. Returns -1 if not found."""
+        # Time complexity is O(1)
+        if isinstance(node, int):
+            return node
+        if isinstance(node, Location):
+            return self.__locations.get(node, -1)
+        return self.__index.get(node, -1)
+
+    def build(self):
+        """Packs the edges added so far into the adjacency arrays.
+
+        Any contraction hierarchy is discarded, since it no longer matches the edges."""
+        # Time complexity is O(N + E), a counting sort of the edges by source node
+        if self.targets is not None:
+            # Keep the edges of the previous build
+            for u in range(self.node_count):
+                for i in range(self.offsets[u], self.offsets[u + 1]):
+                    self.__edges.append((u, self.targets[i], self.weights[i]))
+
+        counts = [0] * (self.node_count + 1)
+        for (u, _, _) in self.__edges:
+            counts[u + 1] += 1
+        for u in range(self.node_count):
+            counts[u + 1] += counts[u]
+
+        self.offsets = array('l', counts)
+        self.targets = array('l', bytes(array('l').itemsize * len(self.__edges)))
+        self.weights = array('d', bytes(array('d').itemsize * len(self.__edges)))
+        position = counts[:-1]
+        for (u, v, weight) in self.__edges:
+            self.targets[position[u]] = v
+            self.weights[position[u]] = weight
+            position[u] += 1
+
+        # The same edges, sorted by target node
+        counts = [0] * (self.node_count + 1)
+        for (_, v, _) in self.__edges:
+            counts[v + 1] += 1
+        for v in range(self.node_count):
+            counts[v + 1] += counts[v]
+
+        self.in_offsets = array('l', counts)
+        self.sources = array('l', bytes(array('l').itemsize * len(self.__edges)))
+        self.in_weights = array('d', bytes(array('d').itemsize * len(self.__edges)))
+        position = counts[:-1]
+        for (u, v, weight) in self.__edges:
+            self.sources[position[v]] = u
+            self.in_weights[position[v]] = weight
+            position[v] += 1
+
+        self.heuristic_scale = self.__lowest_weight_per_distance()
+        self.__edges = []
+        self.rank = None
+        self.__up = None
+        self.__down = None
+        self.shortcuts = 0
+        Logger.log(Logger.LogLevel.INFORMATION,
+                   f"Built road network of {self.node_count} nodes and {len(self.targets)} edges")
+
+    def update_weight(self, u, v, weight: float, directed: bool = False):
+        """Changes the weight of an existing road, for closures or traffic.
+
+        Unless directed, the road back from v to u is changed too, if there is one:
+        a one-way road stays one-way. Nothing is changed if there is no road from u to v.
+        The contraction hierarchy no longer matches the weights, so it's dropped, and queries
+        fall back to A* and Dijkstra until contract is called again.
+        returns: a list of (u, v, previous weight) for every direction changed"""
+        # Time complexity is O(D), for the degree D of the nodes
+        # The searches, and repairing distance matrices, rely on every weight being positive
+        if weight <= 0:
+            raise ValueError("A road weight must be positive")
+        for node in (u, v):
+            if self.index_of(node) < 0:
+                raise KeyError(f"{node} is not in the road network")
+        u = self.index_of(u)
+        v = self.index_of(v)
+        directions = [(u, v)]
+        if not directed and u != v:
+            directions.append((v, u))
+
+        # Every direction is checked before any weight is written,
+        # so a failed update leaves no weight changed without a repair
+        changed = []
+        for (a, b) in directions:
+            previous = min((self.weights[i] for i in range(self.offsets[a], self.offsets[a + 1])
+                            if self.targets[i] == b), default=None)
+            if previous is not None:
+                changed.append((a, b, previous))
+            elif a == u:
+                raise KeyError(f"There is no road from {self.names[u]} to {self.names[v]}")
+
+        for (a, b, _) in changed:
+            for i in range(self.offsets[a], self.offsets[a + 1]):
+                if self.targets[i] == b:
+                    self.weights[i] = float(weight)
+            for i in range(self.in_offsets[b], self.in_offsets[b + 1]):
+                if self.sources[i] == a:
+                    self.in_weights[i] = float(weight)
+
+        # The A* heuristic has to stay a lower bound of the new weight
+        distance = math.hypot(self.x[u] - self.x[v], self.y[u] - self.y[v])
+        if self.heuristic_scale > 0 and distance > 0:
+            self.heuristic_scale = min(self.heuristic_scale, weight / distance)
+
+        if self.rank is not None:
+            Logger.log(Logger.LogLevel.VERBOSE, "Road weights changed, dropping the hierarchy")
+            self.rank = None
+            self.__up = None
+            self.__down = None
+
+        return changed
+
+    def repair_distance_matrix(self, graph: Graph, u: int, v: int, previous_weight: float):
+        """Finds the distances of a matrix from distance_matrix that changed with the road u to v.
+
+        Only the pairs of stops whose shortest path can use the road are looked at:
+        when it got cheaper, the path through it is compared to the current distance,
+        when it got more expensive, only the rows that went through it are searched again.
+        returns: a list of (i, j, distance) for the graph vertexes whose distance changed"""
+        # Time complexity is O(E log N) for the two searches, plus O(S^2), plus a search per row
+        weight = min((self.weights[i] for i in range(self.offsets[u], self.offsets[u + 1])
+                      if self.targets[i] == v), default=self.INFINITY)
+        stops = [self.index_of(graph.vertices[i]) for i in range(graph.vertex_count)]
+
+        # Shortest paths to u, and from v, never use the road from u to v itself
+        to_road = self.__search(u, self.in_offsets, self.sources, self.in_weights, set(stops))
+        from_road = self.__search(v, self.offsets, self.targets, self.weights, set(stops))
+
+        changes = []
+        stale_rows = []
+        for i in range(len(stops)):
+            before = to_road.get(stops[i], self.INFINITY)
+            if before == self.INFINITY:
+                continue
+            row_stale = False
+            for j in range(len(stops)):
+                after = from_road.get(stops[j], self.INFINITY)
+                if i == j or after == self.INFINITY:
+                    continue
+
+                current = graph.get_weight(i, j)
+                current = current if current > 0 else self.INFINITY
+                if weight < previous_weight:
+                    through = before + weight + after
+                    if through < current - 1e-9:
+                        changes.append((i, j, through))
+                elif abs(before + previous_weight + after - current) <= 1e-9 * max(current, 1):
+                    row_stale = True
+            if row_stale:
+                stale_rows.append(i)
+
+        for i in stale_rows:
+            row = self.distances_from(stops[i], stops)
+            for j in range(len(stops)):
+                current = graph.get_weight(i, j)
+                if i == j or abs(row[j] - current) <= 1e-9:
+                    continue
+                if row[j] < self.INFINITY:
+                    changes.append((i, j, row[j]))
+                else:
+                    Logger.log(Logger.LogLevel.WARNING,
+                               f"{graph.vertices[j]} can't be reached from {graph.vertices[i]} "
+                               f"anymore, keeping the previous distance")
+        return changes
+
+    def __lowest_weight_per_distance(self):
+        """The A* heuristic scale, 0 if any node lacks coordinates.
+
+        Straight line distance times the lowest weight per unit of distance of any edge
+        never overestimates the remaining weight, so A* still finds the shortest path."""
+        if any(math.isnan(c) for c in self.x) or any(math.isnan(c) for c in self.y):
+            return 0
+
+        scale = self.INFINITY
+        for u in range(self.node_count):
+            for i in range(self.offsets[u], self.offsets[u + 1]):
+                v = self.targets[i]
+                distance = math.hypot(self.x[u] - self.x[v], self.y[u] - self.y[v])
+                if distance > 0:
+                    scale = min(scale, self.weights[i] / distance)
+        return scale if scale < self.INFINITY else 0
+
+    def shortest_path(self, source, target):
+        """Returns the shortest path from source to target as a list of node indexes, and its weight.
+
+        Uses A* when every node has coordinates, Dijkstra otherwise.
+        returns: ([], inf) if the target can't be reached"""
+        # Time complexity is O(E log N) in the worst case, A* only explores towards the target
+        source = self.index_of(source)
+        target = self.index_of(target)
+        scale = self.heuristic_scale
+        (tx, ty) = (self.x[target], self.y[target])
+        offsets = self.offsets
+        targets = self.targets
+        weights = self.weights
+
+        distance = {source: 0.0}
+        previous = {source: -1}
+        settled = set()
+        heap = [(0.0, source)]
+        while len(heap) > 0:
+            (_, u) = heapq.heappop(heap)
+            if u == target:
+                break
+            if u in settled:
+                continue
+            settled.add(u)
+
+            d = distance[u]
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                candidate = d + weights[i]
+                if candidate < distance.get(v, self.INFINITY):
+                    distance[v] = candidate
+                    previous[v] = u
+                    estimate = scale * math.hypot(self.x[v] - tx, self.y[v] - ty) if scale > 0 else 0
+                    heapq.heappush(heap, (candidate + estimate, v))
+
+        if target not in distance:
+            return ([], self.INFINITY)
+
+        path = []
+        u = target
+        while u != -1:
+            path.append(u)
+            u = previous[u]
+        return (path[::-1], distance[target])
+
+    def distances_from(self, source, targets: list):
+        """Returns the distances from source to each target, in the same order, inf if unreachable.
+
+        A single Dijkstra search, which stops as soon as every target is settled."""
+        # Time complexity is O(E log N) in the worst case
+        targets = [self.index_of(t) for t in targets]
+        distance = self.__search(self.index_of(source), self.offsets, self.targets, self.weights,
+                                 set(targets))
+        return [distance.get(t, self.INFINITY) for t in targets]
+
+    def distance(self, source, target):
+        """Returns the weight of the shortest path from source to target, inf if unreachable.
+
+        Uses the contraction hierarchy if there is one, A* otherwise."""
+        if self.rank is None:
+            return self.shortest_path(source, target)[1]
+
+        # Both searches only go up the hierarchy, and meet at the highest node of the path
+        # Time complexity is O(S log S), where S is the small number of nodes above source and target
+        forward = self.__search_upwards(self.index_of(source), self.__up, self.__down)
+        backward = self.__search_upwards(self.index_of(target), self.__down, self.__up)
+        if len(forward) > len(backward):
+            (forward, backward) = (backward, forward)
+        return min((d + backward[u] for (u, d) in forward.items() if u in backward),
+                   default=self.INFINITY)
+
+    def distance_matrix(self, stops: list):
+        """Builds a Graph of the shortest distances between just the specified stops.
+
+        The stops become the vertices of the graph, in the same order, so they can be used
+        anywhere a distance table loaded from a file is. Unreachable pairs are left unconnected."""
+        indexes = [self.index_of(s) for s in stops]
+        for (stop, index) in zip(stops, indexes):
+            if index < 0:
+                raise KeyError(f"{stop} is not in the road network")
+
+        if self.rank is None:
+            # One Dijkstra search per stop, each stopping once it reached every other stop
+            # Time complexity is O(S * E log N)
+            rows = [self.distances_from(s, indexes) for s in indexes]
+        else:
+            rows = self.__many_to_many(indexes)
+
+        graph = Graph(len(stops))
+        for stop in stops:
+            graph.add_vertex(stop)
+        for i in range(len(stops)):
+            for j in range(len(stops)):
+                if i != j and rows[i][j] < self.INFINITY:
+                    graph.add_edge(i, j, rows[i][j], directed=True)
+        return graph
+
+    def __many_to_many(self, indexes: list):
+        """Distances between all the nodes with the contraction hierarchy, as a list of rows.
+
+        The upward search from every target leaves its distance in a bucket at each node it
+        reaches, then the upward search from every source only has to scan those buckets."""
+        # Time complexity is O(S * (U log U + B)), for U nodes reached upwards and B bucket entries
+        buckets = {}
+        for (j, target) in enumerate(indexes):
+            for (u, d) in self.__search_upwards(target, self.__down, self.__up).items():
+                buckets.setdefault(u, []).append((j, d))
+
+        rows = []
+        for source in indexes:
+            row = [self.INFINITY] * len(indexes)
+            for (u, d) in self.__search_upwards(source, self.__up, self.__down).items():
+                for (j, remaining) in buckets.get(u, ()):
+                    if d + remaining < row[j]:
+                        row[j] = d + remaining
+            rows.append(row)
+        return rows
+
+    def __search(self, source: int, offsets, targets, weights, stop_after: set = None):
+        """Dijkstra over adjacency arrays, returns node -> distance of every settled node.
+
+        If stop_after is specified, the search ends once all of those nodes are settled."""
+        remaining = set(stop_after) if stop_after is not None else None
+        distance = {source: 0.0}
+        settled = {}
+        heap = [(0.0, source)]
+        while len(heap) > 0:
+            (d, u) = heapq.heappop(heap)
+            if u in settled:
+                continue
+            settled[u] = d
+            if remaining is not None:
+                remaining.discard(u)
+                if len(remaining) == 0:
+                    break
+
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                candidate = d + weights[i]
+                if candidate < distance.get(v, self.INFINITY):
+                    distance[v] = candidate
+                    heapq.heappush(heap, (candidate, v))
+        return settled
+
+    def __search_upwards(self, source: int, edges: tuple, reverse_edges: tuple):
+        """Dijkstra up the contraction hierarchy, returns node -> distance of every settled node.
+
+        A node reached more cheaply from a more important node is stalled: its distance is not
+        the shortest, so its edges aren't followed. This keeps the search space small."""
+        (offsets, targets, weights) = edges
+        (reverse_offsets, reverse_targets, reverse_weights) = reverse_edges
+        distance = {source: 0.0}
+        settled = {}
+        heap = [(0.0, source)]
+        while len(heap) > 0:
+            (d, u) = heapq.heappop(heap)
+            if u in settled:
+                continue
+            settled[u] = d
+
+            stalled = False
+            for i in range(reverse_offsets[u], reverse_offsets[u + 1]):
+                if distance.get(reverse_targets[i], self.INFINITY) + reverse_weights[i] < d:
+                    stalled = True
+                    break
+            if stalled:
+                continue
+
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                candidate = d + weights[i]
+                if candidate < distance.get(v, self.INFINITY):
+                    distance[v] = candidate
+                    heapq.heappush(heap, (candidate, v))
+        return settled
+
+    def contract(self, witness_settle_limit: int = 50):
+        """Preprocesses the network into a contraction hierarchy, for fast distance queries.
+
+        Nodes are removed from least to most important. Whenever a removed node was on the only
+        shortest path between two of its neighbors, a shortcut edge replaces it. Queries then
+        only search upwards, to more important nodes, from both ends.
+
+        witness_settle_limit - nodes settled looking for a path around a node, before giving up
+                               and adding a shortcut. Lower is faster, but adds more shortcuts."""
+        # Time complexity is roughly O(N log N) on road networks, much worse on dense graphs
+        # Working copy of the edges, the cheapest edge between any two nodes
+        outgoing = [{} for _ in range(self.node_count)]
+        incoming = [{} for _ in range(self.node_count)]
+        for u in range(self.node_count):
+            for i in range(self.offsets[u], self.offsets[u + 1]):
+                v = self.targets[i]
+                if u != v and self.weights[i] < outgoing[u].get(v, self.INFINITY):
+                    outgoing[u][v] = self.weights[i]
+                    incoming[v][u] = self.weights[i]
+
+        contracted_neighbors = [0] * self.node_count
+        depth = [0] * self.node_count  # Levels of the hierarchy below a node
+        up = [[] for _ in range(self.node_count)]
+        down = [[] for _ in range(self.node_count)]
+        self.rank = array('l', [-1] * self.node_count)
+        self.shortcuts = 0
+
+        def priority(v: int, shortcuts: list):
+            # Edge difference, plus penalties so contraction spreads evenly over the network
+            edge_difference = len(shortcuts) - len(outgoing[v]) - len(incoming[v])
+            return 2 * edge_difference + contracted_neighbors[v] + depth[v]
+
+        heap = [
+            (priority(v, self.__shortcuts_for(v, outgoing, incoming, witness_settle_limit)), v)
+            for v in range(self.node_count)
+        ]
+        heapq.heapify(heap)
+        order = 0
+        while len(heap) > 0:
+            (_, v) = heapq.heappop(heap)
+
+            # Priorities change as neighbors are contracted, they are updated lazily
+            shortcuts = self.__shortcuts_for(v, outgoing, incoming, witness_settle_limit)
+            current = priority(v, shortcuts)
+            if len(heap) > 0 and current > heap[0][0]:
+                heapq.heappush(heap, (current, v))
+                continue
+
+            for (u, w, weight) in shortcuts:
+                outgoing[u][w] = weight
+                incoming[w][u] = weight
+                self.shortcuts += 1
+
+            # The remaining edges of the node all lead to more important nodes
+            for (w, weight) in outgoing[v].items():
+                up[v].append((w, weight))
+                del incoming[w][v]
+                contracted_neighbors[w] += 1
+                depth[w] = max(depth[w], depth[v] + 1)
+            for (u, weight) in incoming[v].items():
+                down[v].append((u, weight))
+                del outgoing[u][v]
+                contracted_neighbors[u] += 1
+                depth[u] = max(depth[u], depth[v] + 1)
+            outgoing[v] = {}
+            incoming[v] = {}
+
+            self.rank[v] = order
+            order += 1
+
+        self.__up = self.__pack(up)
+        self.__down = self.__pack(down)
+        Logger.log(Logger.LogLevel.INFORMATION,
+                   f"Contracted road network with {self.shortcuts} shortcuts")
+
+    def __shortcuts_for(self, v: int, outgoing: list, incoming: list, settle_limit: int):
+        """Returns the shortcuts (u, w, weight) needed to remove node v."""
+        shortcuts = []
+        for (u, to_v) in incoming[v].items():
+            if len(outgoing[v]) == 0:
+                break
+
+            # A single search from u finds paths around v to all of its outgoing neighbors
+            limit = to_v + max(outgoing[v].values())
+            witness = self.__witness_search(u, v, outgoing, limit, settle_limit)
+            for (w, from_v) in outgoing[v].items():
+                if w != u and witness.get(w, self.INFINITY) > to_v + from_v:
+                    shortcuts.append((u, w, to_v + from_v))
+        return shortcuts
+
+    def __witness_search(self, source: int, ignore: int, outgoing: list, limit: float,
+                         settle_limit: int):
+        """Dijkstra on the remaining edges, not going through the ignored node."""
+        distance = {source: 0.0}
+        heap = [(0.0, source)]
+        settled = 0
+        while len(heap) > 0 and settled < settle_limit:
+            (d, u) = heapq.heappop(heap)
+            if d > distance[u]:
+                continue
+            if d > limit:
+                break
+            settled += 1
+            for (v, weight) in outgoing[u].items():
+                if v == ignore:
+                    continue
+                candidate = d + weight
+                if candidate < distance.get(v, self.INFINITY):
+                    distance[v] = candidate
+                    heapq.heappush(heap, (candidate, v))
+        return distance
+
+    def __pack(self, adjacency: list):
+        """Converts adjacency lists of (node, weight) into (offsets, targets, weights) arrays."""
+        offsets = array('l', [0])
+        targets = array('l')
+        weights = array('d')
+        for edges in adjacency:
+            for (v, weight) in edges:
+                targets.append(v)
+                weights.append(weight)
+            offsets.append(len(targets))
+        return (offsets, targets, weights)
+
+    def __repr__(self):
+        return f"RoadNetwork({self.node_count} nodes, {self.edge_count} edges)"
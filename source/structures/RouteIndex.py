@@ -0,0 +1,42 @@
+import sys
+sys.path.append("..")
+
+
+class RouteIndex:
+    """Reverse index from graph edges to the trucks whose remaining route drives over them.
+
+    A truck is only indexed again when its route_version changed since it was last indexed,
+    so refreshing costs O(T) plus the legs of the routes that actually changed."""
+
+    def __init__(self):
+        super().__init__()
+        self.__trucks = {}  # (u, v) -> set of truck IDs
+        self.__indexed = {}  # Truck ID -> (truck, route version, legs)
+
+    def refresh(self, trucks):
+        """Indexes the trucks whose route changed since the last refresh."""
+        for truck in trucks:
+            indexed = self.__indexed.get(truck.id)
+            if indexed is not None and indexed[1] == truck.route_version:
+                continue
+
+            if indexed is not None:
+                for leg in indexed[2]:
+                    users = self.__trucks[leg]
+                    users.discard(truck.id)
+                    if len(users) == 0:
+                        del self.__trucks[leg]
+
+            legs = truck.route_legs()
+            for leg in legs:
+                self.__trucks.setdefault(leg, set()).add(truck.id)
+            self.__indexed[truck.id] = (truck, truck.route_version, legs)
+
+    def trucks_using(self, u: int, v: int):
+        """The trucks whose route drives from vertex u to v, as of the last refresh, by truck ID."""
+        # Time complexity is O(K log K), for K trucks using the edge
+        return [self.__indexed[i][0] for i in sorted(self.__trucks.get((u, v), ()))]
+
+    def __len__(self):
+        """Number of distinct edges used by any route."""
+        return len(self.__trucks)
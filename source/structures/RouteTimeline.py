@@ -0,0 +1,70 @@
+import sys
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+from structures.Graph import Graph
+sys.path.append("..")
+
+
+class RouteTimeline:
+    """The arrival time at every stop of a route, from prefix sums of the leg distances.
+
+    Since trucks move at a constant speed, the whole route is known once it's fixed,
+    so queries don't need to simulate the truck. Times are exact, deliveries are made
+    at the end of the simulation tick the truck arrives in."""
+
+    def __init__(self, destinations: Graph, stops: list, departure: datetime, speed_per_sec: float):
+        """Creates the timeline of a route.
+
+        stops - locations in order, the first is where the truck left from
+        departure - the time the truck left the first stop
+        speed_per_sec - the distance covered every second"""
+        super().__init__()
+        self.stops = stops
+        self.speed_per_sec = speed_per_sec
+        self.distances = [0.0]  # Distance from the first stop to each stop
+        self.times = [departure]  # Arrival time at each stop
+        self.__index = {}  # Location -> index of the first arrival there
+
+        # Time complexity is O(N), every lookup of a weight by location is O(N)
+        previous = destinations.index_of(stops[0])
+        for i in range(1, len(stops)):
+            current = destinations.index_of(stops[i])
+            self.distances.append(self.distances[-1] + destinations.get_weight(previous, current))
+            self.times.append(departure + timedelta(seconds=self.distances[-1] / speed_per_sec))
+            self.__index.setdefault(stops[i], i)
+            previous = current
+
+    @property
+    def end_time(self):
+        """The arrival time at the last stop."""
+        return self.times[-1]
+
+    def eta(self, location):
+        """The arrival time at the location, or None if it's not on the route. O(1)."""
+        i = self.__index.get(location)
+        return self.times[i] if i is not None else None
+
+    def next_event(self, when: datetime):
+        """The first arrival after the specified time, or None if the route is done. O(log N)."""
+        i = bisect_right(self.times, when)
+        return self.times[i] if i < len(self.times) else None
+
+    def position_at(self, when: datetime):
+        """Where the truck is at the specified time. O(log N).
+
+        returns: (previous stop, next stop, distance left to the next stop)"""
+        i = bisect_right(self.times, when)
+        if i == 0:
+            return (self.stops[0], self.stops[0], 0.0)
+        if i >= len(self.times):
+            return (self.stops[-1], self.stops[-1], 0.0)
+
+        traveled = (when - self.times[0]).total_seconds() * self.speed_per_sec
+        return (self.stops[i - 1], self.stops[i], max(self.distances[i] - traveled, 0.0))
+
+    def __len__(self):
+        return len(self.stops)
+
+    def __repr__(self):
+        return repr([(str(s), t.time()) for (s, t) in zip(self.stops, self.times)])
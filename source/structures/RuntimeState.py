@@ -1,7 +1,10 @@
 import sys
 import os
 import ctypes
-from datetime import datetime, timedelta, time, date
+import gzip
+import pickle
+import time as wall_clock
+from datetime import timedelta, time, date
 from ctypes import c_long, c_ulong
 from time import sleep
 
@@ -10,15 +13,27 @@ from exceptions.NoDriverError import NoDriverError
 from exceptions.TooManyPackagesError import TooManyPackagesError
 from exceptions.AlreadyInProgressException import AlreadyInProgressException
 from exceptions.TooEarlyError import TooEarlyError
+from exceptions.ConstraintError import ConstraintError
 from utilities.Logger import Logger
+from utilities.Clock import to_seconds, to_datetime
 from utilities.PackageLoader import PackageLoader
 from utilities.RouteLoader import RouteLoader
+from utilities.RoadNetworkLoader import RoadNetworkLoader
+from utilities.TerminalRenderer import TerminalRenderer
+from utilities.RenderThread import RenderThread
 from entities.Package import Package
 from entities.Truck import Truck
 from entities.Driver import Driver
 from entities.Location import Location
 from entities.PackageCorrection import PackageCorrection
 from structures.HashSet import HashSet
+from structures.DisjointSet import DisjointSet
+from structures.FleetPlanner import FleetPlanner
+from structures.Fleet import Fleet
+from structures.EventScheduler import EventScheduler
+from structures.BatchRouter import BatchRouter
+from structures.RouteIndex import RouteIndex
+from structures.ChangeTracker import ChangeTracker
 sys.path.append("..")
 
 # This is for manipulating the console window in Windows.
@@ -32,25 +47,63 @@ class RuntimeState:
     _ALIGNMENT_CENTER = 0
     _ALIGNMENT_LEFT = 1
     _ALIGNMENT_RIGHT = 2
+    _ENABLE_VIRTUAL_TERMINAL_PROCESSING = 0x0004
 
-    def __init__(self, simulation_speed_seconds=60):
+    def __init__(self, simulation_speed_seconds=60, frame_delay_seconds=0.1,
+                 realtime_ratio=None, day: date = None):
+        """Creates the program state.
+
+        Params:
+        simulation_speed_seconds - simulated seconds per tick
+        frame_delay_seconds - wall time to sleep after every tick
+        realtime_ratio - optional, simulated seconds per wall second, replaces the frame delay
+        day - optional, the simulated day, today if not specified"""
         # Initialize all data members
         self._rows = 25
         self._cols = 80
 
         self._destinations = None
         self._packages = None
+        self._package_groups = {}
+        self._fleet_plan = {}
+        self._planned = set()
         self._trucks = []
+        self._fleet = None
+        self._batch_router = None
         self._drivers = []
-        self._start_time = datetime.combine(date.today(), time(7, 50))
-        self._end_time = datetime.combine(date.today(), time(23, 59, 59))
-        self._current_time = self._start_time
-        self._simulation_speed = timedelta(seconds=simulation_speed_seconds)
+        # The clock is kept in seconds since midnight of the simulated day, times are only
+        # converted to datetime for the interface, listeners and exports
+        self._day = day if day is not None else date.today()
+        self._start_clock = to_seconds(time(7, 50))
+        self._clock = self._start_clock
+        self._end_clock = to_seconds(time(23, 59, 59))
+        self._current_time = to_datetime(self._clock, self._day)  # The clock, as a datetime
+        self._simulation_speed = simulation_speed_seconds
+        self._frame_delay = frame_delay_seconds
+        self._realtime_ratio = realtime_ratio
         self._total_delivered = 0
-        self._total_time = timedelta()
+        self._total_time = 0  # Seconds
         self._total_distance = 0
         self._ui_inited = False
-        self._exceptions = HashSet(5)
+        self._renderer = None
+        self._render_thread = None  # Only while simulate is running
+        self._fps = None  # Frame rate of the render thread, None to draw on every tick
+        self._frame = []
+        self._package_lines = {}  # Package ID -> line drawn for the package, until it changes
+        self._tick_listeners = []
+        self._changes = ChangeTracker()  # Changes to packages and trucks, published every tick
+        self._journal = None
+        self._exporter = None
+        self._scheduler = EventScheduler()  # Corrections, delayed arrivals and truck start times
+        self._hubs = [Truck.HUB_LOCATION]
+        self._road_network = None  # Set when the destinations come from a road network
+        # How the destinations were built, so checkpoints can build them again instead of saving them
+        self._destination_source = None
+        self._road_changes = []  # (u, v, weight, directed) of every road weight change
+        self._route_index = RouteIndex()  # Edge -> trucks driving over it, see update_edge_weight
+        self._checkpoint_interval = None
+        self._checkpoint_filename = None
+        self._next_checkpoint = None
 
     @property
     def destinations(self):
@@ -72,21 +125,45 @@ class RuntimeState:
         """The list of drivers assigned to the HUB location."""
         return self._drivers
 
+    @property
+    def realtime_ratio(self):
+        """Simulated seconds per wall second, or None if the simulation isn't paced."""
+        return self._realtime_ratio
+
+    @realtime_ratio.setter
+    def realtime_ratio(self, value):
+        self._realtime_ratio = value
+
+    @property
+    def hubs(self):
+        """The list of hub locations trucks operate from."""
+        return self._hubs
+
+    @property
+    def day(self):
+        """The simulated day, the clock counts seconds since its midnight."""
+        return self._day
+
     @property
     def start_time(self):
         """Time the trucks leave the facility for deliveries."""
-        return self._start_time
+        return to_datetime(self._start_clock, self._day)
 
     @property
     def end_time(self):
         """The time deliveries still stop. This is the end-of-day."""
-        return self._end_time
+        return to_datetime(self._end_clock, self._day)
 
     @property
     def current_time(self):
         """The current time."""
         return self._current_time
 
+    @property
+    def clock(self):
+        """The current time, in seconds since midnight of the simulated day."""
+        return self._clock
+
     @property
     def total_distance(self):
         """The total combined distanced traveled by the all trucks."""
@@ -95,13 +172,30 @@ class RuntimeState:
     @property
     def total_time(self):
         """The total combined time taken by the all trucks while on route."""
-        return self._total_time
+        return timedelta(seconds=self._total_time)
+
+    @property
+    def changes(self):
+        """The ChangeTracker publishing the changes to packages and trucks at the end of every tick."""
+        return self._changes
 
     @property
     def packages_delivered(self):
         """The total number of packages delivered."""
         return self._total_delivered
 
+    def next_event_time(self):
+        """The next time any truck on route arrives at a stop, None if no truck is on route."""
+        # Time complexity is O(T log N), the timelines are only rebuilt when routes change
+        times = []
+        for truck in self.trucks:
+            timeline = truck.timeline
+            if timeline is not None:
+                next_time = timeline.next_event(self.current_time)
+                if next_time is not None:
+                    times.append(next_time)
+        return min(times, default=None)
+
     def load_destinations(self, filename: str):
         """Loads all the packages from the specified CSV file."""
 
@@ -109,40 +203,205 @@ class RuntimeState:
         route_loader = RouteLoader(filename)
         route_loader.load()
         self._destinations = route_loader.graph
-
-    def load_packages(self, filename: str):
-        """Loads all the packages from the specified CSV file."""
+        self._destination_source = ("table", os.path.abspath(filename))
+
+    def load_road_network(self, nodes_filename: str, edges_filename: str, stops: list = None,
+                          contract: bool = True):
+        """Builds the destinations from a road network, instead of a distance table.
+
+        Only the distances between the hubs, the locations of the loaded packages, and any
+        additional stops are computed, so call this after load_packages, and before adding trucks.
+        If contract is True, the network is preprocessed into a contraction hierarchy first,
+        which is faster when there are many stops."""
+        loader = RoadNetworkLoader(nodes_filename, edges_filename)
+        loader.load()
+        network = loader.network
+        if contract:
+            network.contract()
+
+        # Every location only once, in the order first seen
+        # Time complexity is O(N), plus the shortest paths between the S stops
+        locations = HashSet(max(len(self._hubs) + len(self.packages) + len(stops or []), 1))
+        ordered = []
+        for location in self._hubs + [p.location for p in self.packages] + list(stops or []):
+            if not locations.contains(location):
+                locations.add(location)
+                ordered.append(location)
+
+        self._destinations = network.distance_matrix(ordered)
+        self._road_network = network
+        self._road_changes = []
+        self._destination_source = ("road", os.path.abspath(nodes_filename),
+                                    os.path.abspath(edges_filename), ordered, contract)
+        Logger.log(Logger.LogLevel.INFORMATION,
+                   f"Computed the distances between {len(ordered)} destinations")
+
+    def load_packages(self, filename: str, package_ids=None):
+        """Loads all the packages from the specified CSV file.
+
+        If package_ids is specified, only packages with those IDs are kept."""
 
         # Build a list of all the packages
         package_loader = PackageLoader(filename)
         package_loader.load()
 
+        packages = package_loader.packages
+        if package_ids is not None:
+            packages = [p for p in packages if p.id in package_ids]
+
         # Create a HashSet large enough to contain all the packages without collisions
         # Doing so keeps the HashSet operating in O(1) time for lookups, insertions, and removals
-        self._packages = HashSet(int(len(package_loader.packages) * (4 / 3)))
+        self._packages = HashSet(max(int(len(packages) * (4 / 3)), 1))
 
         # Load the HashSet with the list provided by PackageLoader
-        for p in package_loader.packages:
+        for p in packages:
             self._packages.add(p)
+            p.tracker = self._changes
+            self.__schedule_arrival(p)
 
+        self.build_package_groups()
         return len(self._packages)
 
-    def add_trucks(self, count: int, start_time: time):
+    def build_package_groups(self):
+        """Groups packages that must be delivered together, and validates the groups.
+
+        "Must be delivered with" requirements are transitive, so they're merged with union-find."""
+        # Time complexity is O(N), space complexity is O(N)
+        groups = DisjointSet()
+        packages = {}
+
+        for p in self.packages:
+            packages[p.id] = p
+            groups.add(p.id)
+            if p.requires_packages is not None:
+                for required_id in p.requires_packages:
+                    groups.union(p.id, required_id)
+
+        self._package_groups = {}
+        for ids in groups.groups().values():
+            # Required packages that aren't in the manifest are ignored
+            members = tuple(sorted((packages[i] for i in ids if i in packages),
+                                   key=lambda p: p.id))
+            if len(members) < 2:
+                continue
+
+            # Every package in the group must be able to go on the same truck
+            trucks = set(p.requires_truck for p in members if p.requires_truck is not None)
+            if len(trucks) > 1:
+                raise ConstraintError(
+                    f"Packages {[p.id for p in members]} must be delivered together, but require trucks {sorted(trucks)}")
+            if len(members) > Truck.MAXIMUM_NUMBER_OF_PACKAGES:
+                raise ConstraintError(
+                    f"Packages {[p.id for p in members]} must be delivered together, but don't fit on a truck")
+
+            for p in members:
+                self._package_groups[p.id] = members
+
+    def package_group(self, package: Package):
+        """Returns the packages that must be delivered with the package, including itself."""
+        return self._package_groups.get(package.id, (package,))
+
+    def set_routing(self, routing: Truck.Routing):
+        """Sets how every truck orders its deliveries."""
+        for truck in self.trucks:
+            truck.routing = routing
+
+    def add_trucks(self, count: int, start_time: time, hub: Location = None):
         for _ in range(count):
-            self.add_truck(start_time)
+            self.add_truck(start_time, hub)
+
+    def add_truck(self, start_time, hub: Location = None):
+        """Creates a new truck and adds it to the trucks list, returns the created entity.
 
-    def add_truck(self, start_time):
-        """Creates a new truck and adds it to the trucks list, returns the created entity."""
+        The truck is bound to the specified hub, or the default HUB if not specified."""
         # Create a new track, with the current time, so truck operation time can be tracked
-        if isinstance(start_time, time):
-            start_time = datetime.combine(date.today(), start_time)
+        # A time is on the simulated day, a datetime can be on any day
+        start_clock = to_seconds(start_time, self._day)
+
+        if hub is not None and hub not in self._hubs:
+            self.add_hub(hub)
 
         truck = Truck(
-            len(self.trucks) + 1, self.current_time, start_time,
-            self.destinations)
+            len(self.trucks) + 1, self._clock, start_clock,
+            self.destinations, hub, self._day)
+        truck.tracker = self._changes
         self._trucks.append(truck)
+        if self._fleet is not None:
+            self._fleet.add(truck)
+        self._scheduler.schedule(start_clock, EventScheduler.Kind.TRUCK_START, truck)
         return truck
 
+    def enable_fleet(self):
+        """Moves all trucks together with a Fleet, instead of simulating them one at a time.
+
+        This is much faster for large numbers of trucks."""
+        if self._fleet is None:
+            self._fleet = Fleet(self._clock)
+            for truck in self.trucks:
+                self._fleet.add(truck)
+
+    def set_route_workers(self, processes: int = None):
+        """Solves the routes of all trucks leaving in the same tick together, in worker processes.
+
+        processes - number of worker processes, None for one per CPU, 0 to stop batching
+        The routes are the same as when they are solved one truck at a time, this only pays off
+        when routes are expensive to solve, with many packages per truck or time windows."""
+        if self._batch_router is not None:
+            self._batch_router.close()
+            self._batch_router = None
+        if processes != 0:
+            self._batch_router = BatchRouter(processes)
+
+    def add_hub(self, hub: Location):
+        """Adds a hub location, which must be a vertex in the destinations graph."""
+        if self._destinations is not None and self._destinations.index_of(hub) < 0:
+            raise ValueError(f"Hub {hub} is not in the destinations")
+        if hub not in self._hubs:
+            self._hubs.append(hub)
+
+    def assign_hubs(self, owners: dict = None):
+        """Assigns every package to a hub.
+
+        Packages listed in owners (package ID -> hub) go to that hub,
+        all others go to the nearest hub by graph distance."""
+        # Time complexity is O(N * H), where H is the number of hubs
+        for p in self.packages:
+            if owners is not None and p.id in owners:
+                p.hub = owners[p.id]
+                continue
+
+            p.hub = self.__nearest_hub(p.location, self._hubs)
+
+        # Packages that must be delivered together have to leave from the same hub
+        # The hub a package of the group is owned by is used, otherwise the hub of the first one
+        # Time complexity is O(N)
+        for p in self.packages:
+            group = self.package_group(p)
+            if owners is None:
+                p.hub = group[0].hub
+                continue
+            hubs = []
+            for member in group:
+                if member.id in owners and owners[member.id] not in hubs:
+                    hubs.append(owners[member.id])
+            if len(hubs) > 1:
+                raise ConstraintError(
+                    f"Packages {[m.id for m in group]} must be delivered together, but belong to hubs {hubs}")
+            p.hub = hubs[0] if len(hubs) == 1 else group[0].hub
+
+    def __nearest_hub(self, location: Location, hubs: list):
+        """The hub closest to the location by graph distance, None if there are no hubs."""
+        # Time complexity is O(H), where H is the number of hubs
+        nearest = None
+        nearest_weight = float('Inf')
+        for hub in hubs:
+            # A weight of 0 means the location is the hub itself
+            weight = 0 if hub == location else self.destinations.get_weight(hub, location)
+            if weight < nearest_weight:
+                nearest_weight = weight
+                nearest = hub
+        return nearest
+
     def add_drivers(self, names: list):
         for name in names:
             self.add_driver(name)
@@ -154,9 +413,223 @@ class RuntimeState:
         self._drivers.append(driver)
         return driver
 
+    def add_package(self, package: Package):
+        """Adds a new package to be delivered, its location must be in the destinations.
+
+        Packages must be loaded first, and the ID must not be used by another package."""
+        if self._packages is None:
+            raise ValueError("Packages must be loaded before adding more")
+        if package.location not in self.destinations.vertices:
+            raise ValueError(f"Package {package.id} goes to an unknown location: {package.location}")
+        # The HashSet compares packages by identity, so it would keep both
+        if self.get_package(package.id) is not None:
+            raise ValueError(f"There is already a package {package.id}")
+
+        self._packages.add(package)
+        package.tracker = self._changes
+        self.__schedule_arrival(package)
+        if self._journal is not None:
+            package.journal = self._journal
+            self._journal.record_status(package)
+        if package.requires_packages is not None:
+            self.build_package_groups()
+        return package
+
+    def set_journal(self, journal):
+        """Records every package status change to the journal, None stops recording.
+
+        The current status of every package is recorded first, so the journal is complete."""
+        self._journal = journal
+        if journal is not None:
+            journal.current_time = self.current_time
+
+        # Time complexity is O(N)
+        for p in self.packages if self.packages is not None else []:
+            p.journal = journal
+            if journal is not None:
+                journal.record_status(p)
+
+    def set_exporter(self, exporter):
+        """Writes the results of every trip to the exporter as trucks return, None stops exporting."""
+        self._exporter = exporter
+
+    def remove_driver(self, name: str):
+        """Removes a driver, the driver's truck must be at the facility."""
+        for driver in self._drivers:
+            if driver == name:
+                if driver.truck is not None:
+                    if driver.truck.status != Truck.Status.AT_FACILITY:
+                        raise AlreadyInProgressException(
+                            f"Driver {name} is on route with truck {driver.truck.id}.")
+                    driver.truck.driver = None
+                    driver.truck = None
+
+                self._drivers.remove(driver)
+                return driver
+
+        raise ValueError(f"No driver named {name}")
+
     def add_package_correction(self, package_id, update_time, updated_information):
         """Add a correction to a package that occurs at a specified time."""
-        self._exceptions.add(PackageCorrection(package_id, update_time, updated_information))
+        self._scheduler.schedule(to_seconds(update_time, self._day),
+                                 EventScheduler.Kind.CORRECTION,
+                                 PackageCorrection(package_id, update_time, updated_information))
+
+    def add_weight_change(self, update_time, u, v, weight: float, directed: bool = False,
+                          road: bool = False):
+        """Changes a weight at a specified time, see update_edge_weight and update_road_weight."""
+        self._scheduler.schedule(to_seconds(update_time, self._day),
+                                 EventScheduler.Kind.WEIGHT_CHANGE, (u, v, weight, directed, road))
+
+    def update_edge_weight(self, u, v, weight: float, directed: bool = False):
+        """Changes the distance between two destinations during the day, for closures or traffic.
+
+        Only the trucks whose remaining route drives between them are repaired,
+        found through the reverse index of route legs.
+        returns: the list of trucks affected"""
+        # Time complexity is O(T) to refresh the index, plus the repair of the affected trucks
+        indexes = [self.destinations.index_of(u), self.destinations.index_of(v)]
+        for (index, vertex) in zip(indexes, (u, v)):
+            if index < 0:
+                raise KeyError(f"{vertex} is not a vertex of the graph")
+        (u, v) = indexes
+        self._route_index.refresh(self.trucks)
+        edges = [(u, v)] if directed else [(u, v), (v, u)]
+        previous = [self.destinations.get_weight(a, b) for (a, b) in edges]
+        self.destinations.update_weight(u, v, weight, directed)
+
+        affected = {}
+        for ((a, b), previous_weight) in zip(edges, previous):
+            for truck in self._route_index.trucks_using(a, b):
+                truck.update_edge_weight(a, b, previous_weight)
+                affected[truck.id] = truck
+
+        Logger.log(Logger.LogLevel.VERBOSE,
+                   f"Distance from {self.destinations.vertices[u]} to "
+                   f"{self.destinations.vertices[v]} is now {weight}, "
+                   f"rerouted trucks {sorted(affected)}")
+        return [affected[i] for i in sorted(affected)]
+
+    def update_road_weight(self, u, v, weight: float, directed: bool = False):
+        """Changes the weight of a road in the road network the destinations were built from.
+
+        Only the distances between destinations whose shortest path can use the road are
+        computed again, and only the trucks driving between those destinations are repaired.
+        returns: the list of trucks affected"""
+        if self._road_network is None:
+            raise ValueError("The destinations weren't loaded from a road network")
+
+        affected = {}
+        for (a, b, previous_weight) in self._road_network.update_weight(u, v, weight, directed):
+            changes = self._road_network.repair_distance_matrix(
+                self.destinations, a, b, previous_weight)
+            for (i, j, distance) in changes:
+                for truck in self.update_edge_weight(i, j, distance, directed=True):
+                    affected[truck.id] = truck
+        self._road_changes.append((u, v, weight, directed))
+        return [affected[i] for i in sorted(affected)]
+
+    def get_package(self, package_id: int):
+        """Finds a package by ID, returns None if there is no such package."""
+        # Packages hash to their ID, so only one bucket is searched, O(1) without collisions
+        if self._packages is None:
+            return None
+        for p in self._packages.search(package_id):
+            if p.id == package_id:
+                return p
+        return None
+
+    def next_scheduled_time(self):
+        """The time of the next correction, delayed arrival or truck start, None if there is none."""
+        due = self._scheduler.next_due_time()
+        if due is None:
+            return None
+        return to_datetime(due, self._day)
+
+    def __schedule_arrival(self, package: Package):
+        if package.status == Package.Status.DELAYED and package.arrival_seconds is not None:
+            self._scheduler.schedule(package.arrival_seconds,
+                                     EventScheduler.Kind.ARRIVAL, package)
+
+    def plan_fleet(self):
+        """Plans the loads and trips of every staffed truck for the rest of the day.
+
+        Trucks load their planned trips in order, packages that aren't part of a plan
+        are still loaded by assign_packages. Returns the plan, truck ID -> list of trips."""
+        # Drivers stay with the first trucks they're assigned to, so only those trucks run
+        staffed = self.trucks[:len(self.drivers)]
+
+        # Packages with a pending correction can't leave before the correction
+        ready_times = {}
+        for c in self._scheduler.pending(EventScheduler.Kind.CORRECTION):
+            ready_times[c.id] = max(c.time, ready_times.get(c.id, c.time))
+
+        self._fleet_plan = {}
+        self._planned = set()
+
+        # Each hub with staffed trucks is planned on its own
+        hub_trucks = {}
+        for hub in self._hubs:
+            trucks = [t for t in staffed if t.hub == hub]
+            if len(trucks) > 0:
+                hub_trucks[hub] = trucks
+
+        # Every package is planned by exactly one hub: its own, otherwise the hub of the truck
+        # it requires, otherwise the nearest
+        hub_units = {hub: [] for hub in hub_trucks}
+        truck_hubs = {t.id: t.hub for t in self.trucks}
+        seen = set()
+        for p in self.packages:
+            if p.id in seen or p.truck is not None or \
+                    p.status not in (Package.Status.AT_FACILITY, Package.Status.DELAYED):
+                continue
+            group = self.package_group(p)
+            seen.update(member.id for member in group)
+            hub = p.hub
+            if hub is None:
+                hub = next((truck_hubs[m.requires_truck] for m in group
+                            if m.requires_truck in truck_hubs), None)
+            if hub is None:
+                hub = self.__nearest_hub(p.location, list(hub_trucks))
+            if hub in hub_units:
+                hub_units[hub].append(group)
+
+        for (hub, trucks) in hub_trucks.items():
+            planner = FleetPlanner(self.destinations, hub)
+            plan = planner.plan(hub_units[hub], trucks, ready_times)
+
+            for (truck_id, trips) in plan.items():
+                self._fleet_plan[truck_id] = trips
+                for trip in trips:
+                    self._planned.update(p.id for p in trip.packages)
+
+        return self._fleet_plan
+
+    def load_planned_trip(self, truck: Truck):
+        """Loads the next planned trip into the truck.
+
+        Returns False if the truck has no planned trips left."""
+        trips = self._fleet_plan.get(truck.id)
+        if not trips:
+            return False
+
+        trip = trips[0]
+        if self._clock < trip.departure:
+            return True  # Wait for the packages of the trip to be ready
+
+        trips.pop(0)
+        for p in trip.packages:
+            self._planned.discard(p.id)
+            # Any package that isn't available anymore is left to assign_packages
+            if p.truck is None and self.__is_available(p, truck):
+                truck.add_package(p)
+
+        # The truck delivers in the planned order
+        truck.planned_route = trip.locations
+
+        Logger.log(Logger.LogLevel.VERBOSE,
+                   f"Loaded planned trip {trip} into truck {truck.id}")
+        return True
 
     def assign_packages(self, truck: Truck):
         """Parses the packages list, and selects ones to go into specified truck."""
@@ -165,12 +638,9 @@ class RuntimeState:
         # 2) If the package isn't at the facility ignore it
         # 3) If the package requires a specific truck,
         #    add it only if the current truck being loaded is that truck
-        # 4) If the package requires other packages, check to see if any of
-        #    the other packages have already been added.
-        #  a) If so, check if they were loaded in this truck, and add that package too
-        #  b) If not, then:
-        #   1) If no packages have been loaded, then load this one, and each related package
-        #   2) If another package was loaded on a different truck, don't load it on this truck
+        # 4) If the package must be delivered with other packages, the whole group
+        #    is loaded at once, but only if every package in the group is at the facility
+        #    and the group fits in the truck. Groups are built at load time.
         # 5) If another package going to the same location was already loaded,
         #    add this one too for optmizing
         # 6) If the package has a delivery window in the next 3 hours, add it
@@ -181,73 +651,24 @@ class RuntimeState:
         if truck.status != Truck.Status.AT_FACILITY:
             raise AlreadyInProgressException
 
-        delivery_window = timedelta(hours=3)  # Trucks can deliver all their packages in 3 hours
+        delivery_window = 3 * 3600  # Trucks can deliver all their packages in 3 hours
         has_deadline = False
-        pending_add = HashSet(len(self.packages))
 
-        # Worst case time complexity for this is O(N^3)
-        # Worst case space complexity is O(N^2)
-        # Where P is the number of packages, and R is the number of required packages in P
+        # Worst case time complexity for this is O(N^2), due to rule 5
+        # Since groups are loaded atomically, each group is checked in O(G)
         for p in self.packages:
             try:
-                if p.time_arrival is not None and p.time_arrival > self.current_time.time():
-                    continue  # Skip packages that haven't arrived in the facility yet
-
-                if p.status == Package.Status.DELAYED:
-                    # Package arrived, mark it available
-                    p.status = Package.Status.AT_FACILITY
-
-                if p.status != Package.Status.AT_FACILITY:
-                    continue  # Skip packages that aren't at the facility
-
-                if p.requires_truck is not None and p.requires_truck != truck.id:
-                    continue  # Skip if it's required to go into a different truck
-
-                if p.requires_packages is not None:
-                    # If it requires delivery with another package
-                    # check to see if one of the requirements was already
-                    # placed on a different truck.
-                    # This loop has a complexity of O(N^2)
-                    for p1 in self.packages:
-                        try:
-                            # Complexity of the search is O(N)
-                            # This additional storage adds to the space complexity
-                            # The axiliary space complexity is O(N)
-                            p.requires_packages.index(p1.id)
-
-                            # If the package is on this truck, add this package too
-                            if p1.truck == truck:
-                                # Complexity for this should be O(1), assuming no collisions
-                                truck.add_package(p)
-                                break
-
-                            if p1.truck is not None:
-                                pending_add = None
-                            else:
-                                # If we have other related packages, flag those too
-                                # as they might not have an indicator of requirements
-                                if pending_add is not None:
-                                    pending_add.add(p1.id)
-                        except ValueError:
-                            continue
-
-                    if p.truck is not None:
-                        continue  # If this package was assigned, go to the next one
-
-                # Add any complimentary packages that weren't flagged before
-                # Time complexity is O(N)
-                if pending_add is not None:
-                    try:
-                        for pending in pending_add:
-                            if pending == p.id:
-                                truck.add_package(p)
-                                pending_add.remove(pending)
-                                break
-                    except ValueError:
-                        pass
-
-                if p.truck is not None:
-                    continue  # If this package was assigned, go to the next one
+                if p.id in self._planned or not self.__is_available(p, truck):
+                    continue  # Planned packages are loaded by load_planned_trip
+
+                group = self.package_group(p)
+                if len(group) > 1:
+                    # Load every package of the group, or none of them
+                    if p.truck is None and self.__is_group_available(group, truck):
+                        for member in group:
+                            if member.truck is None:
+                                truck.add_package(member)
+                    continue
 
                 # If we already have a package going nearby, add it
                 # The time complexity of this is also O(N)
@@ -260,8 +681,7 @@ class RuntimeState:
                     continue  # If this package was assigned, go to the next one
 
                 # Prioritize packages with an early delivery deadline
-                if p.time_deadline < (self.current_time +
-                                      delivery_window).time():
+                if p.deadline_seconds < self._clock + delivery_window:
                     truck.add_package(p)
                     has_deadline = True
                     continue
@@ -274,82 +694,417 @@ class RuntimeState:
                 # No more room in this truck
                 return
 
+    def __is_available(self, package: Package, truck: Truck):
+        """Checks if a package can be loaded into the truck, ignoring other packages."""
+        if package.status != Package.Status.AT_FACILITY:
+            # Skip packages that aren't at the facility,
+            # delayed packages are marked as arrived by check_for_corrections
+            return False
+
+        if package.requires_truck is not None and package.requires_truck != truck.id:
+            return False  # Skip if it's required to go into a different truck
+
+        if package.hub is not None and package.hub != truck.hub:
+            return False  # Skip if it's delivered from a different hub
+
+        return True
+
+    def __is_group_available(self, group: tuple, truck: Truck):
+        """Checks if a whole group of packages can be loaded into the truck."""
+        # Time complexity is O(G), for G packages in the group
+        for member in group:
+            if not self.__is_available(member, truck):
+                return False
+
+        # The group must fit in the truck, in its entirety
+        return len(truck.packages) + len(group) <= Truck.MAXIMUM_NUMBER_OF_PACKAGES
+
     def check_for_corrections(self):
-        """Check for any package corrections that need to be performed."""
-        for c in self._exceptions:
-            if self.current_time.time() >= c.time:
+        """Check for any package corrections, delayed arrivals, or weight changes that are due."""
+        # Only the events that are due are looked at, each costs O(log N) to remove
+        for (kind, payload) in self._scheduler.pop_due(self._clock):
+            if kind == EventScheduler.Kind.CORRECTION:
                 # We have a correction to make, do it
+                p = self.get_package(payload.id)
+                if p is None:
+                    Logger.log(Logger.LogLevel.WARNING,
+                               f"Correction for unknown package {payload.id} ignored.")
+                elif isinstance(payload.correction, Location):
+                    p.location = payload.correction
+            elif kind == EventScheduler.Kind.ARRIVAL:
+                # The package arrived, mark it available
+                if payload.status == Package.Status.DELAYED:
+                    payload.status = Package.Status.AT_FACILITY
+            elif kind == EventScheduler.Kind.TRUCK_START:
+                Logger.log(Logger.LogLevel.VERBOSE, f"Truck {payload.id} can leave the facility.")
+            elif kind == EventScheduler.Kind.WEIGHT_CHANGE:
+                (u, v, weight, directed, road) = payload
+                if road:
+                    self.update_road_weight(u, v, weight, directed)
+                else:
+                    self.update_edge_weight(u, v, weight, directed)
+
+    def set_checkpoint_interval(self, interval: timedelta,
+                                filename: str = "checkpoint-{time:%H%M%S}.ckpt"):
+        """Saves a checkpoint every interval of simulated time while simulating.
+
+        The filename is formatted with the simulation time of the checkpoint.
+        Pass None for the interval to disable checkpoints."""
+        self._checkpoint_interval = interval
+        self._checkpoint_filename = filename
+        self._next_checkpoint = self._clock
+
+    def save_checkpoint(self, filename: str):
+        """Saves the simulation state to the specified file.
+
+        Destinations loaded from files aren't saved, only the files and the weight changes since,
+        so the files must still be there when the checkpoint is loaded."""
+        # The source of the destinations is written first, then the mutable state (clock, packages,
+        # trucks, drivers, pending events) is pickled and compressed, references between entities
+        # are preserved, and references to the destinations are saved as persistent IDs
+        # The journal is tied to this process, so packages are detached from it while saving
+        if self._journal is not None:
+            for p in self.packages:
+                p.journal = None
+
+        shared = {}
+        source = None
+        if self._destination_source is not None:
+            shared = {"destinations": self._destinations, "road_network": self._road_network}
+            source = (self._destination_source, self._destinations.changes, self._road_changes)
+
+        try:
+            with gzip.open(filename, mode='wb') as checkpoint_file:
+                pickle.dump(source, checkpoint_file, protocol=pickle.HIGHEST_PROTOCOL)
+                RuntimeState._CheckpointPickler(checkpoint_file, shared).dump(self)
+        finally:
+            if self._journal is not None:
                 for p in self.packages:
-                    if p.id == c.id:
-                        if isinstance(c.correction, Location):
-                            p.location = c.correction
-                        self._exceptions.remove(c)
-                        break
-        
-        # Check if any packages have arrived
-        for p in self.packages:
-            if (p.status == Package.Status.DELAYED and p.time_arrival < self.current_time.time()):
-                p.status = Package.Status.AT_FACILITY
+                    p.journal = self._journal
+
+        Logger.log(Logger.LogLevel.VERBOSE,
+                   f"Saved checkpoint at {self.current_time} to {filename}")
+
+    @classmethod
+    def load_checkpoint(cls, filename: str):
+        """Loads a simulation state saved by save_checkpoint, returns the restored state.
+
+        The terminal interface is not initialized, call init_ui again if needed."""
+        with gzip.open(filename, mode='rb') as checkpoint_file:
+            source = pickle.load(checkpoint_file)
+            shared = cls.__build_destinations(source) if source is not None else {}
+            state = RuntimeState._CheckpointUnpickler(checkpoint_file, shared).load()
+
+        if not isinstance(state, cls):
+            raise TypeError(f"{filename} is not a {cls.__name__} checkpoint")
+
+        Logger.log(Logger.LogLevel.INFORMATION,
+                   f"Resuming from checkpoint at {state.current_time}")
+        return state
+
+    @staticmethod
+    def __build_destinations(source: tuple):
+        """Builds the destinations of a checkpoint again, with the weight changes made since."""
+        (destination_source, changes, road_changes) = source
+        network = None
+        if destination_source[0] == "table":
+            route_loader = RouteLoader(destination_source[1])
+            route_loader.load()
+            graph = route_loader.graph
+        else:
+            (_, nodes_filename, edges_filename, stops, contract) = destination_source
+            loader = RoadNetworkLoader(nodes_filename, edges_filename)
+            loader.load()
+            network = loader.network
+            if contract:
+                network.contract()
+            graph = network.distance_matrix(stops)
+            for (u, v, weight, directed) in road_changes:
+                network.update_weight(u, v, weight, directed)
+
+        # Changes are applied in order, so the graph ends up with the same versions
+        for (_, u, v, weight) in changes:
+            graph.update_weight(u, v, weight, directed=True)
+        return {"destinations": graph, "road_network": network}
+
+    class _CheckpointPickler(pickle.Pickler):
+        """Pickles a state, saving the shared objects as references instead of their contents."""
+        def __init__(self, file, shared: dict):
+            super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+            self.__ids = {id(obj): key for (key, obj) in shared.items() if obj is not None}
+
+        def persistent_id(self, obj):
+            return self.__ids.get(id(obj))
+
+    class _CheckpointUnpickler(pickle.Unpickler):
+        """Unpickles a state, replacing the references saved by _CheckpointPickler."""
+        def __init__(self, file, shared: dict):
+            super().__init__(file)
+            self.__shared = shared
+
+        def persistent_load(self, pid):
+            if pid not in self.__shared:
+                raise pickle.UnpicklingError(f"Unknown reference in checkpoint: {pid}")
+            return self.__shared[pid]
+
+    def __getstate__(self):
+        # The terminal interface is tied to this process, so it's not saved in checkpoints
+        state = self.__dict__.copy()
+        state['_ui_inited'] = False
+        state['_renderer'] = None
+        state['_package_lines'] = {}
+        state['_render_thread'] = None
+        state['_fps'] = None
+        state['_tick_listeners'] = []
+        state['_journal'] = None
+        state['_exporter'] = None
+        return state
+
+    def __check_for_checkpoint(self):
+        if self._checkpoint_interval is None or self._clock < self._next_checkpoint:
+            return
+
+        self.save_checkpoint(self._checkpoint_filename.format(time=self.current_time))
+        self._next_checkpoint = self._clock + self._checkpoint_interval.total_seconds()
 
     def simulate(self):
-        """Simulates the world. Returns only when simulation ends."""
+        """Simulates the world. Returns only when simulation ends.
 
-        while self.current_time < self.end_time:
-            # Draw the user interface status screen
-            self.draw()
+        This is also used to resume a state restored by load_checkpoint."""
 
-            # If all the packages were delivered, we can stop
-            if self._total_delivered >= len(self.packages):
-                break
+        # Wall time the simulation started, used to keep pace with the real time ratio
+        wall_start = wall_clock.monotonic()
+        simulation_start = self._clock
 
-            # Handle package exceptions
-            self.check_for_corrections()
+        # A thread can only be started once, so every simulation draws on a new one
+        if self._fps is not None:
+            self._render_thread = RenderThread(self._renderer, self._fps)
+            self._render_thread.start()
 
-            # Simulate each truck
-            # Since the number of trucks doesn't change, this is a constant loop O(1)
-            # If the number of trucks could change throughout runtime, it would be O(T)
-            for truck in self.trucks:
-                try:
-                    # start_route is O(N^2)
-                    truck.start_route()
-                except NoDriverError:
-                    for driver in self.drivers:  # Truck needs a driver assigned
-                        if driver.truck is None:
-                            driver.assign_truck(truck)
-                            break
-                except NoPackagesError:
-                    # assign_packages complexity is O(N^3) time, O(N^2) space
-                    self.assign_packages(truck)  # Truck is empty and needs packages
-                except (AlreadyInProgressException, TooEarlyError):
-                    pass  # do nothing
+        while self.simulate_tick():
+            if self._realtime_ratio is not None:
+                # Sleep until the wall clock catches up with the simulated time
+                elapsed = self._clock - simulation_start
+                delay = wall_start + elapsed / self._realtime_ratio - wall_clock.monotonic()
+                if delay > 0:
+                    sleep(delay)
+            elif self._frame_delay > 0 and self._render_thread is None:
+                # Sleep for a little bit so it doesn't steal CPU, and display is readable
+                sleep(self._frame_delay)
+
+        if self._render_thread is not None:
+            # Show the final state, and wait for the render thread to finish
+            self._render_thread.stop(self.build_frame())
+            self._render_thread = None
+
+    def simulate_tick(self, stop_when_delivered: bool = True):
+        """Simulates a single tick of the world, and advances the clock.
+
+        Returns False once the simulation has ended, without simulating anything."""
+        if self._clock >= self._end_clock:
+            return False
+
+        # Draw the user interface status screen
+        self.draw()
+
+        # If all the packages were delivered, we can stop
+        if stop_when_delivered and self._total_delivered >= len(self.packages):
+            return False
+
+        # Save the state before this tick is simulated, if a checkpoint is due
+        self.__check_for_checkpoint()
+
+        if self._journal is not None:
+            self._journal.current_time = self.current_time
+
+        # Handle package exceptions
+        self.check_for_corrections()
+
+        if self._fleet is not None:
+            self.__simulate_fleet()
+        else:
+            self.__simulate_trucks()
+
+        # Increment clock
+        self._clock += self._simulation_speed
+        self._current_time = to_datetime(self._clock, self._day)
+
+        self.__publish_changes()
+
+        # Let listeners see the state as of the new time, before the next tick changes it
+        for listener in self._tick_listeners:
+            listener(self)
+
+        return True
+
+    def __publish_changes(self):
+        """Publishes the changes made during the tick, only the packages that changed are drawn again."""
+        # Time complexity is O(C), for C changes
+        for package_id in self._changes.dirty_packages:
+            self._package_lines.pop(package_id, None)
+        self._changes.flush()
+
+    def __simulate_trucks(self):
+        # Trucks leaving in this tick are started together, before any truck moves
+        # Truck ID -> time to move, or None for trucks that can't leave yet
+        started = self.__start_trucks_in_batch() if self._batch_router is not None else {}
+
+        # Simulate each truck
+        # Since the number of trucks doesn't change, this is a constant loop O(1)
+        # If the number of trucks could change throughout runtime, it would be O(T)
+        for truck in self.trucks:
+            if truck.id in started:
+                if started[truck.id] is not None:
+                    truck.advance(started[truck.id])
+            else:
+                if self._batch_router is None:
+                    self.__prepare_truck(truck)
 
                 # Simulate the truck operations
                 # Worst case time complexity O(N^2)
-                truck.simulate(self.current_time)
-
-                # Get how far the truck traveled in the last simulation tick
-                self._total_distance += truck.distance_last_update
-                self._total_time += truck.elapsed_last_update
-
-                # If the truck arrived at the facility, update the total delivery count
-                if truck.status == Truck.Status.AT_FACILITY and \
-                   truck.distance_traveled > 0 and \
-                   truck.last_status_update == truck.last_update:
-                    self._total_delivered += truck.delivered_packages
-                    time_taken = truck.last_status_update - truck.route_start_time
-                    Logger.log(
-                        Logger.LogLevel.INFORMATION,
-                        f"Truck {truck.id} delivered {truck.delivered_packages} packages in {time_taken} with a distance of {truck.distance_traveled}"
-                    )
-
-            # Increment clock
-            self._current_time += self._simulation_speed
-
-            # Sleep for a little bit so it doesn't steal CPU, and display is readable
-            sleep(0.1)
-
-    def init_ui(self):
-        """Initialize the terminal interface. Call this before simulate()."""
+                truck.simulate(self._clock)
+
+            # Get how far the truck traveled in the last simulation tick
+            self._total_distance += truck.distance_last_update
+            self._total_time += truck.elapsed_last_update
+
+            # If the truck arrived at the facility, update the total delivery count
+            if truck.status == Truck.Status.AT_FACILITY and \
+               truck.distance_traveled > 0 and \
+               truck.status_clock == truck.clock:
+                self.__truck_returned(truck)
+
+    def __simulate_fleet(self):
+        # Only trucks waiting at the facility might need a driver or packages
+        # Time complexity is O(T) for the scan, plus the cost of loading the waiting trucks
+        leaving = []
+        for truck in self.trucks:
+            if truck.status != Truck.Status.AT_FACILITY:
+                continue
+            if self._batch_router is None:
+                self.__prepare_truck(truck)
+            elif self.__prepare_truck(truck, start=False):
+                self.__request_route(truck, leaving)
+
+        # All trucks move at once, only trucks reaching a target run per-truck logic
+        # With a batch router, trucks leaving in this tick are started together
+        start_trucks = None
+        if self._batch_router is not None:
+            self.__start_routes(leaving)
+            start_trucks = self.__start_waiting_trucks
+        (distance, elapsed) = self._fleet.step(self._clock, start_trucks)
+        self._total_distance += distance
+        self._total_time += elapsed
+
+        for truck in self._fleet.arrived:
+            if truck.distance_traveled > 0:
+                self.__truck_returned(truck)
+
+    def __start_trucks_in_batch(self):
+        """Starts every truck that can leave in this tick, with routes solved by the batch router.
+
+        Trucks get the same chances to leave as when simulated one at a time,
+        before and after their clock is moved to the current time.
+        returns: truck ID -> time the truck still has to move, or None if it can't leave yet,
+                 for the trucks which were moved to the current time"""
+        # Time complexity is O(T) for the scan, plus the cost of loading and routing the trucks
+        moved = {}
+        leaving = []  # List of (truck, route request)
+        for truck in self.trucks:
+            if truck.status != Truck.Status.AT_FACILITY:
+                continue
+
+            if not self.__prepare_truck(truck, start=False):
+                # The truck gets another chance once its clock is moved, as in Truck.simulate
+                moved[truck.id] = truck.begin_tick(self._clock)
+                if not self.__can_start(truck):
+                    moved[truck.id] = None
+                    continue
+            self.__request_route(truck, leaving)
+
+        self.__start_routes(leaving)
+        return moved
+
+    def __start_waiting_trucks(self, trucks: list):
+        """Starts the waiting trucks of the fleet that can leave, with routes solved by the batch router."""
+        leaving = []
+        for truck in trucks:
+            if self.__can_start(truck):
+                self.__request_route(truck, leaving)
+        self.__start_routes(leaving)
+
+    def __can_start(self, truck: Truck):
+        try:
+            truck.check_start()
+            return True
+        except (NoDriverError, NoPackagesError, AlreadyInProgressException, TooEarlyError):
+            return False
+
+    def __request_route(self, truck: Truck, leaving: list):
+        request = truck.route_request()
+        if request is None:
+            truck.start_route()  # Following a planned route, there is nothing to solve
+        else:
+            leaving.append((truck, request))
+
+    def __start_routes(self, leaving: list):
+        """Solves the routes of the leaving trucks in a single batch, and starts them."""
+        if len(leaving) == 0:
+            return
+
+        # Routes are applied in truck ID order, no matter how they were solved
+        results = self._batch_router.solve(self.destinations, [r for (_, r) in leaving])
+        for ((truck, request), result) in sorted(zip(leaving, results), key=lambda l: l[0][0].id):
+            truck.start_route(request, result)
+
+    def __prepare_truck(self, truck: Truck, start: bool = True):
+        """Tries to start the route of the truck, assigning a driver or packages if it needs them.
+
+        If start is False, the route is not started, only checked if it could be.
+        Returns True if the truck started, or could start."""
+        try:
+            # start_route is O(N^2)
+            if start:
+                truck.start_route()
+            else:
+                truck.check_start()
+            return True
+        except NoDriverError:
+            for driver in self.drivers:  # Truck needs a driver assigned
+                if driver.truck is None:
+                    driver.assign_truck(truck)
+                    break
+        except NoPackagesError:
+            # Truck is empty and needs packages, use the fleet plan if there is one
+            # assign_packages complexity is O(N^2) time, O(N) space
+            if not self.load_planned_trip(truck):
+                self.assign_packages(truck)
+        except (AlreadyInProgressException, TooEarlyError):
+            pass  # do nothing
+        return False
+
+    def __truck_returned(self, truck: Truck):
+        """Updates the totals once a truck returned to the facility."""
+        self._total_delivered += truck.delivered_packages
+        time_taken = truck.last_status_update - truck.route_start_time
+        Logger.log(
+            Logger.LogLevel.INFORMATION,
+            f"Truck {truck.id} delivered {truck.delivered_packages} packages in {time_taken} with a distance of {truck.distance_traveled}"
+        )
+        if self._exporter is not None:
+            self._exporter.write_trip(truck)
+
+    def add_tick_listener(self, listener):
+        """Adds a function called with this state at the end of every tick.
+
+        Listeners are not saved in checkpoints."""
+        self._tick_listeners.append(listener)
+
+    def init_ui(self, fps: int = None):
+        """Initialize the terminal interface. Call this before simulate().
+
+        If fps is specified, the interface is drawn on a separate thread at up to that
+        many frames per second, and the simulation is no longer paced by the display."""
         COLS = 90
         MIN_ROWS = 25
         MAX_ROWS = 60
@@ -360,7 +1115,16 @@ class RuntimeState:
         self._cols = COLS
 
         # Initialize the terminal screen
-        os.system(f"mode con: cols={self._cols} lines={self._rows}")
+        if sys.platform.startswith('win'):
+            # One more line than the frame, for the cursor to rest below it
+            os.system(f"mode con: cols={self._cols} lines={self._rows + 1}")
+            # Enable ANSI escape code processing, used by the renderer, keeping the other flags
+            mode = c_ulong()
+            ctypes.windll.kernel32.GetConsoleMode(g_handle, ctypes.byref(mode))
+            ctypes.windll.kernel32.SetConsoleMode(
+                g_handle, c_ulong(mode.value | self._ENABLE_VIRTUAL_TERMINAL_PROCESSING))
+        self._renderer = TerminalRenderer()
+        self._fps = fps
         self._ui_inited = True
         Logger.instance().level = Logger.LogLevel.NONE  # Disable logging code
 
@@ -370,10 +1134,20 @@ class RuntimeState:
         if not self._ui_inited:
             return
 
+        if self._render_thread is not None:
+            # The render thread draws on its own, only build a frame when it asks for one
+            # This is the only time the render thread sees the state, so it's always consistent
+            if self._render_thread.wants_frame():
+                self._render_thread.publish(self.build_frame())
+            return
+
+        self._renderer.draw_frame(self.build_frame())
+
+    def build_frame(self):
+        """Builds the lines of a frame of the interface, returns them as an immutable tuple."""
+        self._frame = []
         lines_printed = 0
 
-        # Clear the screen
-        self.move_top_left()
         lines_printed += self.draw_header()
 
         ## Draw high-level summary, with time
@@ -404,8 +1178,18 @@ class RuntimeState:
         lines_printed += self.draw_line(
             "Package Truck Status    Weight Delivered Deadline Address")
 
+        # Packages only change on a status, truck or location change, the other lines are reused
+        # Changes made since the last tick aren't published yet, so they are checked too
+        for package_id in self._changes.dirty_packages:
+            self._package_lines.pop(package_id, None)
         for p in self.packages:
-            lines_printed += self.draw_line(f"{p}")
+            line = self._package_lines.get(p.id)
+            if line is None:
+                self.draw_line(f"{p}")
+                self._package_lines[p.id] = self._frame[-1]
+            else:
+                self._frame.append(line)
+            lines_printed += 1
 
         # Fill in any remaining space to pad to the full terminal row height
         for _ in range(self._rows - 1 - lines_printed):
@@ -413,6 +1197,10 @@ class RuntimeState:
 
         self.draw_bottom()
 
+        frame = tuple(self._frame)
+        self._frame = []
+        return frame
+
     def draw_header(self):
         # Draw header section
         title = "UPS Package Router - Daniel"
@@ -423,16 +1211,16 @@ class RuntimeState:
 
     def draw_top(self, thin: bool = False):
         if thin:
-            sys.stdout.write(f"┌{'═' * (self._cols - 2)}┐\n")
+            self._frame.append(f"┌{'═' * (self._cols - 2)}┐")
         else:
-            sys.stdout.write(f"╔{'═' * (self._cols - 2)}╗\n")
+            self._frame.append(f"╔{'═' * (self._cols - 2)}╗")
         return 1
 
     def draw_bottom(self, thin: bool = False):
         if thin:
-            sys.stdout.write(f"└{'═' * (self._cols - 2)}┘\r")
+            self._frame.append(f"└{'═' * (self._cols - 2)}┘")
         else:
-            sys.stdout.write(f"╚{'═' * (self._cols - 2)}╝\r")
+            self._frame.append(f"╚{'═' * (self._cols - 2)}╝")
         return 1
 
     def draw_line(self,
@@ -445,28 +1233,16 @@ class RuntimeState:
             edge = "║"
 
         if alignment == self._ALIGNMENT_CENTER:
-            sys.stdout.write(f"{edge}{text.center(self._cols - 2)}{edge}\n")
+            self._frame.append(f"{edge}{text.center(self._cols - 2)}{edge}")
         elif alignment == self._ALIGNMENT_LEFT:
-            sys.stdout.write(f"{edge}{text.ljust(self._cols - 2)}{edge}\n")
+            self._frame.append(f"{edge}{text.ljust(self._cols - 2)}{edge}")
         elif alignment == self._ALIGNMENT_RIGHT:
-            sys.stdout.write(f"{edge}{text.rjust(self._cols - 2)}{edge}\n")
+            self._frame.append(f"{edge}{text.rjust(self._cols - 2)}{edge}")
         return 1
 
     def draw_divider(self, thin: bool = False):
         if thin:
-            sys.stdout.write(f"╟{'─' * (self._cols - 2)}╢\n")
+            self._frame.append(f"╟{'─' * (self._cols - 2)}╢")
         else:
-            sys.stdout.write(f"╠{'═' * (self._cols - 2)}╣\n")
+            self._frame.append(f"╠{'═' * (self._cols - 2)}╣")
         return 1
-
-    @classmethod
-    def move_top_left(cls):
-        """Move cursor to the top-left position."""
-
-        # This method is to allow redrawing without flickering
-        if sys.platform.startswith('win'):
-            value = 0 + (0 << 16)
-            ctypes.windll.kernel32.SetConsoleCursorPosition(
-                g_handle, c_ulong(value))
-        else:
-            os.system(f"clear")
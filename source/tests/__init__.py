@@ -0,0 +1,34 @@
+import os
+from datetime import time
+
+from entities.Location import Location
+from structures.RuntimeState import RuntimeState
+
+# The sample data the program ships with
+DATA_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data")
+LOCATIONS_FILE = os.path.join(DATA_DIRECTORY, "locations.csv")
+PACKAGES_FILE = os.path.join(DATA_DIRECTORY, "packages.csv")
+
+
+def create_state(**arguments):
+    """The sample day: two drivers, three trucks, and the correction of package 9."""
+    state = RuntimeState(simulation_speed_seconds=30, frame_delay_seconds=0, **arguments)
+    state.load_destinations(LOCATIONS_FILE)
+    state.load_packages(PACKAGES_FILE)
+    state.add_drivers(["Alice", "Fred"])
+    state.add_trucks(3, time(8, 0))
+    state.add_package_correction(9, time(10, 20), Location("410 S State St", 84111))
+    return state
+
+
+def late_packages(state: RuntimeState):
+    """IDs of the packages delivered after their deadline."""
+    return [p.id for p in state.packages
+            if p.delivered_seconds is not None and p.delivered_seconds > p.deadline_seconds]
+
+
+def results(state: RuntimeState):
+    """What two runs of the same day must agree on: totals, and who delivered what when."""
+    deliveries = sorted((p.id, p.truck.id if p.truck is not None else None, p.delivered_seconds)
+                        for p in state.packages)
+    return (state.packages_delivered, state.total_time, round(state.total_distance, 6), deliveries)
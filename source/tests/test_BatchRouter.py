@@ -0,0 +1,58 @@
+import unittest
+
+from entities.Truck import Truck
+from structures.BatchRouter import BatchRouter
+from utilities.Logger import Logger
+from utilities.RouteLoader import RouteLoader
+from tests import LOCATIONS_FILE, create_state, results
+
+
+class BatchRouterTest(unittest.TestCase):
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+
+    def simulate(self, fleet: bool, workers: int = None):
+        state = create_state()
+        if fleet:
+            state.enable_fleet()
+        if workers is not None:
+            state.set_route_workers(workers)
+        try:
+            state.simulate()
+        finally:
+            state.set_route_workers(0)
+        return state
+
+    def test_route_workers_match_solving_each_truck(self):
+        expected = results(self.simulate(fleet=False))
+        self.assertEqual(expected[0], 40)
+        self.assertAlmostEqual(expected[2], 119.25)
+
+        self.assertEqual(results(self.simulate(fleet=False, workers=2)), expected)
+        self.assertEqual(results(self.simulate(fleet=True, workers=2)), expected)
+
+    def test_workers_see_weight_changes(self):
+        route_loader = RouteLoader(LOCATIONS_FILE)
+        route_loader.load()
+        graph = route_loader.graph
+        requests = [(routing, Truck.HUB_LOCATION, graph.vertices[first:first + 8],
+                     [36000] * 8 if routing == Truck.Routing.TIME_WINDOWS else None, 28800, False)
+                    for first in (1, 9) for routing in Truck.Routing]
+
+        router = BatchRouter(processes=2)
+        try:
+            self.assertEqual(router.solve(graph, requests),
+                             [Truck.solve_route(graph, r) for r in requests])
+
+            # Workers keep their own copy of the graph, this change has to reach them
+            graph.update_weight(0, 1, 0.1)
+            self.assertEqual(router.solve(graph, requests),
+                             [Truck.solve_route(graph, r) for r in requests])
+        finally:
+            router.close()
+        self.assertEqual(router.batches, 2)
+        self.assertEqual(router.routes_solved, 2 * len(requests))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+
+from entities.Location import Location
+from entities.Package import Package
+from structures.ChangeTracker import ChangeTracker
+from utilities.Logger import Logger
+from tests import create_state
+
+
+class ChangeTrackerTest(unittest.TestCase):
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+
+    @staticmethod
+    def package(package_id: int):
+        return Package(package_id, "195 W Oakland Ave", "Salt Lake City", "UT", 84115, 21, "")
+
+    def test_changes_are_published_in_one_batch(self):
+        tracker = ChangeTracker()
+        batches = []
+        statuses = []
+        tracker.subscribe(batches.append)
+        tracker.subscribe(statuses.append, [ChangeTracker.Kind.PACKAGE_STATUS])
+
+        packages = [self.package(i) for i in range(1, 4)]
+        for p in packages:
+            p.tracker = tracker
+            p.status = Package.Status.ON_TRUCK
+        packages[0].status = Package.Status.ON_TRUCK  # Not a change
+        packages[0].status = Package.Status.IN_ROUTE
+        packages[1].location = Location("410 S State St", 84111)
+
+        self.assertEqual(len(tracker), 5)
+        self.assertEqual(sorted(tracker.dirty_packages), [1, 2, 3])
+        self.assertEqual(batches, [])
+
+        published = tracker.flush()
+        self.assertEqual(batches, [published])
+        self.assertEqual([(c.entity.id, c.value) for c in published[:4]],
+                         [(1, Package.Status.ON_TRUCK), (2, Package.Status.ON_TRUCK),
+                          (3, Package.Status.ON_TRUCK), (1, Package.Status.IN_ROUTE)])
+        self.assertEqual(published[4].kind, ChangeTracker.Kind.PACKAGE_LOCATION)
+        self.assertEqual(statuses, [published[:4]])
+        self.assertEqual((len(tracker), tracker.dirty_packages, tracker.batches), (0, {}, 1))
+
+        # Nothing changed, nothing is published
+        self.assertEqual(tracker.flush(), [])
+        self.assertEqual(tracker.batches, 1)
+
+        # Only the location changed, which the status subscriber doesn't want
+        tracker.unsubscribe(batches.append)
+        packages[2].location = Location("410 S State St", 84111)
+        tracker.flush()
+        self.assertEqual((len(batches), len(statuses), tracker.batches), (1, 1, 2))
+
+    def test_the_day_is_published_once_per_tick(self):
+        state = create_state()
+        published = []  # Clock of every batch
+        delivered = []
+        ticks = []
+
+        def on_changes(changes):
+            published.append(state.clock)
+            delivered.extend(c.entity.id for c in changes
+                             if c.kind == ChangeTracker.Kind.PACKAGE_STATUS and
+                             c.value == Package.Status.DELIVERED)
+        state.changes.subscribe(on_changes)
+        state.add_tick_listener(lambda s: ticks.append(s.clock))
+        state.simulate()
+
+        self.assertEqual(len(published), len(set(published)))
+        self.assertTrue(set(published) <= set(ticks))
+        self.assertEqual(state.changes.batches, len(published))
+        self.assertEqual(sorted(delivered), list(range(1, 41)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import glob
+import os
+import tempfile
+import unittest
+from datetime import time, timedelta
+
+from structures.RuntimeState import RuntimeState
+from utilities.Logger import Logger
+from tests import create_state, results
+
+
+class CheckpointTest(unittest.TestCase):
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def resume_matches_uninterrupted_run(self, prepare):
+        """Runs a day with hourly checkpoints, then resumes from the one in the middle of the day."""
+        state = create_state()
+        prepare(state)
+        state.set_checkpoint_interval(timedelta(hours=1),
+                                      os.path.join(self.directory.name, "{time:%H%M%S}.ckpt"))
+        state.simulate()
+        expected = results(state)
+
+        checkpoints = sorted(glob.glob(os.path.join(self.directory.name, "*.ckpt")))
+        self.assertGreater(len(checkpoints), 2)
+        middle = checkpoints[len(checkpoints) // 2]
+        resumed = RuntimeState.load_checkpoint(middle)
+        self.assertLess(resumed.packages_delivered, expected[0])  # The day really was half done
+        resumed.set_checkpoint_interval(None)
+        resumed.simulate()
+
+        self.assertEqual(results(resumed), expected)
+        return resumed
+
+    def test_resume_assigning_packages(self):
+        self.resume_matches_uninterrupted_run(lambda state: None)
+
+    def test_resume_fleet(self):
+        self.resume_matches_uninterrupted_run(lambda state: state.enable_fleet())
+
+    def test_resume_fleet_plan(self):
+        self.resume_matches_uninterrupted_run(lambda state: state.plan_fleet())
+
+    def test_resume_replays_weight_changes(self):
+        def prepare(state):
+            state.add_weight_change(time(8, 30), 0, 5, 20.0)
+
+        resumed = self.resume_matches_uninterrupted_run(prepare)
+        self.assertEqual(resumed.destinations.get_weight(0, 5), 20.0)
+        self.assertEqual(resumed.destinations.get_weight(5, 0), 20.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from datetime import date, datetime, time
+
+from entities.Truck import Truck
+from utilities.Clock import SECONDS_PER_DAY, to_datetime, to_seconds, to_time
+from utilities.Logger import Logger
+from tests import create_state
+
+DAY = date(2020, 1, 2)
+
+
+class ClockTest(unittest.TestCase):
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+
+    def test_to_seconds(self):
+        self.assertEqual(to_seconds(time(10, 20, 30)), 37230)
+        self.assertEqual(to_seconds(None), 0)
+        # Microseconds are dropped, the clock only counts whole seconds
+        self.assertEqual(to_seconds(time(23, 59, 59, 999999)), SECONDS_PER_DAY - 1)
+        self.assertEqual(to_seconds(datetime(2020, 1, 2, 8, 0, 0, 500000)), 28800)
+
+    def test_to_seconds_across_midnight(self):
+        # Without a day, only the time of day counts
+        self.assertEqual(to_seconds(datetime(2020, 1, 3, 1, 0)), 3600)
+        self.assertEqual(to_seconds(datetime(2020, 1, 3, 1, 0), DAY), SECONDS_PER_DAY + 3600)
+        self.assertEqual(to_seconds(datetime(2020, 1, 4, 0, 0), DAY), 2 * SECONDS_PER_DAY)
+        self.assertEqual(to_seconds(time(1, 0), DAY), 3600)
+
+    def test_to_time_is_clamped_to_the_day(self):
+        self.assertEqual(to_time(37230.9), time(10, 20, 30))
+        self.assertEqual(to_time(SECONDS_PER_DAY + 3600), time(23, 59, 59))
+        self.assertEqual(to_time(-1), time(0, 0))
+
+    def test_to_datetime_round_trip(self):
+        for seconds in (0, 28800, SECONDS_PER_DAY - 1, SECONDS_PER_DAY, SECONDS_PER_DAY + 5400):
+            value = to_datetime(seconds, DAY)
+            self.assertEqual(to_seconds(value, DAY), seconds)
+        self.assertEqual(to_datetime(SECONDS_PER_DAY + 5400, DAY), datetime(2020, 1, 3, 1, 30))
+
+    def test_truck_times_after_midnight(self):
+        truck = Truck(1, SECONDS_PER_DAY + 600, 28800, create_state().destinations, day=DAY)
+        self.assertEqual(truck.last_update, datetime(2020, 1, 3, 0, 10))
+        self.assertEqual(truck.start_time, datetime(2020, 1, 2, 8, 0))
+        self.assertEqual(truck.last_status_update, datetime(2020, 1, 3, 0, 10))
+        self.assertIsNone(truck.route_start_time)
+
+
+if __name__ == '__main__':
+    unittest.main()
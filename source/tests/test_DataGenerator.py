@@ -0,0 +1,65 @@
+import filecmp
+import os
+import tempfile
+import unittest
+from datetime import time
+
+from structures.RuntimeState import RuntimeState
+from utilities.DataGenerator import DataGenerator
+from utilities.Logger import Logger
+from utilities.RouteLoader import RouteLoader
+
+
+class DataGeneratorTest(unittest.TestCase):
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name: str, generator: DataGenerator):
+        """Writes every file of the generator, returns their names."""
+        files = [os.path.join(self.directory.name, f"{name}-{kind}.csv")
+                 for kind in ("locations", "packages", "nodes", "edges")]
+        generator.write_locations(files[0])
+        generator.write_packages(files[1])
+        generator.write_road_network(files[2], files[3])
+        return files
+
+    def test_the_same_seed_generates_the_same_files(self):
+        first = self.write("first", DataGenerator(seed=7, locations=20, packages=60))
+        second = self.write("second", DataGenerator(seed=7, locations=20, packages=60))
+        other = self.write("other", DataGenerator(seed=8, locations=20, packages=60))
+
+        for (a, b, c) in zip(first, second, other):
+            self.assertTrue(filecmp.cmp(a, b, shallow=False), b)
+            self.assertFalse(filecmp.cmp(a, c, shallow=False), c)
+
+    def test_close_locations_are_still_connected(self):
+        # Many locations in a small area, some are less than 0.05 miles apart
+        (locations, _, _, _) = self.write("close", DataGenerator(locations=60, area_miles=0.5))
+        route_loader = RouteLoader(locations)
+        route_loader.load()
+        graph = route_loader.graph
+
+        self.assertEqual(graph.vertex_count, 60)
+        for u in range(graph.vertex_count):
+            for v in range(graph.vertex_count):
+                if u != v:
+                    self.assertGreater(graph.get_weight(u, v), 0)
+
+    def test_a_generated_day_delivers_every_package(self):
+        (locations, packages, _, _) = self.write("day", DataGenerator(
+            seed=3, locations=30, packages=80, trucks=4))
+        state = RuntimeState(simulation_speed_seconds=30, frame_delay_seconds=0)
+        state.load_destinations(locations)
+        state.load_packages(packages)
+        state.add_drivers([f"Driver {i}" for i in range(4)])
+        state.add_trucks(4, time(8, 0))
+        state.simulate()
+        self.assertEqual(state.packages_delivered, 80)
+
+
+if __name__ == '__main__':
+    unittest.main()
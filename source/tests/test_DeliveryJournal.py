@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+
+from utilities.DeliveryJournal import DeliveryJournal
+from utilities.Logger import Logger
+from tests import create_state
+
+
+class DeliveryJournalTest(unittest.TestCase):
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "journal.jsonl")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def simulate(self):
+        state = create_state()
+        journal = DeliveryJournal(self.filename, flush_interval_seconds=0.01, batch_size=16)
+        state.set_journal(journal)
+        state.simulate()
+        journal.close()
+        return (state, journal)
+
+    def assertReplayMatches(self, state, replayed: dict):
+        self.assertEqual(sorted(replayed), sorted(p.id for p in state.packages))
+        for p in state.packages:
+            record = replayed[p.id]
+            self.assertEqual(record["status"], p.status.name)
+            self.assertEqual(record["truck"], p.truck.id if p.truck is not None else None)
+            self.assertEqual(record["delivered"],
+                             p.time_delivered.isoformat() if p.time_delivered is not None else None)
+
+    def test_replay_matches_the_day(self):
+        (state, journal) = self.simulate()
+        with open(self.filename, encoding='utf-8') as journal_file:
+            self.assertEqual(sum(1 for _ in journal_file), journal.records_written)
+
+        replayed = DeliveryJournal.replay(self.filename)
+        self.assertReplayMatches(state, replayed)
+        self.assertEqual(replayed[9]["address"], "410 S State St (84111)")
+        self.assertEqual([i for i in replayed if replayed[i]["address"] is not None], [9])
+
+    def test_replay_skips_a_damaged_last_record(self):
+        (state, _) = self.simulate()
+        # A crash in the middle of a write leaves part of a line
+        with open(self.filename, mode='a', encoding='utf-8') as journal_file:
+            journal_file.write('{"time":"2020-01-01T12:00:00","package":1,"ev')
+
+        self.assertReplayMatches(state, DeliveryJournal.replay(self.filename))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from entities.Package import Package
+from exceptions.ConstraintError import ConstraintError
+from structures.DisjointSet import DisjointSet
+from structures.RuntimeState import RuntimeState
+from utilities.Logger import Logger
+from tests import LOCATIONS_FILE, PACKAGES_FILE
+
+
+class DisjointSetTest(unittest.TestCase):
+    def test_union_is_transitive(self):
+        groups = DisjointSet()
+        groups.union(1, 2)
+        groups.union(3, 4)
+        groups.union(2, 4)
+        groups.add(5)
+
+        self.assertEqual(groups.find(1), groups.find(3))
+        self.assertNotEqual(groups.find(1), groups.find(5))
+        self.assertEqual(sorted(sorted(g) for g in groups.groups().values()),
+                         [[1, 2, 3, 4], [5]])
+
+    def test_union_of_the_same_set(self):
+        groups = DisjointSet()
+        root = groups.union(1, 2)
+        self.assertEqual(groups.union(2, 1), root)
+        self.assertEqual(len(groups.groups()), 1)
+
+
+class PackageGroupTest(unittest.TestCase):
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+        self.state = RuntimeState(frame_delay_seconds=0)
+        self.state.load_destinations(LOCATIONS_FILE)
+        self.state.load_packages(PACKAGES_FILE)
+
+    def test_sample_groups_are_merged(self):
+        # 14 must go with 15 and 19, 16 with 13 and 19, 20 with 13 and 15
+        group = [p.id for p in self.state.package_group(self.state.get_package(14))]
+        self.assertEqual(group, [13, 14, 15, 16, 19, 20])
+        for package_id in group:
+            self.assertIs(self.state.package_group(self.state.get_package(package_id)),
+                          self.state.package_group(self.state.get_package(14)))
+
+    def test_package_without_requirements_is_alone(self):
+        package = self.state.get_package(1)
+        self.assertEqual(self.state.package_group(package), (package,))
+
+    def test_group_requiring_two_trucks_is_rejected(self):
+        self.state.add_package(Package(41, "1330 2100 S", "Salt Lake City", "UT", 84106,
+                                       1, "Can only be on truck 1"))
+        self.state.add_package(Package(42, "1330 2100 S", "Salt Lake City", "UT", 84106,
+                                       1, "Can only be on truck 2"))
+        self.state.get_package(41).requires_packages = [42]
+        with self.assertRaises(ConstraintError):
+            self.state.build_package_groups()
+
+
+if __name__ == '__main__':
+    unittest.main()
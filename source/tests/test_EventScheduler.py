@@ -0,0 +1,78 @@
+import random
+import unittest
+from datetime import time
+
+from entities.Location import Location
+from structures.EventScheduler import EventScheduler
+from structures.RuntimeState import RuntimeState
+from utilities.Clock import to_seconds
+from utilities.Logger import Logger
+from tests import LOCATIONS_FILE, PACKAGES_FILE
+
+
+class EventSchedulerTest(unittest.TestCase):
+    def test_events_are_popped_in_due_order(self):
+        scheduler = EventScheduler()
+        rng = random.Random(0)
+        dues = [rng.randrange(0, 86400) for _ in range(500)]
+        for (i, due) in enumerate(dues):
+            scheduler.schedule(due, EventScheduler.Kind.ARRIVAL, i)
+
+        popped = [payload for (_, payload) in scheduler.pop_due(86400)]
+        self.assertEqual([dues[i] for i in popped], sorted(dues))
+        self.assertEqual(len(scheduler), 0)
+        self.assertIsNone(scheduler.next_due_time())
+
+    def test_events_due_together_keep_their_scheduling_order(self):
+        scheduler = EventScheduler()
+        for i in range(10):
+            scheduler.schedule(100, EventScheduler.Kind.CORRECTION, i)
+        self.assertEqual([payload for (_, payload) in scheduler.pop_due(100)], list(range(10)))
+
+    def test_only_due_events_are_popped(self):
+        scheduler = EventScheduler()
+        scheduler.schedule(300, EventScheduler.Kind.TRUCK_START, "later")
+        scheduler.schedule(100, EventScheduler.Kind.ARRIVAL, "first")
+        scheduler.schedule(200, EventScheduler.Kind.CORRECTION, "second")
+
+        self.assertEqual(scheduler.pop_due(99), [])
+        self.assertEqual(scheduler.pop_due(200), [(EventScheduler.Kind.ARRIVAL, "first"),
+                                                  (EventScheduler.Kind.CORRECTION, "second")])
+        self.assertEqual(scheduler.next_due_time(), 300)
+        self.assertEqual(list(scheduler.pending(EventScheduler.Kind.TRUCK_START)), ["later"])
+        self.assertEqual(list(scheduler.pending(EventScheduler.Kind.ARRIVAL)), [])
+
+
+class ScheduledEventsTest(unittest.TestCase):
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+        self.state = RuntimeState(simulation_speed_seconds=30, frame_delay_seconds=0)
+        self.state.load_destinations(LOCATIONS_FILE)
+        self.state.load_packages(PACKAGES_FILE)
+        self.state.add_drivers(["Alice", "Fred"])
+        self.state.add_trucks(3, time(8, 0))
+
+    def run_until(self, when: time):
+        while self.state.clock < to_seconds(when):
+            self.state.simulate_tick()
+
+    def test_delayed_packages_arrive_on_time(self):
+        # Packages 6, 25, 28 and 32 are delayed on a flight until 9:05
+        self.run_until(time(9, 4))
+        self.assertEqual(self.state.get_package(6).status.name, "DELAYED")
+        self.run_until(time(9, 6))
+        self.assertNotEqual(self.state.get_package(6).status.name, "DELAYED")
+
+    def test_correction_is_applied_at_its_time(self):
+        location = Location("410 S State St", 84111)
+        self.state.add_package_correction(9, time(10, 20), location)
+        self.assertEqual(self.state.next_scheduled_time().time(), time(8, 0))  # Trucks start
+
+        self.run_until(time(10, 19))
+        self.assertNotEqual(self.state.get_package(9).location, location)
+        self.run_until(time(10, 21))
+        self.assertEqual(self.state.get_package(9).location, location)
+
+
+if __name__ == '__main__':
+    unittest.main()
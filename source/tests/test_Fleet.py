@@ -0,0 +1,25 @@
+import unittest
+
+from utilities.Logger import Logger
+from tests import create_state, late_packages, results
+
+
+class FleetTest(unittest.TestCase):
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+
+    def test_fleet_matches_stepping_each_truck(self):
+        state = create_state()
+        state.simulate()
+        self.assertEqual(state.packages_delivered, 40)
+        self.assertAlmostEqual(state.total_distance, 119.25)
+
+        fleet = create_state()
+        fleet.enable_fleet()
+        fleet.simulate()
+        self.assertEqual(results(fleet), results(state))
+        self.assertEqual(late_packages(fleet), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from datetime import time
+
+from entities.Location import Location
+from entities.Package import Package
+from utilities.Logger import Logger
+from tests import create_state, late_packages
+
+
+class FleetPlannerTest(unittest.TestCase):
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+
+    def test_greedy_assignment_is_on_time(self):
+        state = create_state()
+        state.simulate()
+        self.assertEqual(state.packages_delivered, 40)
+        self.assertEqual(late_packages(state), [])
+
+    def test_plan_is_on_time(self):
+        # The plan has to do at least as well as assign_packages on the sample day
+        state = create_state()
+        state.plan_fleet()
+        state.simulate()
+        self.assertEqual(state.packages_delivered, 40)
+        self.assertEqual(late_packages(state), [])
+
+    def test_planned_trips_keep_deadlines_at_their_departure(self):
+        state = create_state()
+        plan = state.plan_fleet()
+
+        for truck in state.trucks:
+            finish = truck.start_clock
+            for trip in plan.get(truck.id, []):  # Only trucks with a driver have trips
+                self.assertEqual(trip.late_packages, [])
+                self.assertGreaterEqual(trip.departure, finish)  # The truck is back by then
+                finish = trip.finish
+                for p in trip.packages:
+                    self.assertTrue(p.requires_truck is None or p.requires_truck == truck.id)
+
+        planned = sorted(p.id for trips in plan.values() for trip in trips for p in trip.packages)
+        self.assertEqual(planned, list(range(1, 41)))
+
+    def test_package_that_cant_be_on_time_is_left_to_assign_packages(self):
+        state = create_state()
+        state.add_package(Package(41, "6351 South 900 East", "Murray", "UT", 84121, 1,
+                                  "", "8:01 AM"))
+        plan = state.plan_fleet()
+
+        planned = {p.id for trips in plan.values() for trip in trips for p in trip.packages}
+        self.assertNotIn(41, planned)
+        state.simulate()
+        self.assertEqual(state.packages_delivered, 41)
+        self.assertEqual(late_packages(state), [41])
+
+    def test_plan_with_two_hubs_plans_every_package_once(self):
+        state = create_state()
+        hub = Location("3365 S 900 W", 84119)
+        state.add_drivers(["Bob", "Carol"])
+        state.add_trucks(1, time(8, 0), hub)
+        plan = state.plan_fleet()
+
+        planned = sorted(p.id for trips in plan.values() for trip in trips for p in trip.packages)
+        self.assertEqual(len(planned), len(set(planned)))
+        self.assertIn(4, plan)  # The truck of the second hub has trips too
+        for trip in plan[4]:
+            self.assertTrue(all(p.hub in (None, hub) for p in trip.packages))
+
+        state.simulate()
+        self.assertEqual(state.packages_delivered, 40)
+        self.assertTrue(all(p.status == Package.Status.DELIVERED for p in state.packages))
+
+
+if __name__ == '__main__':
+    unittest.main()
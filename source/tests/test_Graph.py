@@ -0,0 +1,149 @@
+import unittest
+
+from entities.Location import Location
+from structures.Graph import Graph
+from utilities.Logger import Logger
+from utilities.RouteLoader import RouteLoader
+from tests import LOCATIONS_FILE, create_state
+
+
+class GraphTest(unittest.TestCase):
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+        route_loader = RouteLoader(LOCATIONS_FILE)
+        route_loader.load()
+        self.graph = route_loader.graph
+
+    @staticmethod
+    def deadline_graph():
+        """Insertion starts with C, nearest but due last, then A after it, leaving no room for B."""
+        graph = Graph(4)
+        for vertex in ("S", "A", "B", "C"):
+            graph.add_vertex(vertex)
+        for (u, v, weight) in (("S", "A", 5), ("S", "B", 4), ("S", "C", 3),
+                               ("A", "B", 1), ("A", "C", 7), ("B", "C", 7)):
+            graph.add_edge(u, v, weight)
+        return graph
+
+    def test_deadline_path_falls_back_to_the_plain_route(self):
+        graph = self.deadline_graph()
+        (path, weight, late) = graph.find_deadline_path("S", ["A", "B", "C"], [15, 8, 100], 0, 1)
+        self.assertEqual([graph.vertices[v] for v in path], ["B", "A", "C"])
+        self.assertEqual(weight, 12)
+        self.assertEqual(late, [])
+
+    def test_deadline_path_reports_unreachable_vertices(self):
+        graph = self.deadline_graph()
+        # A can't be reached before 4 even directly, it still goes at its cheapest position
+        (path, weight, late) = graph.find_deadline_path("S", ["A", "B", "C"], [4, 100, 100], 0, 1)
+        self.assertEqual([graph.vertices[v] for v in late], ["A"])
+        self.assertEqual(sorted(graph.vertices[v] for v in path), ["A", "B", "C"])
+        self.assertEqual(weight, graph.route_length(path, "S"))
+
+    def test_get_weights_in_bulk(self):
+        vertices = [3, self.graph.vertices[5], 0, 7, 3]
+        self.assertEqual(self.graph.get_weights(0, vertices),
+                         [self.graph.get_weight(0, v) for v in vertices])
+        self.assertEqual(self.graph.get_weights(self.graph.vertices[2], []), [])
+        with self.assertRaises(KeyError):
+            self.graph.get_weights(0, [1, Location("1 Nowhere St", 84000)])
+
+    def test_route_length(self):
+        path = [4, 9, 2, 4]
+        legs = [self.graph.get_weight(u, v) for (u, v) in zip([0] + path, path)]
+        self.assertAlmostEqual(self.graph.route_length(path, start=0), sum(legs))
+        self.assertAlmostEqual(self.graph.route_length(path), sum(legs[1:]))
+        self.assertEqual(self.graph.route_length([]), 0)
+        with self.assertRaises(KeyError):
+            self.graph.route_length([1, Location("1 Nowhere St", 84000)])
+
+    def test_submatrix_keeps_the_weights_and_the_routes(self):
+        stops = [12, 3, self.graph.vertices[20], 7, 3, 15]
+        (local, indexes) = self.graph.submatrix([0] + stops)
+        self.assertEqual(indexes, [0, 3, 7, 12, 15, 20])
+        self.assertEqual(local.vertices, [self.graph.vertices[i] for i in indexes])
+        for (a, i) in enumerate(indexes):
+            for (b, j) in enumerate(indexes):
+                self.assertEqual(local.get_weight(a, b), self.graph.get_weight(i, j))
+
+        # Routes are the same on the local graph, once translated back
+        stops = [12, 3, 20, 7, 15]
+        (route, weight) = self.graph.find_shortest_path(0, stops)
+        (local_route, local_weight) = local.find_shortest_path(0, [indexes.index(v) for v in stops])
+        self.assertEqual([indexes[v] for v in local_route], route)
+        self.assertAlmostEqual(local_weight, weight)
+
+        with self.assertRaises(KeyError):
+            self.graph.submatrix([0, Location("1 Nowhere St", 84000)])
+
+    def test_update_weight_of_an_unknown_vertex(self):
+        last = self.graph.vertex_count - 1
+        row = list(self.graph.matrix[last])
+        with self.assertRaises(KeyError):
+            self.graph.update_weight(Location("1 Nowhere St", 84000), 0, 3.0)
+        with self.assertRaises(KeyError):
+            self.graph.update_weight(0, Location("1 Nowhere St", 84000), 3.0)
+        # The lookup returns -1 for an unknown vertex, which must not change the last row
+        self.assertEqual(self.graph.matrix[last], row)
+        self.assertEqual(self.graph.changes_since(0), [])
+
+    def test_update_weight_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            self.graph.update_weight(0, 1, 0)
+        self.assertEqual(self.graph.version, 0)
+
+    def test_update_edge_weight_of_an_unknown_destination(self):
+        state = create_state()
+        last = state.destinations.vertex_count - 1
+        row = list(state.destinations.matrix[last])
+        with self.assertRaises(KeyError):
+            state.update_edge_weight(Location("1 Nowhere St", 84000), 0, 3.0)
+        self.assertEqual(state.destinations.matrix[last], row)
+
+    def test_insert_into_an_empty_path(self):
+        path = []
+        self.assertEqual(self.graph.insert_cheapest(0, path, 7), self.graph.get_weight(0, 7))
+        self.assertEqual(path, [7])
+
+    def test_remove_from_the_ends_of_a_path(self):
+        (path, weight) = self.graph.find_shortest_path(0, [3, 8, 12, 19])
+
+        first = path[0]
+        weight += self.graph.remove_from_path(0, path, first)
+        self.assertNotIn(first, path)
+        self.assertAlmostEqual(weight, self.graph.route_length(path, 0))
+
+        last = path[-1]
+        weight += self.graph.remove_from_path(0, path, last)
+        self.assertNotIn(last, path)
+        self.assertAlmostEqual(weight, self.graph.route_length(path, 0))
+
+        self.assertEqual(self.graph.remove_from_path(0, path, last), 0)  # Not in the path anymore
+        while len(path) > 0:
+            weight += self.graph.remove_from_path(0, path, path[-1])
+        self.assertAlmostEqual(weight, 0)
+
+    def test_repairs_return_the_weight_they_add(self):
+        # Moving any stop of the route to any other location, the weights added add up
+        stops = list(range(1, 12))
+        (route, weight) = self.graph.find_shortest_path(0, stops)
+        for old in stops:
+            for new in range(12, self.graph.vertex_count):
+                path = list(route)
+                added = self.graph.remove_from_path(0, path, old)
+                added += self.graph.insert_cheapest(0, path, new)
+                self.assertAlmostEqual(weight + added, self.graph.route_length(path, 0))
+                added += self.graph.improve_path(0, path)
+                self.assertAlmostEqual(weight + added, self.graph.route_length(path, 0))
+                self.assertEqual(sorted(path), sorted(s for s in stops if s != old) + [new])
+
+    def test_improve_path_back_to_the_end(self):
+        (path, _) = self.graph.find_shortest_path(0, list(range(1, 15)))
+        before = self.graph.route_length(path + [0], 0)
+        added = self.graph.improve_path(0, path, max_passes=10, end=0)
+        self.assertLessEqual(added, 0)
+        self.assertAlmostEqual(before + added, self.graph.route_length(path + [0], 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
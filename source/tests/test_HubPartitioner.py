@@ -0,0 +1,48 @@
+import unittest
+from datetime import time
+
+from entities.Location import Location
+from entities.Truck import Truck
+from exceptions.ConstraintError import ConstraintError
+from utilities.HubPartitioner import HubPartitioner
+from utilities.Logger import Logger
+from tests import LOCATIONS_FILE, PACKAGES_FILE
+
+
+class HubPartitionerTest(unittest.TestCase):
+    SECOND_HUB = Location("3365 S 900 W", 84119)
+
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+        self.partitioner = HubPartitioner(LOCATIONS_FILE, PACKAGES_FILE, simulation_speed_seconds=30)
+        self.partitioner.add_hub(Truck.HUB_LOCATION, ["Alice", "Fred"], 3, time(8, 0))
+        self.partitioner.add_hub(self.SECOND_HUB, ["Bob"], 1, time(8, 0))
+        self.partitioner.add_package_correction(9, time(10, 20), Location("410 S State St", 84111))
+
+    def test_every_package_belongs_to_one_hub(self):
+        (first, second) = self.partitioner.partition()
+        self.assertEqual(first & second, set())
+        self.assertEqual(first | second, set(range(1, 41)))
+        # Packages that can only be on truck 2 belong to the hub of trucks 1 to 3
+        self.assertTrue({3, 18, 36, 38} <= first)
+
+    def test_every_package_is_delivered_once(self):
+        partitions = self.partitioner.partition()
+        summaries = self.partitioner.solve(processes=1)
+
+        for (summary, partition) in zip(summaries, partitions):
+            self.assertEqual(summary.packages_delivered, len(partition))
+        self.assertEqual(self.partitioner.packages_delivered, 40)
+
+    def test_worker_processes_give_the_same_results(self):
+        single = [str(s) for s in self.partitioner.solve(processes=1)]
+        self.assertEqual([str(s) for s in self.partitioner.solve(processes=2)], single)
+
+    def test_owner_conflicting_with_required_truck(self):
+        self.partitioner.set_owner(3, self.SECOND_HUB)  # Package 3 can only be on truck 2
+        with self.assertRaises(ConstraintError):
+            self.partitioner.partition()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import json
+import tracemalloc
+import unittest
+
+from structures.RuntimeState import RuntimeState
+from utilities.Logger import Logger
+from utilities.MemoryProfiler import MemoryProfiler
+from tests import LOCATIONS_FILE, PACKAGES_FILE
+
+
+class MemoryProfilerTest(unittest.TestCase):
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+
+    def tearDown(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def test_snapshots_are_only_taken_while_tracing(self):
+        profiler = MemoryProfiler()
+        profiler.snapshot("before")
+        self.assertEqual(profiler.phases, [])
+        self.assertFalse(profiler.has_phase("before"))
+
+    def test_memory_is_attributed_to_subsystems(self):
+        profiler = MemoryProfiler()
+        profiler.start()
+        profiler.snapshot("start")
+        state = RuntimeState(simulation_speed_seconds=30, frame_delay_seconds=0)
+        state.load_destinations(LOCATIONS_FILE)
+        profiler.snapshot("load_destinations")
+        state.load_packages(PACKAGES_FILE)
+        profiler.snapshot("load_packages")
+        profiler.stop()
+
+        # The phases are kept after tracing stops
+        self.assertTrue(profiler.has_phase("load_packages"))
+        report = profiler.report()
+        self.assertEqual([phase["phase"] for phase in report],
+                         ["start", "load_destinations", "load_packages"])
+        (start, destinations, packages) = [phase["subsystems"] for phase in report]
+        self.assertGreater(destinations["Graph"], start["Graph"])
+        self.assertGreater(packages["Packages"], destinations["Packages"])
+        self.assertGreater(packages["HashSet"], 0)
+        subsystems = sorted(list(MemoryProfiler.SUBSYSTEMS) + ["Other"])
+        for phase in report:
+            self.assertEqual(sorted(phase["subsystems"]), subsystems)
+            self.assertGreaterEqual(phase["peak_bytes"], phase["total_bytes"])
+        json.dumps(report)
+
+        # A header, then one line per phase
+        lines = profiler.format_report().split("\n")
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[3].startswith("load_packages"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from datetime import datetime, time
+
+from entities.Driver import Driver
+from entities.Location import Location
+from entities.Package import Package
+from entities.Truck import Truck
+from utilities.Clock import to_seconds
+from utilities.Logger import Logger
+from tests import create_state
+
+
+class PackageTest(unittest.TestCase):
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+
+    @staticmethod
+    def package(package_id: int = 1, notes: str = "", deadline: str = "EOD"):
+        return Package(package_id, "195 W Oakland Ave", "Salt Lake City", "UT", 84115, 21,
+                       notes, deadline)
+
+    def test_entities_have_no_instance_dictionary(self):
+        truck = Truck(1, 0, 0, create_state().destinations)
+        location = Location("195 W Oakland Ave", 84115)
+        for entity in (self.package(), truck, location, Driver("Alice")):
+            self.assertFalse(hasattr(entity, "__dict__"), type(entity).__name__)
+            with self.assertRaises(AttributeError):
+                entity.unknown = 1
+
+    def test_times_are_whole_seconds_since_midnight(self):
+        package = self.package(deadline="10:30 AM")
+        self.assertEqual(package.deadline_seconds, to_seconds(time(10, 30)))
+        self.assertIsInstance(package.deadline_seconds, int)
+        self.assertEqual(package.time_deadline, time(10, 30))
+        # Packages with the same deadline share its time object
+        self.assertIs(self.package(2, deadline="10:30 AM").time_deadline, package.time_deadline)
+
+        package = self.package()
+        self.assertEqual(package.deadline_seconds, Package.END_OF_DAY)
+        self.assertEqual(package.time_deadline, time.max)
+        self.assertIsNone(package.time_arrival)
+
+        package = self.package(notes="Delayed on flight---will not arrive to depot until 9:05 am")
+        self.assertEqual(package.status, Package.Status.DELAYED)
+        self.assertEqual(package.arrival_seconds, to_seconds(time(9, 5)))
+        self.assertEqual(package.time_arrival, time(9, 5))
+
+    def test_statuses_are_stored_as_small_ints(self):
+        package = self.package()
+        for status in Package.Status:
+            package.status = status
+            self.assertIs(package.status, status)
+            self.assertEqual(package._status, status.value)
+
+    def test_delivery_time(self):
+        truck = Truck(1, 0, 0, create_state().destinations)
+        package = self.package(deadline="10:30 AM")
+        package.truck = truck
+        package.deliver(datetime(2020, 1, 2, 10, 0, 30), 36030.0)
+        self.assertEqual(package.delivered_seconds, 36030)
+        self.assertIsInstance(package.delivered_seconds, int)
+        self.assertEqual(package.time_delivered, datetime(2020, 1, 2, 10, 0, 30))
+        self.assertEqual(package.status, Package.Status.DELIVERED)
+
+        # After midnight, the seconds still count from the simulated day, and are always late
+        package.status = Package.Status.ON_TRUCK
+        self.assertIsNone(package.time_delivered)
+        package.deliver(datetime(2020, 1, 3, 1, 0), 90000)
+        self.assertEqual(package.delivered_seconds, 90000)
+        self.assertEqual(package.time_delivered, datetime(2020, 1, 3, 1, 0))
+        self.assertIn("*", str(package))
+
+    def test_truck_statuses_are_stored_as_small_ints(self):
+        truck = Truck(1, 0, 0, create_state().destinations)
+        for status in Truck.Status:
+            truck.status = status
+            self.assertIs(truck.status, status)
+            self.assertIs(Truck.STATUSES[status.value], status)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import asyncio
+import json
+import unittest
+
+from entities.Package import Package
+from utilities.Logger import Logger
+from utilities.RealtimeDispatcher import RealtimeDispatcher
+from tests import create_state, late_packages
+
+
+def package_event(package_id, **fields):
+    event = {"type": "package", "id": package_id, "address": "1330 2100 S",
+             "city": "Salt Lake City", "state": "UT", "zip": 84106, "weight": 5}
+    event.update(fields)
+    return json.dumps(event)
+
+
+class RealtimeDispatcherTest(unittest.TestCase):
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+        self.state = create_state()
+        # So many simulated seconds per wall second that the clock never waits
+        self.dispatcher = RealtimeDispatcher(self.state, realtime_ratio=1e9)
+
+    def run_day(self, lines: list):
+        """Runs the dispatcher for the whole day, queuing the lines once the clock started."""
+        async def run():
+            task = asyncio.create_task(self.dispatcher.run_async(use_stdin=False))
+            await asyncio.sleep(0)  # The dispatcher creates its queue before its first tick
+            for line in lines:
+                self.dispatcher.queue_event(line)
+            await task
+
+        asyncio.run(run())
+
+    def test_events_are_applied_between_ticks(self):
+        self.run_day([
+            package_event(41, deadline="EOD", notes=None),
+            json.dumps({"type": "driver", "action": "add", "name": "Bob"}),
+        ])
+
+        self.assertEqual((self.dispatcher.events_applied, self.dispatcher.events_rejected), (2, 0))
+        self.assertEqual(self.state.get_package(41).status, Package.Status.DELIVERED)
+        self.assertIn("Bob", [d.name for d in self.state.drivers])
+        self.assertEqual(self.state.packages_delivered, 41)
+        self.assertEqual(late_packages(self.state), [])
+
+    def test_malformed_and_duplicate_events_are_rejected(self):
+        original = self.state.get_package(1)
+        self.run_day([
+            "not json",
+            json.dumps({"type": "meteor"}),
+            package_event(42, address=12),  # Not a string
+            package_event(43, zip="Salt Lake"),
+            package_event(1),  # Same ID as a loaded package
+            package_event(44),
+        ])
+
+        self.assertEqual((self.dispatcher.events_applied, self.dispatcher.events_rejected), (1, 5))
+        self.assertIs(self.state.get_package(1), original)
+        self.assertEqual([p.id for p in self.state.packages].count(1), 1)
+        self.assertIsNone(self.state.get_package(42))
+        self.assertIsNone(self.state.get_package(43))
+        self.assertEqual(self.state.packages_delivered, 41)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import io
+import time as wall_clock
+import unittest
+from contextlib import redirect_stdout
+
+from utilities.Logger import Logger
+from utilities.RenderThread import RenderThread
+from tests import create_state
+
+
+class RecordingRenderer:
+    """Keeps the frames it's asked to draw."""
+    def __init__(self):
+        self.frames = []
+
+    def draw_frame(self, lines):
+        self.frames.append(lines)
+
+
+class RenderThreadTest(unittest.TestCase):
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+
+    def wait_for_request(self, thread: RenderThread):
+        deadline = wall_clock.monotonic() + 5
+        while not thread.wants_frame():
+            self.assertLess(wall_clock.monotonic(), deadline, "No frame was requested")
+            wall_clock.sleep(0.001)
+
+    def test_published_frames_are_drawn_once(self):
+        renderer = RecordingRenderer()
+        thread = RenderThread(renderer, fps=1000)
+        thread.start()
+
+        self.wait_for_request(thread)
+        thread.publish(("first",))
+        self.wait_for_request(thread)
+        # Nothing new was published, the next requests don't draw again
+        wall_clock.sleep(0.02)
+        thread.stop()
+
+        self.assertEqual(renderer.frames, [("first",)])
+        self.assertFalse(thread.is_alive())
+
+    def test_the_final_frame_is_drawn_when_stopped(self):
+        renderer = RecordingRenderer()
+        thread = RenderThread(renderer, fps=1)
+        thread.start()
+        thread.stop(("last",))
+        self.assertEqual(renderer.frames, [("last",)])
+
+    def test_every_simulation_draws_on_a_new_thread(self):
+        state = create_state()
+        output = io.StringIO()
+        with redirect_stdout(output):
+            state.init_ui(fps=200)
+            state.simulate()
+            # A thread can only be started once, simulating again must not reuse it
+            state.simulate()
+
+        self.assertEqual(state.packages_delivered, 40)
+        self.assertIn("Total distance traveled", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import csv
+import os
+import struct
+import tempfile
+import sys
+import unittest
+from unittest import mock
+
+from utilities.Logger import Logger
+from utilities.ResultExporter import ResultExporter
+from tests import create_state
+
+COLUMNS = [("id", "int"), ("time", "double"), ("late", "bool"), ("driver", "string")]
+ROWS = [(1, 28800.5, False, "Alice"), (-2, 0.0, True, ""), (3, 1e9, True, "Zoë")]
+
+
+class ResultExporterTest(unittest.TestCase):
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, rows: list, block_size: int):
+        filename = os.path.join(self.directory.name, "test.col")
+        writer = ResultExporter.ColumnWriter(filename, COLUMNS, block_size)
+        for row in rows:
+            writer.write_row(row)
+        writer.close()
+        return filename
+
+    def test_read_what_was_written(self):
+        # A full block and a partial one
+        filename = self.write(ROWS, block_size=2)
+        columns = ResultExporter.read_columns(filename)
+        self.assertEqual(list(columns), [name for (name, _) in COLUMNS])
+        self.assertEqual(list(zip(*columns.values())), ROWS)
+
+    def test_columns_are_little_endian(self):
+        filename = self.write(ROWS[:1], block_size=2)
+        with open(filename, mode='rb') as column_file:
+            data = column_file.read()
+
+        position = len(ResultExporter.ColumnWriter.MAGIC)
+        (length,) = struct.unpack_from('<I', data, position)
+        position += 4 + length
+        self.assertEqual(struct.unpack_from('<Iqd?', data, position), (1, 1, 28800.5, False))
+        self.assertEqual(struct.unpack_from('<qq', data, position + 21), (0, 5))
+
+    def test_read_what_was_written_with_the_other_byte_order(self):
+        with open(self.write(ROWS, block_size=2), mode='rb') as column_file:
+            native = column_file.read()
+
+        # Packing swaps bytes on a big-endian machine, and reading swaps them back
+        other = 'big' if sys.byteorder == 'little' else 'little'
+        with mock.patch.object(sys, 'byteorder', other):
+            filename = self.write(ROWS, block_size=2)
+            columns = ResultExporter.read_columns(filename)
+        with open(filename, mode='rb') as column_file:
+            self.assertNotEqual(column_file.read(), native)
+        self.assertEqual(list(zip(*columns.values())), ROWS)
+
+    def test_read_something_else(self):
+        filename = os.path.join(self.directory.name, "test.csv")
+        with open(filename, mode='w') as text_file:
+            text_file.write("id\n1\n")
+        with self.assertRaises(ValueError):
+            ResultExporter.read_columns(filename)
+
+    def test_export_the_sample_day(self):
+        prefix = os.path.join(self.directory.name, "day")
+        exporter = ResultExporter(prefix, block_size=7)
+        state = create_state()
+        state.set_exporter(exporter)
+        state.simulate()
+        exporter.close()
+
+        packages = ResultExporter.read_columns(f"{prefix}-packages.col")
+        trips = ResultExporter.read_columns(f"{prefix}-trips.col")
+        self.assertEqual(sorted(packages["id"]), list(range(1, 41)))
+        self.assertEqual(packages["late_seconds"], [0] * 40)
+        self.assertEqual(sum(trips["packages"]), 40)
+        self.assertEqual(trips["driver"], ["Alice", "Fred", "Alice", "Fred"])
+
+        # The CSV files hold the same rows, in the same order
+        with open(f"{prefix}-packages.csv", newline='') as csv_file:
+            rows = list(csv.reader(csv_file))
+        self.assertEqual(rows[0], [name for (name, _) in ResultExporter.PACKAGE_COLUMNS])
+        self.assertEqual([int(row[0]) for row in rows[1:]], packages["id"])
+        with open(f"{prefix}-trips.csv", newline='') as csv_file:
+            rows = list(csv.reader(csv_file))
+        self.assertEqual([float(row[-1]) for row in rows[1:]], trips["distance"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import os
+import tempfile
+import unittest
+
+from structures.RoadNetwork import RoadNetwork
+from utilities.DataGenerator import DataGenerator
+from utilities.Logger import Logger
+from utilities.RoadNetworkLoader import RoadNetworkLoader
+
+
+class RoadNetworkTest(unittest.TestCase):
+    LOCATIONS = 15
+
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+        # A generated street grid, with one-way streets, so distances aren't symmetric
+        with tempfile.TemporaryDirectory() as directory:
+            nodes = os.path.join(directory, "nodes.csv")
+            edges = os.path.join(directory, "edges.csv")
+            DataGenerator(seed=7, locations=self.LOCATIONS, area_miles=3.0) \
+                .write_road_network(nodes, edges)
+            loader = RoadNetworkLoader(nodes, edges)
+            loader.load()
+        self.network = loader.network
+        self.stops = [f"L{i}" for i in range(self.LOCATIONS)]
+
+    def dijkstra(self):
+        """Distances between every pair of stops, one plain Dijkstra search per stop."""
+        return [self.network.distances_from(s, self.stops) for s in self.stops]
+
+    def test_astar_matches_dijkstra(self):
+        expected = self.dijkstra()
+        for (i, source) in enumerate(self.stops):
+            for (j, target) in enumerate(self.stops):
+                (path, distance) = self.network.shortest_path(source, target)
+                self.assertAlmostEqual(distance, expected[i][j])
+                self.assertEqual(path[0], self.network.index_of(source))
+                self.assertEqual(path[-1], self.network.index_of(target))
+
+    def test_contracted_distance_matches_dijkstra(self):
+        expected = self.dijkstra()
+        self.network.contract()
+        self.assertIsNotNone(self.network.rank)
+        for (i, source) in enumerate(self.stops):
+            for (j, target) in enumerate(self.stops):
+                self.assertAlmostEqual(self.network.distance(source, target), expected[i][j])
+
+    def test_distance_matrix_with_and_without_hierarchy(self):
+        expected = self.dijkstra()
+        plain = self.network.distance_matrix(self.stops)
+        self.network.contract()
+        contracted = self.network.distance_matrix(self.stops)
+
+        self.assertEqual(plain.vertices[:plain.vertex_count], self.stops)
+        for i in range(len(self.stops)):
+            for j in range(len(self.stops)):
+                if i == j:
+                    continue
+                self.assertAlmostEqual(plain.get_weight(i, j), expected[i][j])
+                self.assertAlmostEqual(contracted.get_weight(i, j), expected[i][j])
+
+    def test_one_way_streets_are_asymmetric(self):
+        expected = self.dijkstra()
+        self.assertTrue(any(abs(expected[i][j] - expected[j][i]) > 1e-9
+                            for i in range(len(self.stops)) for j in range(i)))
+
+    def test_unknown_stop(self):
+        with self.assertRaises(KeyError):
+            self.network.distance_matrix(["L0", "nowhere"])
+
+    def repair(self, matrix, u, v, weight: float):
+        """Updates a road, and applies the repairs of every direction changed to the matrix."""
+        for (a, b, previous_weight) in self.network.update_weight(u, v, weight):
+            for (i, j, distance) in self.network.repair_distance_matrix(matrix, a, b,
+                                                                        previous_weight):
+                matrix.update_weight(i, j, distance, directed=True)
+
+    def assertSameDistances(self, matrix, expected):
+        for i in range(len(self.stops)):
+            for j in range(len(self.stops)):
+                if i != j:
+                    self.assertAlmostEqual(matrix.get_weight(i, j), expected.get_weight(i, j))
+
+    def road_on_path(self, source, target):
+        """A road in the middle of the shortest path from source to target."""
+        (path, _) = self.network.shortest_path(source, target)
+        middle = len(path) // 2
+        return (path[middle - 1], path[middle])
+
+    def test_repair_of_a_slower_road_matches_distance_matrix(self):
+        matrix = self.network.distance_matrix(self.stops)
+        (u, v) = self.road_on_path("L1", "L9")
+        self.repair(matrix, u, v, 5.0)
+
+        self.assertGreater(matrix.get_weight(1, 9), 0)
+        self.assertSameDistances(matrix, self.network.distance_matrix(self.stops))
+
+    def test_repair_of_a_faster_road_matches_distance_matrix(self):
+        matrix = self.network.distance_matrix(self.stops)
+        (u, v) = self.road_on_path("L2", "L11")
+        self.repair(matrix, u, v, 0.001)
+        (u, v) = self.road_on_path("L4", "L13")
+        self.repair(matrix, u, v, 0.001)
+
+        self.assertSameDistances(matrix, self.network.distance_matrix(self.stops))
+
+    def test_update_of_a_missing_road(self):
+        weights = self.network.weights.tolist()
+        with self.assertRaises(KeyError):
+            self.network.update_weight("L1", "L2", 1.0)
+        self.assertEqual(self.network.weights.tolist(), weights)
+
+    def test_update_with_a_weight_that_isnt_positive(self):
+        (u, v) = self.road_on_path("L1", "L9")
+        weights = self.network.weights.tolist()
+        for weight in (0, -1.0):
+            with self.assertRaises(ValueError):
+                self.network.update_weight(u, v, weight)
+        with self.assertRaises(KeyError):
+            self.network.update_weight("nowhere", v, 1.0)
+        self.assertEqual(self.network.weights.tolist(), weights)
+
+    def test_one_way_road_stays_one_way(self):
+        network = self.network
+        edges = {(u, network.targets[i]): network.weights[i]
+                 for u in range(network.node_count)
+                 for i in range(network.offsets[u], network.offsets[u + 1])}
+        (u, v) = next(e for e in edges if (e[1], e[0]) not in edges)
+
+        self.assertEqual(network.update_weight(u, v, 2.0), [(u, v, edges[(u, v)])])
+        weights = network.weights.tolist()
+        in_weights = network.in_weights.tolist()
+        # The reverse direction doesn't exist, it can't be updated without changing anything
+        with self.assertRaises(KeyError):
+            network.update_weight(v, u, 3.0)
+        self.assertEqual(network.weights.tolist(), weights)
+        self.assertEqual(network.in_weights.tolist(), in_weights)
+        self.assertNotIn(u, [network.targets[i]
+                             for i in range(network.offsets[v], network.offsets[v + 1])])
+
+    def test_graph_update_is_recorded(self):
+        matrix = self.network.distance_matrix(self.stops)
+        previous = matrix.get_weight(0, 1)
+        self.assertEqual(matrix.update_weight(0, 1, previous + 1, directed=True), previous)
+        self.assertEqual([(u, v, w) for (_, u, v, w) in matrix.changes_since(0)],
+                         [(0, 1, previous + 1)])
+        self.assertEqual(matrix.changes_since(1), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import itertools
+import random
+import unittest
+from argparse import Namespace
+
+import RouteComparison
+from utilities.Logger import Logger
+from tests import LOCATIONS_FILE, PACKAGES_FILE
+
+
+class RouteComparisonTest(unittest.TestCase):
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+        (self.graph, self.hub, self.deadlines) = RouteComparison.load_instance(
+            LOCATIONS_FILE, PACKAGES_FILE)
+        self.candidates = sorted(v for v in self.deadlines if v != self.hub)
+
+    def score(self, route: list):
+        (length, late) = RouteComparison.evaluate(self.graph, self.hub, route, self.deadlines)
+        return (late, length)
+
+    def test_evaluate_includes_the_way_back(self):
+        route = self.candidates[:3]
+        (length, _) = RouteComparison.evaluate(self.graph, self.hub, route, self.deadlines)
+        self.assertAlmostEqual(length, self.graph.route_length(route + [self.hub], self.hub))
+        self.assertEqual(RouteComparison.evaluate(self.graph, self.hub, [], self.deadlines), (0, 0))
+
+    def test_every_algorithm_visits_every_stop_once(self):
+        stops = random.Random(0).sample(self.candidates, 8)
+        for (algorithm, solve) in RouteComparison.ALGORITHMS.items():
+            route = solve(self.graph, self.hub, list(stops), self.deadlines)
+            self.assertEqual(sorted(route), sorted(stops), algorithm)
+
+    def test_exact_is_the_best_by_the_objective(self):
+        rng = random.Random(1)
+        for _ in range(5):
+            stops = rng.sample(self.candidates, 6)
+            best = min(self.score(list(route)) for route in itertools.permutations(stops))
+            route = RouteComparison.exact(self.graph, self.hub, stops, self.deadlines)
+            (late, length) = self.score(route)
+            self.assertEqual(late, best[0])
+            self.assertAlmostEqual(length, best[1])
+
+            for solve in RouteComparison.ALGORITHMS.values():
+                route = solve(self.graph, self.hub, list(stops), self.deadlines)
+                self.assertGreaterEqual(self.score(route), (late, length - 1e-9))
+
+    def test_compare_reports_every_algorithm(self):
+        arguments = Namespace(stops=7, instances=4, exact_limit=7)
+        results = RouteComparison.compare("sample", (self.graph, self.hub, self.deadlines),
+                                          arguments, random.Random(2))
+        self.assertEqual([r["algorithm"] for r in results], list(RouteComparison.ALGORITHMS))
+        for r in results:
+            self.assertEqual((r["stops"], r["runs"]), (7, 4))
+        exact = next(r for r in results if r["algorithm"] == "exact")
+        self.assertEqual(exact["max_gap_percent"], 0)
+        self.assertTrue(all(r["late_stops"] >= exact["late_stops"] for r in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from datetime import datetime, time
+
+from entities.Location import Location
+from entities.Truck import Truck
+from structures.RouteTimeline import RouteTimeline
+from structures.RuntimeState import RuntimeState
+from utilities.Clock import to_seconds
+from utilities.Logger import Logger
+from utilities.RouteLoader import RouteLoader
+from tests import LOCATIONS_FILE, PACKAGES_FILE
+
+
+class RouteTimelineTest(unittest.TestCase):
+    DEPARTURE = datetime(2021, 3, 1, 8, 0)
+
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+        route_loader = RouteLoader(LOCATIONS_FILE)
+        route_loader.load()
+        self.graph = route_loader.graph
+        self.a = self.graph.vertices[5]
+        self.b = self.graph.vertices[12]
+        self.stops = [Truck.HUB_LOCATION, self.a, self.b, Truck.HUB_LOCATION]
+        self.timeline = RouteTimeline(self.graph, self.stops, self.DEPARTURE,
+                                      Truck.AVERAGE_SPEED_PER_SEC)
+
+    def seconds_after_departure(self, when: datetime):
+        return (when - self.DEPARTURE).total_seconds()
+
+    def test_arrivals_are_prefix_sums(self):
+        hub_a = self.graph.get_weight(Truck.HUB_LOCATION, self.a)
+        a_b = self.graph.get_weight(self.a, self.b)
+        b_hub = self.graph.get_weight(self.b, Truck.HUB_LOCATION)
+
+        self.assertAlmostEqual(self.seconds_after_departure(self.timeline.eta(self.a)),
+                               hub_a / Truck.AVERAGE_SPEED_PER_SEC)
+        self.assertAlmostEqual(self.seconds_after_departure(self.timeline.eta(self.b)),
+                               (hub_a + a_b) / Truck.AVERAGE_SPEED_PER_SEC)
+        self.assertAlmostEqual(self.seconds_after_departure(self.timeline.end_time),
+                               (hub_a + a_b + b_hub) / Truck.AVERAGE_SPEED_PER_SEC)
+        self.assertEqual(len(self.timeline), 4)
+
+    def test_stop_not_on_the_route_has_no_eta(self):
+        self.assertIsNone(self.timeline.eta(self.graph.vertices[20]))
+
+    def test_next_event(self):
+        self.assertEqual(self.timeline.next_event(self.DEPARTURE), self.timeline.eta(self.a))
+        self.assertEqual(self.timeline.next_event(self.timeline.eta(self.a)),
+                         self.timeline.eta(self.b))
+        self.assertIsNone(self.timeline.next_event(self.timeline.end_time))
+
+    def test_position_between_stops(self):
+        arrival_a = self.timeline.eta(self.a)
+        halfway = arrival_a + (self.timeline.eta(self.b) - arrival_a) / 2
+        (previous, following, left) = self.timeline.position_at(halfway)
+
+        self.assertEqual(previous, self.a)
+        self.assertEqual(following, self.b)
+        self.assertAlmostEqual(left, self.graph.get_weight(self.a, self.b) / 2)
+        self.assertEqual(self.timeline.position_at(self.timeline.end_time),
+                         (Truck.HUB_LOCATION, Truck.HUB_LOCATION, 0.0))
+
+    def test_truck_eta_matches_the_simulated_delivery(self):
+        state = RuntimeState(simulation_speed_seconds=30, frame_delay_seconds=0)
+        state.load_destinations(LOCATIONS_FILE)
+        state.load_packages(PACKAGES_FILE)
+        state.add_drivers(["Alice", "Fred"])
+        state.add_trucks(3, time(8, 0))
+        state.add_package_correction(9, time(10, 20), Location("410 S State St", 84111))
+        while state.clock < to_seconds(time(8, 5)):
+            state.simulate_tick()
+
+        # Packages going to a wrong address are rejected there, so they're not compared
+        etas = {}
+        for truck in state.trucks:
+            for p in truck.packages:
+                eta = truck.eta(p)
+                if eta is not None and not (p.notes or "").startswith("Wrong address"):
+                    etas[p.id] = to_seconds(eta, state.day)
+        self.assertGreater(len(etas), 0)
+
+        # Deliveries are made at the end of the tick the truck arrives in
+        state.simulate()
+        for (package_id, eta) in etas.items():
+            delivered = state.get_package(package_id).delivered_seconds
+            self.assertGreaterEqual(delivered, eta, package_id)
+            self.assertLessEqual(delivered, eta + 30, package_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
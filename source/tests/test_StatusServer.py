@@ -0,0 +1,59 @@
+import json
+import unittest
+import urllib.request
+from datetime import timedelta
+
+from utilities.Clock import SECONDS_PER_DAY, to_datetime
+from utilities.Logger import Logger
+from utilities.StatusServer import StatusServer
+from tests import create_state
+
+
+class StatusServerTest(unittest.TestCase):
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+        self.state = create_state()
+        self.state.simulate()
+        self.server = StatusServer(port=0)  # Any free port
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def get(self, path: str):
+        (host, port) = self.server.address
+        with urllib.request.urlopen(f"http://{host}:{port}{path}") as response:
+            return json.loads(response.read())
+
+    def test_late_and_on_time_packages(self):
+        on_time = self.state.get_package(1)
+        late = self.state.get_package(13)  # 10:30 AM
+        late.deliver(to_datetime(late.deadline_seconds + 60, self.state.day),
+                     late.deadline_seconds + 60)
+        self.server.publish(self.state)
+
+        self.assertFalse(self.get("/packages/1")["late"])
+        self.assertEqual(self.get("/packages/1")["delivered"],
+                         on_time.time_delivered.time().isoformat())
+        self.assertTrue(self.get("/packages/13")["late"])
+        self.assertEqual([p["id"] for p in self.get("/late")], [13])
+
+    def test_delivery_after_midnight_is_late(self):
+        # The time of day is 00:10, earlier than any deadline, but it's on the next day
+        package = self.state.get_package(2)  # EOD
+        delivered = SECONDS_PER_DAY + 600
+        package.deliver(to_datetime(delivered, self.state.day), delivered)
+        self.server.publish(self.state)
+
+        self.assertEqual(package.time_delivered.date(), self.state.day + timedelta(days=1))
+        self.assertTrue(self.get("/packages/2")["late"])
+        self.assertEqual([p["id"] for p in self.get("/late")], [2])
+
+    def test_unknown_package(self):
+        self.server.publish(self.state)
+        self.assertEqual(self.server.query("/packages/1000")[0], 404)
+        self.assertEqual(self.server.query("/status")[1]["delivered"], 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
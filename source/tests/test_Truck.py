@@ -0,0 +1,101 @@
+import unittest
+from datetime import time
+
+from entities.Driver import Driver
+from entities.Package import Package
+from entities.Truck import Truck
+from utilities.Clock import to_seconds
+from utilities.Logger import Logger
+from tests import create_state, late_packages
+
+
+class TruckTest(unittest.TestCase):
+    def setUp(self):
+        Logger.instance().level = Logger.LogLevel.NONE
+
+    def start_truck(self, count: int = 10):
+        """A truck on route with the first packages without a deadline or special notes."""
+        state = create_state()
+        packages = sorted((p for p in state.packages
+                           if p.deadline_seconds == Package.END_OF_DAY and not p.notes),
+                          key=lambda p: p.id)[:count]
+        truck = Truck(1, to_seconds(time(8, 0)), to_seconds(time(8, 0)), state.destinations)
+        truck.driver = Driver("Alice")
+        for p in packages:
+            truck.add_package(p)
+        truck.start_route()
+        return (state.destinations, truck, packages)
+
+    def test_moving_a_package_is_no_longer_than_replanning(self):
+        (graph, _, packages) = self.start_truck()
+        used = {graph.index_of(p.location) for p in packages}
+        free = [v for v in range(1, graph.vertex_count) if v not in used]
+
+        for (i, new) in enumerate(free):
+            # A new truck every time, so every repair starts from the same route
+            (graph, truck, packages) = self.start_truck()
+            moved = packages[i % len(packages)]
+            if graph.index_of(moved.location) not in truck.route:
+                continue  # The current target can't be changed anymore
+            moved.location = graph.vertices[new]
+
+            stops = sorted({graph.index_of(p.location) for p in packages} - {graph.index_of(truck.target)})
+            self.assertEqual(sorted(truck.route), stops)
+            self.assertAlmostEqual(truck.route_weight, graph.route_length(truck.route, truck.target))
+            (_, replanned) = graph.find_shortest_path(truck.target, stops)
+            self.assertLessEqual(truck.route_weight, replanned + 1e-9)
+
+    def test_moving_a_package_to_the_current_target(self):
+        (graph, truck, packages) = self.start_truck()
+        moved = next(p for p in packages if graph.index_of(p.location) in truck.route)
+        old = graph.index_of(moved.location)
+        still_used = any(p is not moved and p.location == moved.location for p in packages)
+        moved.location = truck.target
+
+        self.assertEqual(old in truck.route, still_used)
+        self.assertAlmostEqual(truck.route_weight, graph.route_length(truck.route, truck.target))
+
+    def test_time_windows_report_missed_deadlines_when_routing(self):
+        state = create_state()
+        urgent = next(p for p in state.packages if p.id == 15)  # Due at 9:00, which has passed at 10:00
+        others = sorted((p for p in state.packages
+                         if p.deadline_seconds == Package.END_OF_DAY and not p.notes),
+                        key=lambda p: p.id)[:5]
+        truck = Truck(1, to_seconds(time(10, 0)), to_seconds(time(8, 0)), state.destinations)
+        truck.driver = Driver("Alice")
+        truck.routing = Truck.Routing.TIME_WINDOWS
+        for p in [urgent] + others:
+            truck.add_package(p)
+        truck.start_route()
+
+        # Reported as soon as the route is known, before anything was delivered
+        self.assertEqual(truck.late_locations, [urgent.location])
+        self.assertEqual(truck.delivered_packages, 0)
+
+    def test_time_windows_meet_each_trip_but_not_the_day(self):
+        # Every trip meets the deadlines it can, but the first trip ends farther from the hub
+        # than with the default routing, and the second trip leaves too late for package 6
+        state = create_state()
+        self.assertEqual(late_packages(state), [])
+
+        state = create_state()
+        state.set_routing(Truck.Routing.TIME_WINDOWS)
+        reports = []
+
+        def record_reports(s):
+            for truck in s.trucks:
+                if len(truck.late_locations) > 0:
+                    reports.append((s.clock, list(truck.late_locations)))
+        state.add_tick_listener(record_reports)
+        state.simulate()
+
+        package = next(p for p in state.packages if p.id == 6)
+        self.assertEqual(late_packages(state), [6])
+        self.assertGreater(len(reports), 0)
+        (reported, locations) = reports[0]
+        self.assertIn(package.location, locations)
+        self.assertLess(reported, package.delivered_seconds)
+
+
+if __name__ == '__main__':
+    unittest.main()
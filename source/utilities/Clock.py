@@ -0,0 +1,34 @@
+import sys
+from datetime import date, datetime, time, timedelta
+sys.path.append("..")
+
+# Simulation times are also handled as seconds since midnight,
+# which is cheaper to compare and do arithmetic with than time objects
+# The simulation clock counts seconds since midnight of the simulated day,
+# so it keeps counting past SECONDS_PER_DAY when a simulation runs past midnight
+
+SECONDS_PER_DAY = 86400
+
+
+def to_seconds(value, day: date = None):
+    """Converts a time or datetime to whole seconds since midnight. None is treated as midnight.
+
+    If day is specified, a datetime is converted to seconds since midnight of that day.
+    Microseconds are dropped, the simulation clock only counts whole seconds."""
+    if value is None:
+        return 0
+    seconds = value.hour * 3600 + value.minute * 60 + value.second
+    if day is not None and isinstance(value, datetime):
+        seconds += (value.date() - day).days * SECONDS_PER_DAY
+    return seconds
+
+
+def to_time(seconds: float):
+    """Converts seconds since midnight to a time, clamped to the end of day."""
+    seconds = min(max(int(seconds), 0), SECONDS_PER_DAY - 1)
+    return time(seconds // 3600, (seconds // 60) % 60, seconds % 60)
+
+
+def to_datetime(seconds: float, day: date):
+    """Converts seconds since midnight of the day to a datetime, which can be on a later day."""
+    return datetime.combine(day, time()) + timedelta(seconds=seconds)
@@ -0,0 +1,170 @@
+import csv
+import sys
+import math
+import random
+
+from .Logger import Logger
+sys.path.append("..")
+
+
+class DataGenerator:
+    """Generates random distance tables and package manifests, in the same format as the sample data.
+
+    Locations are random points on a plane, so distances are metric. The same seed always
+    generates the same files."""
+
+    DEADLINES = ["9:00 AM", "10:30 AM", "11:00 AM"]
+    DELAYED_ARRIVAL = "9:05 am"
+
+    def __init__(self, seed: int = 0, locations: int = 27, packages: int = 40, trucks: int = 3,
+                 deadline_ratio: float = 0.35, delayed_ratio: float = 0.1,
+                 truck_ratio: float = 0.1, group_ratio: float = 0.15, max_group_size: int = 4,
+                 area_miles: float = 10.0):
+        """Creates a generator.
+
+        The ratios are the fraction of packages with a deadline, delayed on arrival,
+        required on a specific truck, and in a co-delivery group."""
+        super().__init__()
+        self.seed = seed
+        self.locations = max(locations, 2)
+        self.packages = packages
+        self.trucks = trucks
+        self.deadline_ratio = deadline_ratio
+        self.delayed_ratio = delayed_ratio
+        self.truck_ratio = truck_ratio
+        self.group_ratio = group_ratio
+        self.max_group_size = max(max_group_size, 2)
+        self.area_miles = area_miles
+
+    def __addresses(self):
+        # The first location is the hub, the rest get a unique street address
+        return ["HUB"] + [f"{100 + i} Synthetic Way" for i in range(1, self.locations)]
+
+    def __zip(self, i: int):
+        return 84000 + i % 1000
+
+    def write_locations(self, filename: str):
+        """Writes the distance table, a lower triangular matrix like locations.csv."""
+        # Time complexity is O(L^2), for L locations
+        rng = random.Random(self.seed)
+        points = [(rng.uniform(0, self.area_miles), rng.uniform(0, self.area_miles))
+                  for _ in range(self.locations)]
+        addresses = self.__addresses()
+
+        with open(filename, mode='w', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            names = [f"Location {i} {addresses[i]}" for i in range(self.locations)]
+            writer.writerow(["DISTANCE BETWEEN HUBS IN MILES", ""] + names)
+
+            for i in range(self.locations):
+                (x, y) = points[i]
+                row = [names[i], f" {addresses[i]} ({self.__zip(i)})" if i > 0 else " HUB"]
+                for j in range(self.locations):
+                    if j <= i:
+                        (x2, y2) = points[j]
+                        # A distance of 0 means not connected, so close locations are 0.01 apart
+                        row.append(max(round(math.hypot(x - x2, y - y2), 1), 0.01) if j < i else 0.0)
+                    else:
+                        row.append('')
+                writer.writerow(row)
+
+        Logger.log(Logger.LogLevel.INFORMATION,
+                   f"Generated {self.locations} destinations in {filename}")
+
+    def write_road_network(self, nodes_filename: str, edges_filename: str,
+                           block_miles: float = 0.25):
+        """Writes a street grid with the same locations as write_locations, for RoadNetworkLoader.
+
+        Every location is connected to its nearest intersection. Every fourth street is one way,
+        alternating directions, so the network is directed but every node can still be reached."""
+        # Time complexity is O(G^2 + L), for G streets in each direction
+        rng = random.Random(self.seed)
+        points = [(rng.uniform(0, self.area_miles), rng.uniform(0, self.area_miles))
+                  for _ in range(self.locations)]
+        addresses = self.__addresses()
+        streets = int(self.area_miles / block_miles) + 1
+
+        def intersection(i: int, j: int):
+            return f"I{i}-{j}"
+
+        with open(nodes_filename, mode='w', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["Node", "X", "Y", "Location"])
+            for i in range(streets):
+                for j in range(streets):
+                    writer.writerow([intersection(i, j), i * block_miles, j * block_miles, ""])
+            for i in range(self.locations):
+                (x, y) = points[i]
+                location = f"{addresses[i]} ({self.__zip(i)})" if i > 0 else "HUB"
+                writer.writerow([f"L{i}", round(x, 4), round(y, 4), location])
+
+        with open(edges_filename, mode='w', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["From", "To", "Distance", "One Way"])
+            for i in range(streets):
+                for j in range(streets):
+                    # Streets aren't perfectly straight, blocks are a little longer than the grid
+                    if i + 1 < streets:
+                        one_way = j % 4 == 3
+                        (u, v) = ((i, j), (i + 1, j)) if j % 8 == 3 or not one_way else \
+                            ((i + 1, j), (i, j))
+                        writer.writerow([intersection(*u), intersection(*v),
+                                         round(block_miles * rng.uniform(1.0, 1.2), 3),
+                                         "yes" if one_way else "no"])
+                    if j + 1 < streets:
+                        writer.writerow([intersection(i, j), intersection(i, j + 1),
+                                         round(block_miles * rng.uniform(1.0, 1.2), 3), "no"])
+            for i in range(self.locations):
+                (x, y) = points[i]
+                (gx, gy) = (round(x / block_miles), round(y / block_miles))
+                # A distance of 0 means not connected in a Graph, so a driveway is never empty
+                driveway = math.hypot(x - gx * block_miles, y - gy * block_miles)
+                writer.writerow([f"L{i}", intersection(gx, gy), max(round(driveway, 3), 0.01),
+                                 "no"])
+
+        Logger.log(Logger.LogLevel.INFORMATION,
+                   f"Generated a road network of {streets * streets + self.locations} nodes "
+                   f"in {nodes_filename} and {edges_filename}")
+
+    def write_packages(self, filename: str):
+        """Writes the package manifest, like packages.csv."""
+        # Time complexity is O(N)
+        rng = random.Random(self.seed + 1)
+        addresses = self.__addresses()
+        rows = []
+
+        for package_id in range(1, self.packages + 1):
+            i = rng.randrange(1, self.locations)
+            deadline = rng.choice(self.DEADLINES) if rng.random() < self.deadline_ratio else "EOD"
+            rows.append([package_id, addresses[i], "Salt Lake City", "UT", self.__zip(i),
+                         deadline, rng.randint(1, 90), ""])
+
+        # Each package gets at most one special note, groups are made of plain packages
+        plain = []
+        for row in rows:
+            roll = rng.random()
+            if roll < self.delayed_ratio:
+                row[7] = f"Delayed on flight---will not arrive to depot until {self.DELAYED_ARRIVAL}"
+            elif roll < self.delayed_ratio + self.truck_ratio:
+                row[7] = f"Can only be on truck {rng.randint(1, self.trucks)}"
+            else:
+                plain.append(row)
+
+        # The first package of a group lists the others, like the sample data
+        rng.shuffle(plain)
+        grouped = int(len(plain) * self.group_ratio)
+        start = 0
+        while start + 1 < grouped:
+            size = min(rng.randint(2, self.max_group_size), grouped - start)
+            group = plain[start:start + size]
+            group[0][7] = "Must be delivered with " + ", ".join(str(r[0]) for r in group[1:])
+            start += size
+
+        with open(filename, mode='w', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["Package ID", "Address", "City", "State", "Zip",
+                             "Delivery Deadline", "Mass KILO", "Special Notes"])
+            writer.writerows(rows)
+
+        Logger.log(Logger.LogLevel.INFORMATION,
+                   f"Generated {self.packages} packages in {filename}")
@@ -0,0 +1,131 @@
+import os
+import sys
+import json
+import threading
+
+from .Logger import Logger
+sys.path.append("..")
+
+
+class DeliveryJournal:
+    """Append-only journal of every package status change, as JSON lines.
+
+    Records are queued by the simulation and written by a background thread in groups,
+    each group is flushed to disk in a single write. Recording never waits for the disk."""
+
+    CORRECTED = "CORRECTED"
+
+    def __init__(self, filename: str, flush_interval_seconds: float = 1.0, batch_size: int = 4096):
+        """Opens the journal for appending.
+
+        Records are written every flush_interval_seconds, or once batch_size records are queued."""
+        super().__init__()
+        self.filename = filename
+        self.flush_interval = flush_interval_seconds
+        self.batch_size = batch_size
+        self.current_time = None  # Simulated time, recorded with every record
+        self.records_written = 0
+        self.__file = open(filename, mode='a', encoding='utf-8')
+        self.__pending = []
+        self.__lock = threading.Lock()  # Guards the queued records
+        self.__write_lock = threading.Lock()  # Held while a group is taken, written and synced
+        self.__wake = threading.Event()
+        self.__closed = False
+        self.__thread = threading.Thread(target=self.__run, name="DeliveryJournal", daemon=True)
+        self.__thread.start()
+
+    def record_status(self, package):
+        """Records the current status of the package. Called from the simulation thread."""
+        # Only a tuple is queued here, formatting happens on the writer thread
+        truck = package.truck.id if package.truck is not None else None
+        self.__queue((self.current_time, package.id, package.status.name, truck, None))
+
+    def record_correction(self, package):
+        """Records a new location for the package. Called from the simulation thread."""
+        truck = package.truck.id if package.truck is not None else None
+        self.__queue((self.current_time, package.id, self.CORRECTED, truck, str(package.location)))
+
+    def __queue(self, record: tuple):
+        with self.__lock:
+            self.__pending.append(record)
+            count = len(self.__pending)
+        if count >= self.batch_size:
+            self.__wake.set()
+
+    def flush(self):
+        """Writes every queued record, and waits until they are on disk.
+
+        Safe to call from any thread, the writer thread flushes through this too."""
+        # Groups are taken and written under one lock, so they reach the file in the order queued
+        # The queue has its own lock, so recording doesn't wait while a group is synced
+        with self.__write_lock:
+            self.__write_pending()
+
+    def __write_pending(self):
+        with self.__lock:
+            (records, self.__pending) = (self.__pending, [])
+        if len(records) == 0:
+            return
+
+        # A group of records is written and synced at once, instead of one at a time
+        lines = []
+        for (when, package_id, event, truck, address) in records:
+            record = {"time": when.isoformat() if when is not None else None,
+                      "package": package_id, "event": event, "truck": truck}
+            if address is not None:
+                record["address"] = address
+            lines.append(json.dumps(record, separators=(',', ':')))
+
+        self.__file.write("\n".join(lines) + "\n")
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+        self.records_written += len(records)
+
+    def close(self):
+        """Writes every queued record, and closes the journal."""
+        if self.__closed:
+            return
+        self.__closed = True
+        self.__wake.set()
+        self.__thread.join()
+        self.flush()
+        self.__file.close()
+        Logger.log(Logger.LogLevel.INFORMATION,
+                   f"Wrote {self.records_written} journal records to {self.filename}")
+
+    def __run(self):
+        while not self.__closed:
+            self.__wake.wait(self.flush_interval)
+            self.__wake.clear()
+            self.flush()
+
+    @classmethod
+    def replay(cls, filename: str):
+        """Rebuilds the last known state of every package from a journal.
+
+        returns: package ID -> dictionary of status, truck, address, last update and delivery time"""
+        # Time complexity is O(R), for R records
+        packages = {}
+        with open(filename, mode='r', encoding='utf-8') as journal_file:
+            for line in journal_file:
+                line = line.strip()
+                if line == '':
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A crash can leave the last line incomplete, everything before it is valid
+                    Logger.log(Logger.LogLevel.WARNING, f"Skipping damaged journal record: {line}")
+                    continue
+
+                state = packages.setdefault(record["package"], {
+                    "status": None, "truck": None, "address": None, "time": None, "delivered": None})
+                state["time"] = record["time"]
+                state["truck"] = record["truck"]
+                if record["event"] == cls.CORRECTED:
+                    state["address"] = record["address"]
+                    continue
+
+                state["status"] = record["event"]
+                state["delivered"] = record["time"] if record["event"] == "DELIVERED" else None
+        return packages
@@ -0,0 +1,177 @@
+import sys
+from datetime import timedelta, time
+from multiprocessing import Pool
+
+from entities.Location import Location
+from exceptions.ConstraintError import ConstraintError
+from structures.RuntimeState import RuntimeState
+from .Logger import Logger
+sys.path.append("..")
+
+
+class HubPartitioner:
+    """Splits a delivery day across multiple hubs, and solves each hub in its own process."""
+    class Summary:
+        """Results of simulating a single hub."""
+        def __init__(self, hub, packages_delivered, total_time, total_distance, late_packages):
+            self.hub = hub
+            self.packages_delivered = packages_delivered
+            self.total_time = total_time
+            self.total_distance = total_distance
+            self.late_packages = late_packages
+
+        def __str__(self):
+            return f"{self.hub}: {self.packages_delivered} packages delivered in {self.total_time} for a distance of {self.total_distance:.2f}"
+
+    def __init__(self, locations_filename: str, packages_filename: str,
+                 simulation_speed_seconds=60):
+        super().__init__()
+        self.locations_filename = locations_filename
+        self.packages_filename = packages_filename
+        self.simulation_speed_seconds = simulation_speed_seconds
+        self.hubs = []  # List of (hub, drivers, trucks, start_time), in the order added
+        self.owners = {}  # Package ID -> hub, for packages that belong to a specific hub
+        self.corrections = []
+        self.partitions = None
+        self.summaries = None
+
+    def add_hub(self, hub: Location, drivers: list, trucks: int, start_time: time):
+        """Adds a hub, with the drivers and trucks operating from it.
+
+        Trucks are numbered across all hubs in the order they're added, starting from 1,
+        so a package that can only be on truck N is delivered from the hub of truck N."""
+        self.hubs.append((hub, drivers, trucks, start_time))
+
+    def set_owner(self, package_id: int, hub: Location):
+        """Forces a package to be delivered from the specified hub, instead of the nearest."""
+        self.owners[package_id] = hub
+
+    def add_package_correction(self, package_id, update_time, updated_information):
+        """Add a correction to a package that occurs at a specified time."""
+        self.corrections.append((package_id, update_time, updated_information))
+
+    def partition(self):
+        """Assigns every package to a hub. Returns a list of package ID sets, one per hub."""
+        # The full graph and package list are only loaded once, in this process
+        state = RuntimeState(frame_delay_seconds=0)
+        state.load_destinations(self.locations_filename)
+        state.load_packages(self.packages_filename)
+
+        # Replace the default hub with the configured hubs
+        state.hubs.clear()
+        for (hub, _, _, _) in self.hubs:
+            state.add_hub(hub)
+
+        # Packages that can only be on a specific truck belong to the hub of that truck
+        owners = dict(self.owners)
+        for p in state.packages:
+            if p.requires_truck is None:
+                continue
+            (hub, _) = self.__truck_hub(p.requires_truck)
+            if hub is None:
+                raise ConstraintError(
+                    f"Package {p.id} requires truck {p.requires_truck}, but there are only {self.__truck_count()} trucks")
+            if owners.get(p.id, hub) != hub:
+                raise ConstraintError(
+                    f"Package {p.id} requires truck {p.requires_truck} of hub {hub}, but belongs to hub {owners[p.id]}")
+            owners[p.id] = hub
+
+        # Time complexity is O(N * H)
+        state.assign_hubs(owners)
+
+        self.partitions = [set() for _ in self.hubs]
+        for p in state.packages:
+            self.partitions[state.hubs.index(p.hub)].add(p.id)
+
+        return self.partitions
+
+    def solve(self, processes: int = None):
+        """Simulates every hub independently in parallel worker processes, and merges the results.
+
+        If processes is 1, all hubs are simulated in this process."""
+        if self.partitions is None:
+            self.partition()
+
+        jobs = []
+        first_truck = 1
+        for i in range(len(self.hubs)):
+            (hub, drivers, trucks, start_time) = self.hubs[i]
+            package_ids = self.partitions[i]
+            corrections = [c for c in self.corrections if c[0] in package_ids]
+            jobs.append((self.locations_filename, self.packages_filename, hub,
+                         package_ids, drivers, trucks, start_time, first_truck,
+                         self.simulation_speed_seconds, corrections,
+                         Logger.instance().level))
+            first_truck += trucks
+
+        # Results are returned in the same order as the hubs were added
+        if processes == 1:
+            self.summaries = [_solve_hub(job) for job in jobs]
+        else:
+            with Pool(processes) as pool:
+                self.summaries = pool.map(_solve_hub, jobs)
+
+        return self.summaries
+
+    def __truck_hub(self, truck_id: int):
+        """The hub operating a truck, and the ID of the truck in that hub, (None, None) if there's no such truck."""
+        first_truck = 1
+        for (hub, _, trucks, _) in self.hubs:
+            if first_truck <= truck_id < first_truck + trucks:
+                return hub, truck_id - first_truck + 1
+            first_truck += trucks
+        return None, None
+
+    def __truck_count(self):
+        return sum(trucks for (_, _, trucks, _) in self.hubs)
+
+    @property
+    def packages_delivered(self):
+        """The total number of packages delivered by all hubs."""
+        return sum(s.packages_delivered for s in self.summaries)
+
+    @property
+    def total_time(self):
+        """The total combined time taken by all trucks of all hubs while on route."""
+        return sum((s.total_time for s in self.summaries), timedelta())
+
+    @property
+    def total_distance(self):
+        """The total combined distance traveled by all trucks of all hubs."""
+        return sum(s.total_distance for s in self.summaries)
+
+    @property
+    def late_packages(self):
+        """The IDs of all packages delivered late, by any hub."""
+        return sorted(i for s in self.summaries for i in s.late_packages)
+
+
+def _solve_hub(job):
+    """Worker process entry point, simulates a single hub."""
+    (locations_filename, packages_filename, hub, package_ids, drivers, trucks,
+     start_time, first_truck, simulation_speed_seconds, corrections, log_level) = job
+    Logger.instance().level = log_level
+
+    # Each worker builds its own state, containing only the packages of its hub
+    state = RuntimeState(simulation_speed_seconds, frame_delay_seconds=0)
+    state.load_destinations(locations_filename)
+    state.load_packages(packages_filename, package_ids)
+
+    # Trucks of the worker are numbered from 1, required trucks are numbered across all hubs
+    for p in state.packages:
+        if p.requires_truck is not None:
+            p.requires_truck -= first_truck - 1
+    state.add_drivers(drivers)
+    state.add_trucks(trucks, start_time, hub)
+
+    for (package_id, update_time, updated_information) in corrections:
+        state.add_package_correction(package_id, update_time, updated_information)
+
+    state.simulate()
+
+    late_packages = [
+        p.id for p in state.packages if p.delivered_seconds is not None
+        and p.delivered_seconds > p.deadline_seconds
+    ]
+    return HubPartitioner.Summary(hub, state.packages_delivered, state.total_time,
+                                  state.total_distance, late_packages)
@@ -0,0 +1,78 @@
+import sys
+import tracemalloc
+from os import path
+
+from .Logger import Logger
+sys.path.append("..")
+
+
+class MemoryProfiler:
+    """Takes tracemalloc snapshots at phase boundaries, and attributes memory to subsystems.
+
+    Memory is attributed to the file that allocated it, so a subsystem is the set of files
+    implementing it. Tracing slows down the program, it's meant for profiling runs only."""
+
+    SUBSYSTEMS = {
+        "Graph": ("Graph.py", "RouteLoader.py", "RoadNetwork.py", "RoadNetworkLoader.py"),
+        "Packages": ("Package.py", "PackageLoader.py", "Location.py", "PackageCorrection.py",
+                     "DisjointSet.py"),
+        "HashSet": ("HashSet.py",),
+        "Trucks": ("Truck.py", "Fleet.py", "Driver.py", "RouteTimeline.py", "RouteIndex.py"),
+        "Changes": ("ChangeTracker.py",),
+        "Logging": ("Logger.py",),
+    }
+
+    def __init__(self):
+        super().__init__()
+        self.phases = []  # List of (phase name, subsystem -> bytes, total bytes, peak bytes)
+        self.__subsystem_of = {
+            filename: name for (name, filenames) in self.SUBSYSTEMS.items()
+            for filename in filenames
+        }
+
+    def start(self):
+        """Starts tracing allocations."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop(self):
+        """Stops tracing allocations, the phases taken so far are kept."""
+        tracemalloc.stop()
+
+    def snapshot(self, phase: str):
+        """Records the memory currently allocated by each subsystem."""
+        if not tracemalloc.is_tracing():
+            return
+
+        # Time complexity is O(A), for A allocation sites
+        usage = {name: 0 for name in self.SUBSYSTEMS}
+        usage["Other"] = 0
+        for statistic in tracemalloc.take_snapshot().statistics('filename'):
+            filename = path.basename(statistic.traceback[0].filename)
+            usage[self.__subsystem_of.get(filename, "Other")] += statistic.size
+
+        (current, peak) = tracemalloc.get_traced_memory()
+        self.phases.append((phase, usage, current, peak))
+        Logger.log(Logger.LogLevel.VERBOSE, f"Memory after {phase}: {current} bytes")
+
+    def has_phase(self, phase: str):
+        """Checks if a snapshot was already taken for the phase."""
+        return any(p[0] == phase for p in self.phases)
+
+    def report(self):
+        """Returns the recorded phases, in a form that can be written as JSON."""
+        return [
+            {"phase": phase, "subsystems": usage, "total_bytes": current, "peak_bytes": peak}
+            for (phase, usage, current, peak) in self.phases
+        ]
+
+    def format_report(self):
+        """Returns the recorded phases as a table, in kilobytes."""
+        names = list(self.SUBSYSTEMS) + ["Other"]
+        lines = ["Phase".ljust(20) + "".join(n.rjust(10) for n in names) +
+                 "Total".rjust(10) + "Peak".rjust(10)]
+        for (phase, usage, current, peak) in self.phases:
+            lines.append(phase[:20].ljust(20) +
+                         "".join(f"{usage[n] / 1024:10.1f}" for n in names) +
+                         f"{current / 1024:10.1f}{peak / 1024:10.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,167 @@
+import sys
+import json
+import asyncio
+import threading
+from datetime import datetime
+
+from entities.Location import Location
+from entities.Package import Package
+from exceptions.Error import Error
+from exceptions.AlreadyInProgressException import AlreadyInProgressException
+from structures.RuntimeState import RuntimeState
+from .Logger import Logger
+sys.path.append("..")
+
+
+class RealtimeDispatcher:
+    """Runs a simulation against the wall clock, applying live events as they arrive.
+
+    Events are JSON objects, one per line, read from stdin or a local socket:
+    {"type": "correction", "package": 9, "address": "410 S State St", "zip": 84111, "time": "10:20"}
+    {"type": "package", "id": 41, "address": "...", "city": "...", "state": "UT", "zip": 84111,
+     "weight": 5, "deadline": "10:30 AM", "notes": ""}
+    {"type": "driver", "action": "add" or "remove", "name": "Bob"}"""
+
+    def __init__(self, state: RuntimeState, realtime_ratio: float = 1.0):
+        """Creates a dispatcher for the state.
+
+        realtime_ratio is the number of simulated seconds per wall second."""
+        super().__init__()
+        self.state = state
+        self.realtime_ratio = realtime_ratio
+        self.events = None
+        self.events_applied = 0
+        self.events_rejected = 0
+
+    def run(self, use_stdin: bool = True, host: str = None, port: int = None):
+        """Runs the dispatcher until the end of day. Returns only when simulation ends.
+
+        Events are read from stdin, and/or from clients connecting to host:port if specified."""
+        asyncio.run(self.run_async(use_stdin, host, port))
+
+    async def run_async(self, use_stdin: bool = True, host: str = None, port: int = None):
+        """Coroutine version of run, for use inside an existing event loop."""
+        self.events = asyncio.Queue()
+        server = None
+
+        if use_stdin:
+            # Reading stdin blocks, so it's done on a daemon thread that hands lines to the loop
+            loop = asyncio.get_running_loop()
+            threading.Thread(target=self.__read_stdin, args=(loop,),
+                             name="StdinReader", daemon=True).start()
+        if port is not None:
+            server = await asyncio.start_server(self.__handle_client, host or "127.0.0.1", port)
+            Logger.log(Logger.LogLevel.INFORMATION,
+                       f"Listening for events on {host or '127.0.0.1'}:{port}")
+
+        try:
+            await self.__run_clock()
+        finally:
+            if server is not None:
+                server.close()
+                await server.wait_closed()
+
+    async def __run_clock(self):
+        loop = asyncio.get_running_loop()
+        wall_start = loop.time()
+        simulation_start = self.state.clock
+
+        while True:
+            # Events are only applied between ticks, so a tick always sees a consistent state
+            self.apply_pending_events()
+
+            if not self.state.simulate_tick(stop_when_delivered=False):
+                break
+
+            # Sleep until the wall clock catches up with the simulated time
+            # Readers keep running while the clock sleeps
+            elapsed = self.state.clock - simulation_start
+            delay = wall_start + elapsed / self.realtime_ratio - loop.time()
+            await asyncio.sleep(max(delay, 0))
+
+    def __read_stdin(self, loop: asyncio.AbstractEventLoop):
+        for line in sys.stdin:
+            # The loop can close between the check and the call, once the simulation ended
+            if loop.is_closed():
+                return
+            try:
+                loop.call_soon_threadsafe(self.queue_event, line)
+            except RuntimeError:
+                return
+
+    async def __handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            self.queue_event(line.decode())
+
+        writer.close()
+
+    def queue_event(self, line: str):
+        """Queues a JSON line event, to be applied before the next tick."""
+        line = line.strip()
+        if line == '':
+            return
+
+        try:
+            self.events.put_nowait(json.loads(line))
+        except ValueError:
+            self.events_rejected += 1
+            Logger.log(Logger.LogLevel.ERROR, f"Invalid event: {line}")
+
+    def apply_pending_events(self):
+        """Applies all the events received since the last tick."""
+        while not self.events.empty():
+            event = self.events.get_nowait()
+            try:
+                self.apply_event(event)
+                self.events_applied += 1
+            except (KeyError, TypeError, ValueError, Error, AlreadyInProgressException) as e:
+                self.events_rejected += 1
+                Logger.log(Logger.LogLevel.ERROR, f"Rejected event {event}: {e}")
+
+    def apply_event(self, event: dict):
+        """Applies a single event to the state."""
+        event_type = event["type"]
+
+        if event_type == "correction":
+            # Corrections without a time apply immediately
+            if "time" in event:
+                update_time = datetime.strptime(event["time"], "%H:%M").time()
+            else:
+                update_time = self.state.current_time.time()
+            self.state.add_package_correction(
+                int(event["package"]), update_time,
+                Location(event["address"], int(event["zip"])))
+        elif event_type == "package":
+            self.state.add_package(self.__package_from_event(event))
+        elif event_type == "driver":
+            if event["action"] == "add":
+                self.state.add_driver(event["name"])
+            elif event["action"] == "remove":
+                self.state.remove_driver(event["name"])
+            else:
+                raise ValueError(f"Unknown driver action: {event['action']}")
+        else:
+            raise ValueError(f"Unknown event type: {event_type}")
+
+        Logger.log(Logger.LogLevel.INFORMATION, f"Applied {event_type} event at {self.state.current_time}")
+
+    @staticmethod
+    def __package_from_event(event: dict):
+        """Builds a package from a package event, validating the fields before they're parsed."""
+        def text(name, default=None):
+            value = event.get(name)
+            if value is None:
+                if default is None:
+                    raise KeyError(name)
+                return default
+            if not isinstance(value, str):
+                raise TypeError(f"The {name} of a package must be a string, not {value!r}")
+            return value
+
+        # Missing or null notes and deadline take their defaults, like in the packages file
+        return Package(int(event["id"]), text("address"), text("city"), text("state"),
+                       int(event["zip"]), int(event["weight"]),
+                       text("notes", ""), text("deadline", "EOD"))
@@ -0,0 +1,52 @@
+import sys
+import threading
+
+from .TerminalRenderer import TerminalRenderer
+sys.path.append("..")
+
+
+class RenderThread(threading.Thread):
+    """Draws the interface on its own thread, at a capped frame rate.
+
+    The simulation publishes immutable frames when asked for one,
+    so the display never slows down the simulation."""
+    def __init__(self, renderer: TerminalRenderer, fps: int):
+        super().__init__(name="RenderThread", daemon=True)
+        self.renderer = renderer
+        self.interval = 1 / fps
+        self.frame = None  # Latest published frame, a tuple of lines
+        self.__frame_requested = threading.Event()
+        self.__stopped = threading.Event()
+
+    def wants_frame(self):
+        """Checks if the render thread is waiting for a new frame."""
+        return self.__frame_requested.is_set()
+
+    def publish(self, frame: tuple):
+        """Publishes a new frame to be drawn. Called from the simulation thread."""
+        # Replacing the reference is atomic, the frame itself is never modified
+        self.__frame_requested.clear()
+        self.frame = frame
+
+    def stop(self, frame: tuple = None):
+        """Draws the final frame, if specified, and waits for the thread to finish."""
+        if frame is not None:
+            self.frame = frame
+        self.__stopped.set()
+        if self.is_alive():
+            self.join()
+
+    def run(self):
+        drawn = None
+        self.__frame_requested.set()
+
+        # Wait returns True once stopped, the final frame is drawn before exiting
+        while not self.__stopped.wait(self.interval):
+            frame = self.frame
+            if frame is not None and frame is not drawn:
+                self.renderer.draw_frame(frame)
+                drawn = frame
+            self.__frame_requested.set()
+
+        if self.frame is not None and self.frame is not drawn:
+            self.renderer.draw_frame(self.frame)
@@ -0,0 +1,185 @@
+import sys
+import csv
+import json
+import struct
+from array import array
+
+sys.path.append("..")
+
+
+class ResultExporter:
+    """Streams delivery results to CSV and columnar binary files, as trucks return.
+
+    Four files are written, with the specified prefix:
+    <prefix>-packages.csv, <prefix>-packages.col - one row per delivered package
+    <prefix>-trips.csv, <prefix>-trips.col       - one row per completed trip
+
+    Nothing is kept in memory beyond the current block of rows."""
+
+    class ColumnWriter:
+        """Writes rows as blocks of columns.
+
+        The file starts with a magic number and a JSON schema, then every block is
+        a row count followed by each column: packed integers or doubles, or strings
+        as packed offsets followed by UTF-8 data. Everything is little-endian."""
+
+        MAGIC = b"PKGCOL1\n"
+        TYPES = {"int": 'q', "double": 'd', "bool": 'b'}
+
+        def __init__(self, filename: str, columns: list, block_size: int):
+            """columns - list of (name, type), type is int, double, bool or string"""
+            self.columns = columns
+            self.block_size = block_size
+            self.__file = open(filename, mode='wb')
+            self.__block = self.__new_block()
+            self.__rows = 0
+
+            schema = json.dumps({"columns": columns}).encode()
+            self.__file.write(self.MAGIC + struct.pack('<I', len(schema)) + schema)
+
+        def __new_block(self):
+            return [array(self.TYPES[t]) if t in self.TYPES else [] for (_, t) in self.columns]
+
+        def write_row(self, row: tuple):
+            for (column, value) in zip(self.__block, row):
+                column.append(value)
+            self.__rows += 1
+            if self.__rows >= self.block_size:
+                self.flush()
+
+        def flush(self):
+            if self.__rows == 0:
+                return
+
+            self.__file.write(struct.pack('<I', self.__rows))
+            for column in self.__block:
+                if isinstance(column, array):
+                    self.__file.write(self.to_bytes(column))
+                else:
+                    data = [s.encode() for s in column]
+                    offsets = array('q', [0])
+                    for d in data:
+                        offsets.append(offsets[-1] + len(d))
+                    self.__file.write(self.to_bytes(offsets) + b"".join(data))
+
+            self.__block = self.__new_block()
+            self.__rows = 0
+
+        def close(self):
+            self.flush()
+            self.__file.close()
+
+        @staticmethod
+        def to_bytes(values: array):
+            """Packs the values little-endian, whatever the byte order of this machine."""
+            if sys.byteorder == 'big':
+                values = array(values.typecode, values)
+                values.byteswap()
+            return values.tobytes()
+
+        @staticmethod
+        def from_bytes(values: array, data: bytes):
+            """Appends the little-endian packed data to the values."""
+            packed = array(values.typecode, data)
+            if sys.byteorder == 'big':
+                packed.byteswap()
+            values.extend(packed)
+
+    PACKAGE_COLUMNS = [("id", "int"), ("truck", "int"), ("delivered", "double"),
+                       ("deadline", "double"), ("late_seconds", "double"),
+                       ("corrected", "bool")]
+    TRIP_COLUMNS = [("truck", "int"), ("trip", "int"), ("driver", "string"),
+                    ("departed", "double"), ("returned", "double"), ("packages", "int"),
+                    ("distance", "double")]
+
+    def __init__(self, prefix: str, block_size: int = 1024):
+        """Creates the result files. Times in the columnar files are seconds since midnight."""
+        super().__init__()
+        self.prefix = prefix
+        self.packages_written = 0
+        self.trips_written = 0
+
+        self.__package_file = open(f"{prefix}-packages.csv", mode='w', newline='')
+        self.__package_csv = csv.writer(self.__package_file)
+        self.__package_csv.writerow([name for (name, _) in self.PACKAGE_COLUMNS])
+        self.__package_columns = ResultExporter.ColumnWriter(
+            f"{prefix}-packages.col", self.PACKAGE_COLUMNS, block_size)
+
+        self.__trip_file = open(f"{prefix}-trips.csv", mode='w', newline='')
+        self.__trip_csv = csv.writer(self.__trip_file)
+        self.__trip_csv.writerow([name for (name, _) in self.TRIP_COLUMNS])
+        self.__trip_columns = ResultExporter.ColumnWriter(
+            f"{prefix}-trips.col", self.TRIP_COLUMNS, block_size)
+
+    def write_trip(self, truck):
+        """Writes the packages delivered on the trip the truck just finished, and the trip itself."""
+        # Time complexity is O(P), for the P packages delivered on the trip
+        for p in truck.trip_packages:
+            delivered = p.delivered_seconds
+            deadline = p.deadline_seconds
+            late = max(delivered - deadline, 0)
+            self.__package_csv.writerow([
+                p.id, truck.id, p.time_delivered.time().isoformat(),
+                p.time_deadline.isoformat(timespec='seconds'), late, p.corrected])
+            self.__package_columns.write_row(
+                (p.id, truck.id, delivered, deadline, late, p.corrected))
+        self.packages_written += len(truck.trip_packages)
+
+        departed = truck.route_start_time
+        returned = truck.last_status_update
+        driver = str(truck.driver) if truck.driver is not None else ""
+        self.__trip_csv.writerow([
+            truck.id, truck.route_count, driver, departed.time().isoformat(),
+            returned.time().isoformat(), truck.delivered_packages, truck.distance_traveled])
+        self.__trip_columns.write_row(
+            (truck.id, truck.route_count, driver, truck.route_start_clock, truck.status_clock,
+             truck.delivered_packages, truck.distance_traveled))
+        self.trips_written += 1
+
+    def close(self):
+        """Writes any buffered rows, and closes the files."""
+        self.__package_columns.close()
+        self.__trip_columns.close()
+        self.__package_file.close()
+        self.__trip_file.close()
+
+    @classmethod
+    def read_columns(cls, filename: str):
+        """Reads a columnar file, returns a dictionary of column name -> list of values."""
+        with open(filename, mode='rb') as column_file:
+            data = column_file.read()
+
+        magic = ResultExporter.ColumnWriter.MAGIC
+        if not data.startswith(magic):
+            raise ValueError(f"{filename} is not a column file")
+
+        position = len(magic)
+        (length,) = struct.unpack_from('<I', data, position)
+        position += 4
+        columns = json.loads(data[position:position + length].decode())["columns"]
+        position += length
+        result = {name: [] for (name, _) in columns}
+
+        while position < len(data):
+            (rows,) = struct.unpack_from('<I', data, position)
+            position += 4
+            for (name, column_type) in columns:
+                if column_type in ResultExporter.ColumnWriter.TYPES:
+                    values = array(ResultExporter.ColumnWriter.TYPES[column_type])
+                    size = values.itemsize * rows
+                    ResultExporter.ColumnWriter.from_bytes(values, data[position:position + size])
+                    position += size
+                    if column_type == "bool":
+                        result[name].extend(bool(v) for v in values)
+                    else:
+                        result[name].extend(values)
+                else:
+                    offsets = array('q')
+                    ResultExporter.ColumnWriter.from_bytes(
+                        offsets, data[position:position + 8 * (rows + 1)])
+                    position += 8 * (rows + 1)
+                    for i in range(rows):
+                        result[name].append(
+                            data[position + offsets[i]:position + offsets[i + 1]].decode())
+                    position += offsets[rows]
+        return result
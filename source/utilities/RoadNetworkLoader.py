@@ -0,0 +1,50 @@
+import csv
+import sys
+sys.path.append("..")
+
+from entities.Location import Location
+from structures.RoadNetwork import RoadNetwork
+from .Logger import Logger
+
+
+class RoadNetworkLoader:
+    """Loads a road network from a node file and an edge file.
+
+    Nodes: Node, X, Y, Location - coordinates are optional, and Location is only set for
+                                  delivery locations, as "Address (zip)" or HUB
+    Edges: From, To, Distance, One Way - one way edges only go from From to To"""
+    def __init__(self, nodes_filename: str, edges_filename: str):
+        super().__init__()
+        self.nodes_filename = nodes_filename
+        self.edges_filename = edges_filename
+        self.network = None
+
+    def load(self):
+        """Loads the contents of the files passed to constructor, and builds the network."""
+        self.network = RoadNetwork()
+        Logger.log(Logger.LogLevel.INFORMATION,
+                   f"Loading road network from {self.nodes_filename} and {self.edges_filename}")
+
+        # Time complexity is O(N + E)
+        with open(self.nodes_filename, mode='r') as csv_file:
+            for row in csv.DictReader(csv_file):
+                location = row.get("Location", "").strip()
+                self.network.add_node(
+                    row["Node"].strip(), self.__coordinate(row.get("X")),
+                    self.__coordinate(row.get("Y")),
+                    Location(location) if location != "" else None)
+
+        with open(self.edges_filename, mode='r') as csv_file:
+            for row in csv.DictReader(csv_file):
+                one_way = row.get("One Way", "").strip().lower() in ("1", "yes", "true")
+                self.network.add_edge(row["From"].strip(), row["To"].strip(),
+                                      float(row["Distance"]), directed=one_way)
+
+        self.network.build()
+
+    @staticmethod
+    def __coordinate(value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
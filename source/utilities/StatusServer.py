@@ -0,0 +1,135 @@
+import sys
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .Logger import Logger
+sys.path.append("..")
+
+
+class StatusServer:
+    """Serves read-only package status queries over HTTP/JSON, from a background thread.
+
+    Queries are answered from a snapshot published once per tick, and never touch the live state:
+    GET /status                 - clock and totals
+    GET /packages/<id>          - status of a package, and its ETA when on route
+    GET /trucks/<id>/packages   - packages assigned to a truck
+    GET /late                   - packages delivered late, or past their deadline"""
+
+    class Snapshot:
+        """Immutable view of the state at a point in time."""
+        def __init__(self, current_time, packages, trucks, late, totals):
+            self.current_time = current_time
+            self.packages = packages  # Package ID -> record
+            self.trucks = trucks  # Truck ID -> tuple of package IDs
+            self.late = late  # Tuple of late package IDs
+            self.totals = totals
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8080):
+        super().__init__()
+        self.snapshot = None
+        self.__server = ThreadingHTTPServer((host, port), self.__create_handler())
+        self.__server.daemon_threads = True
+        self.__thread = None
+
+    @property
+    def address(self):
+        """The (host, port) the server is listening on."""
+        return self.__server.server_address
+
+    def start(self):
+        """Starts serving queries on a background thread."""
+        self.__thread = threading.Thread(target=self.__server.serve_forever,
+                                         name="StatusServer", daemon=True)
+        self.__thread.start()
+        Logger.log(Logger.LogLevel.INFORMATION,
+                   f"Serving status queries on {self.address[0]}:{self.address[1]}")
+
+    def stop(self):
+        """Stops serving queries."""
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def publish(self, state):
+        """Builds a snapshot of the state and publishes it. Called from the simulation thread."""
+        # Time complexity is O(N), this runs once per tick
+        current_time = state.current_time
+        packages = {}
+        trucks = {t.id: [] for t in state.trucks}
+        late = []
+
+        for p in state.packages:
+            delivered = p.time_delivered.time() if p.time_delivered is not None else None
+            # Compared in seconds of the simulated day, which keep counting past midnight
+            is_late = (p.delivered_seconds if p.delivered_seconds is not None else state.clock) \
+                > p.deadline_seconds
+            eta = p.truck.eta(p) if p.truck is not None else None
+            packages[p.id] = {
+                "id": p.id,
+                "status": str(p.status),
+                "truck": p.truck.id if p.truck is not None else None,
+                "address": str(p.location),
+                "deadline": p.time_deadline.isoformat(),
+                "delivered": delivered.isoformat() if delivered is not None else None,
+                "eta": eta.time().isoformat() if eta is not None else None,
+                "late": is_late,
+            }
+
+            if p.truck is not None:
+                trucks.setdefault(p.truck.id, []).append(p.id)
+            if is_late:
+                late.append(p.id)
+
+        next_event = state.next_event_time()
+        totals = {
+            "time": current_time.isoformat(),
+            "next_event": next_event.isoformat() if next_event is not None else None,
+            "packages": len(packages),
+            "delivered": state.packages_delivered,
+            "distance": state.total_distance,
+        }
+
+        # Replacing the reference is atomic, readers see either the old or the new snapshot
+        self.snapshot = StatusServer.Snapshot(
+            current_time, packages, {t: tuple(ids) for t, ids in trucks.items()},
+            tuple(late), totals)
+
+    def query(self, path: str):
+        """Answers a query for the specified path, returns (HTTP status, result)."""
+        snapshot = self.snapshot
+        if snapshot is None:
+            return (503, {"error": "No state published yet"})
+
+        parts = [part for part in path.split("?")[0].split("/") if part != '']
+
+        try:
+            if parts == ["status"]:
+                return (200, snapshot.totals)
+            if len(parts) == 2 and parts[0] == "packages":
+                return (200, snapshot.packages[int(parts[1])])
+            if len(parts) == 3 and parts[0] == "trucks" and parts[2] == "packages":
+                return (200, [snapshot.packages[i] for i in snapshot.trucks[int(parts[1])]])
+            if parts == ["late"]:
+                return (200, [snapshot.packages[i] for i in snapshot.late])
+        except (KeyError, ValueError):
+            return (404, {"error": f"Not found: {path}"})
+
+        return (404, {"error": f"Unknown query: {path}"})
+
+    def __create_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                (status, result) = server.query(self.path)
+                body = json.dumps(result).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                Logger.log(Logger.LogLevel.DEBUG, format % args)
+
+        return Handler
@@ -0,0 +1,71 @@
+import sys
+sys.path.append("..")
+
+
+class TerminalRenderer:
+    """Draws frames to the terminal using ANSI escape codes.
+       Only the cells that changed since the previous frame are written."""
+
+    _ESCAPE = "\x1b["
+
+    def __init__(self, stream=None):
+        super().__init__()
+        self.stream = stream if stream is not None else sys.stdout
+        self.previous_frame = None
+        self.frame = []
+
+    def draw_frame(self, lines):
+        """Draws a complete frame, given all its lines."""
+        self.frame = list(lines)
+        self.end_frame()
+
+    def end_frame(self):
+        """Writes the changes between the previous frame and this one, in a single write."""
+        output = []
+
+        if self.previous_frame is None:
+            # First frame, clear the screen once, and draw everything
+            output.append(f"{self._ESCAPE}2J")
+            previous = []
+        else:
+            previous = self.previous_frame
+
+        # Time complexity is O(R * C), for R rows and C columns
+        for row in range(len(self.frame)):
+            line = self.frame[row]
+            old = previous[row] if row < len(previous) else None
+
+            if old == line:
+                continue  # Nothing changed on this line
+
+            if old is None:
+                start = 0
+                end = len(line)
+            else:
+                # Find the first and last cells that changed, and only write that span
+                start = 0
+                shortest = min(len(old), len(line))
+                while start < shortest and old[start] == line[start]:
+                    start += 1
+
+                end = len(line)
+                if len(old) == len(line):
+                    while end > start and old[end - 1] == line[end - 1]:
+                        end -= 1
+
+            # Terminal rows and columns are 1-based
+            output.append(f"{self._ESCAPE}{row + 1};{start + 1}H{line[start:end]}")
+
+            if old is not None and len(old) > len(line):
+                output.append(f"{self._ESCAPE}K")  # Clear the rest of the old line
+
+        # Clear any lines left over from a taller previous frame
+        for row in range(len(self.frame), len(previous)):
+            output.append(f"{self._ESCAPE}{row + 1};1H{self._ESCAPE}K")
+
+        # Park the cursor below the last line, so any other output doesn't overwrite the frame
+        output.append(f"{self._ESCAPE}{len(self.frame) + 1};1H")
+
+        self.stream.write("".join(output))
+        self.stream.flush()
+        self.previous_frame = self.frame